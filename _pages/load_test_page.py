@@ -0,0 +1,198 @@
+import streamlit as st
+from utils.api_handler import DEFAULT_TIMEOUT
+from utils.job_runner import get_job_manager, submit_load_test_job, JOB_FAILED
+from utils.load_test import (
+    make_profile, profile_duration, ARRIVAL_MODES, DEFAULT_WORKERS, DEFAULT_MAX_IN_FLIGHT
+)
+from utils.session_manager import get_keyword_path, get_keyword_count, get_api_configs
+
+
+def render():
+    '''부하 테스트 페이지 렌더링'''
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.title("🚀 부하 테스트")
+    st.caption("설정된 키워드와 A/B Endpoint 로 목표 QPS 의 요청을 보내 지연시간 변화와 포화 지점을 측정합니다.")
+    st.markdown("---")
+
+    if not get_keyword_count():
+        st.warning("키워드가 없습니다. 'Test Settings' 메뉴에서 키워드를 먼저 설정하세요.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    configs = get_api_configs()
+    ready = [system for system, config in configs.items() if config["url"]]
+    if not ready:
+        st.info("설정된 Endpoint 가 없습니다. Test Settings 에서 API 를 설정해주세요.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    _render_settings(configs, ready)
+
+    job = get_job_manager().get(st.session_state.get("load_job_id"))
+    if job and job.is_active:
+        _render_progress(job.id)
+    elif job:
+        if job.status == JOB_FAILED:
+            st.error(f"부하 테스트 실패: {job.error}")
+        _render_report(job.results)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def _render_settings(configs, ready):
+    '''부하 프로파일 설정 + 실행'''
+    with st.container(border=True):
+        st.markdown("#### 부하 프로파일")
+        systems = st.multiselect("대상 시스템", ready, default=ready, key="load_systems")
+
+        c1, c2, c3, c4 = st.columns(4)
+        with c1:
+            start_qps = st.number_input("시작 QPS", min_value=0.0, value=10.0, step=10.0, key="load_start_qps")
+        with c2:
+            target_qps = st.number_input("목표 QPS", min_value=0.1, value=100.0, step=10.0, key="load_target_qps")
+        with c3:
+            ramp_up_s = st.number_input("Ramp-up (초)", min_value=0, value=30, key="load_ramp_up_s")
+        with c4:
+            hold_s = st.number_input("유지 시간 (초)", min_value=0, value=30, key="load_hold_s")
+
+        d1, d2, d3, d4 = st.columns(4)
+        with d1:
+            arrival = st.selectbox(
+                "도착 방식",
+                ARRIVAL_MODES,
+                format_func=lambda m: {"constant": "고정 간격", "poisson": "Poisson"}[m],
+                key="load_arrival"
+            )
+        with d2:
+            workers = st.number_input(
+                "워커 프로세스 수", min_value=1, max_value=32, value=DEFAULT_WORKERS, key="load_workers",
+                help="요청 생성을 여러 프로세스로 나눠 클라이언트가 병목이 되지 않게 합니다."
+            )
+        with d3:
+            max_in_flight = st.number_input(
+                "워커당 최대 동시 요청", min_value=1, max_value=1024, value=DEFAULT_MAX_IN_FLIGHT,
+                key="load_max_in_flight",
+                help="초과한 요청은 기다리지 않고 버려진 것으로 집계합니다. (open-loop)"
+            )
+        with d4:
+            timeout = st.number_input(
+                "요청 타임아웃 (초)", min_value=1, max_value=120, value=DEFAULT_TIMEOUT, key="load_timeout"
+            )
+
+        try:
+            profile = make_profile(target_qps, hold_s, start_qps, ramp_up_s, arrival)
+        except ValueError as e:
+            st.error(str(e))
+            return
+
+        duration = profile_duration(profile)
+        expected = (start_qps + target_qps) / 2 * ramp_up_s + target_qps * hold_s
+        st.caption(
+            f"총 {duration:.0f}초 · 시스템당 약 {expected:,.0f}건 · "
+            f"키워드 {get_keyword_count():,}개를 순환하며 사용"
+        )
+
+        job = get_job_manager().get(st.session_state.get("load_job_id"))
+        running = bool(job and job.is_active)
+        if st.button("부하 테스트 실행", type="primary", use_container_width=True,
+                     disabled=running or not systems):
+            job = submit_load_test_job(
+                {system: configs[system] for system in systems},
+                get_keyword_path(), profile, workers, max_in_flight, timeout
+            )
+            st.session_state.load_job_id = job.id
+            st.rerun()
+
+
+@st.fragment(run_every=1.0)
+def _render_progress(job_id):
+    '''부하 테스트 진행률 + 실시간 지연시간 (1초 간격 폴링)'''
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return
+    if not job.is_active:
+        st.rerun()
+
+    p = job.progress.get("load")
+    if not p:
+        st.progress(0.0, text="워커 프로세스 시작 중")
+    else:
+        st.progress(min(p["elapsed"] / p["duration"], 1.0), text=f"{p['elapsed']:.0f}/{p['duration']:.0f}초")
+    _render_charts(job.results.get("timeline", []))
+    if st.button("부하 테스트 중지", use_container_width=True, key=f"cancel_{job_id}"):
+        job.cancel()
+
+
+def _ms(value):
+    return f"{value:,.1f}ms" if value is not None else "-"
+
+
+def _render_report(results):
+    '''시스템별 포화 지점 + 합계 + 시계열'''
+    summary = results.get("summary", {})
+    saturation = results.get("saturation", {})
+    timeline = results.get("timeline", [])
+    if not summary:
+        return
+
+    cols = st.columns(len(summary))
+    for col, system in zip(cols, summary):
+        point = saturation.get(system)
+        with col:
+            if point:
+                st.metric(f"시스템 {system} 포화 지점", f"{point['offered_qps']:,.0f} QPS")
+                st.caption(
+                    f"{point['second']}초 · {', '.join(point['reasons'])} · "
+                    f"p99 {_ms(point['p99'])} (초기 {_ms(point['baseline_p99'])})"
+                )
+            else:
+                peak = max((r["offered_qps"] for r in timeline if r["system"] == system), default=0)
+                st.metric(f"시스템 {system} 포화 지점", "없음")
+                st.caption(f"최대 {peak:,.0f} QPS 까지 안정")
+
+    st.dataframe(
+        [
+            {
+                "시스템": system,
+                "전송": stats["sent"],
+                "성공": stats["ok"],
+                "오류": stats["errors"],
+                "버려짐": stats["dropped"],
+                "p50": _ms(stats["latency"]["p50"]),
+                "p90": _ms(stats["latency"]["p90"]),
+                "p99": _ms(stats["latency"]["p99"]),
+            }
+            for system, stats in summary.items()
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    _render_charts(timeline)
+
+
+def _render_charts(timeline):
+    '''초 단위 지연시간 / 처리량 그래프'''
+    if not timeline:
+        return
+    systems = sorted({r["system"] for r in timeline})
+    seconds = sorted({r["second"] for r in timeline})
+    by_key = {(r["system"], r["second"]): r for r in timeline}
+
+    def series(system, field):
+        return [by_key.get((system, second), {}).get(field) for second in seconds]
+
+    latency = {"second": seconds}
+    throughput = {"second": seconds}
+    for system in systems:
+        latency[f"{system} p50"] = series(system, "p50")
+        latency[f"{system} p99"] = series(system, "p99")
+        throughput[f"{system} 처리량"] = series(system, "throughput")
+    throughput["목표 QPS"] = [by_key.get((systems[0], second), {}).get("offered_qps") for second in seconds]
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("##### 지연시간 (ms)")
+        st.line_chart(latency, x="second")
+    with c2:
+        st.markdown("##### 처리량 (성공/초)")
+        st.line_chart(throughput, x="second")
@@ -16,8 +16,14 @@ def render():
         ### ✨ 주요 기능
         - **자동화된 평가**: 여러 검색 키워드에 대해 일괄 테스트
         - **공정한 비교**: 동일한 조건에서 A/B 시스템 비교
-        - **유연한 설정**: GET/POST 요청, 다양한 API 형식 지원
+        - **유연한 설정**: GET/POST 요청, 다양한 API 형식 지원 (쿼리/중첩 Body 에 `{{kw}}`, CSV 컬럼 `{{컬럼명}}` 템플릿)
         - **상세한 분석**: LLM 기반의 정성적 평가
+        - **부하 테스트**: 목표 QPS·Ramp-up 으로 A/B 지연시간 변화와 포화 지점 측정
+        - **다중 시스템 비교**: 최대 6개 시스템을 Swiss 토너먼트 판정 + Bradley–Terry 점수로 순위화
+        - **통계적 유의성**: 판정 결과의 신뢰구간(Wilson / bootstrap) + 순차 검정(SPRT)으로 결론이 나면 조기 종료
+        - **분산 실행**: 키워드를 샤드로 나눠 작업 큐에 넣고 여러 머신의 워커(`python -m utils.work_queue`)가 나눠 호출
+        - **실행 진단**: 키워드 읽기 / HTTP / 파싱 / 기록 / 판정 단계별 시간과 큐 깊이, Chrome trace 내보내기 + 선택적 프로파일러
+        - **헤드리스 실행**: 검토 단계에서 내보낸 설정 JSON 으로 `python cli.py 설정.json --out 결과폴더` 실행 (CI 연동)
 
         ### 📋 사용 방법
         1. **검색 키워드 설정**: 텍스트 파일, CSV 또는 직접 입력
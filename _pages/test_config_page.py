@@ -1,25 +1,45 @@
+import json
+from functools import lru_cache
 import streamlit as st
 from utils.keyword_loader import (
-    parse_keywords_from_text,
-    parse_keywords_from_file,
-    parse_keywords_from_csv,
-    get_keyword_preview
+    iter_keywords_from_text,
+    iter_keywords_from_file,
+    iter_rows_from_csv,
+    read_csv_header,
+    dedupe_keywords,
+    normalize_pairs,
+    count_keywords,
+    sample_keywords,
+    sample_counted_keywords
 )
-from utils.api_handler import make_api_call, parse_json_path, parse_json_string
+from utils.api_handler import (
+    make_api_call, parse_json_string,
+    HTTP2_AVAILABLE, FAST_JSON_AVAILABLE
+)
+from utils.request_template import KEYWORD_VARIABLE, template_variables
+from utils.response_cache import get_response_cache
+from utils.json_path import JsonPathError, compile_json_path
 from utils.session_manager import (
-    get_keywords, set_keywords,
-    is_step_completed, set_step_completed
+    get_keyword_count, get_keyword_head, get_keyword_volume, set_keywords,
+    is_step_completed, set_step_completed,
+    init_api_defaults, get_systems, add_system, remove_system, MAX_SYSTEMS,
+    export_run_config, import_run_config
 )
+from utils.run_config import dump_run_config, validate_run_config
+
+MAX_RESPONSE_PREVIEW_CHARS = 20000
+
 
 # =====================================================
 # Step Definitions
 # =====================================================
-STEPS = [
-    {"id": 1, "key": "keywords", "label": "검색 키워드"},
-    {"id": 2, "key": "api_a", "label": "시스템 A API"},
-    {"id": 3, "key": "api_b", "label": "시스템 B API"},
-    {"id": 4, "key": "review", "label": "검토"},
-]
+def get_steps():
+    '''위저드 단계: 키워드 → 시스템별 API (비교 시스템 수만큼) → 검토'''
+    steps = [{"id": 1, "key": "keywords", "label": "검색 키워드"}]
+    for system in get_systems():
+        steps.append({"id": len(steps) + 1, "key": f"api_{system}", "label": f"시스템 {system} API", "system": system})
+    steps.append({"id": len(steps) + 1, "key": "review", "label": "검토"})
+    return steps
 
 
 # =====================================================
@@ -41,15 +61,13 @@ def render():
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
 
     # Step Content
-    step = st.session_state.current_step
-    if step == 1:
+    step = get_steps()[st.session_state.current_step - 1]
+    if step["key"] == "keywords":
         _render_step_keywords()
-    elif step == 2:
-        _render_step_api(system="A", step_key="2a")
-    elif step == 3:
-        _render_step_api(system="B", step_key="2b")
-    elif step == 4:
+    elif step["key"] == "review":
         _render_step_review()
+    else:
+        _render_step_api(system=step["system"], step_no=step["id"])
 
     st.markdown("<div style='height:18px'></div>", unsafe_allow_html=True)
     _render_wizard_nav()
@@ -62,30 +80,30 @@ def render():
 def _init_state():
     if "current_step" not in st.session_state:
         st.session_state.current_step = 1
+    # 시스템이 삭제되어 단계 수가 줄었으면 마지막 단계로
+    st.session_state.current_step = min(st.session_state.current_step, len(get_steps()))
 
     # API 테스트 여부(Next gate 용)
-    if "api_tested_A" not in st.session_state:
-        st.session_state.api_tested_A = False
-    if "api_tested_B" not in st.session_state:
-        st.session_state.api_tested_B = False
+    for system in get_systems():
+        if f"api_tested_{system}" not in st.session_state:
+            st.session_state[f"api_tested_{system}"] = False
+        init_api_defaults(system)
 
 
 def _can_go_next(step: int) -> bool:
-    # 1) 키워드 step: 키워드 로드되어야 함
-    if step == 1:
-        return bool(get_keywords())
+    current = get_steps()[step - 1]
 
-    # 2) 시스템 A step: URL 입력 + 테스트 성공(또는 완료 플래그)
-    if step == 2:
-        url = st.session_state.get("url_A", "")
-        return bool(url.strip()) and bool(st.session_state.api_tested_A)
+    # 1) 키워드 step: 키워드 로드되어야 함
+    if current["key"] == "keywords":
+        return get_keyword_count() > 0
 
-    # 3) 시스템 B step
-    if step == 3:
-        url = st.session_state.get("url_B", "")
-        return bool(url.strip()) and bool(st.session_state.api_tested_B)
+    # 2) 시스템별 API step: URL 입력 + 테스트 성공(또는 완료 플래그)
+    if "system" in current:
+        system = current["system"]
+        url = st.session_state.get(f"url_{system}", "")
+        return bool(url.strip()) and bool(st.session_state.get(f"api_tested_{system}"))
 
-    # 4) review step은 next 없음
+    # 3) review step은 next 없음
     return False
 
 
@@ -94,23 +112,29 @@ def _go_prev():
 
 
 def _go_next():
-    st.session_state.current_step = min(len(STEPS), st.session_state.current_step + 1)
+    st.session_state.current_step = min(len(get_steps()), st.session_state.current_step + 1)
 
 
 # =====================================================
 # UI - Stepper / Nav
 # =====================================================
 def _render_stepper(current_step: int):
+    labels = tuple((s["id"], s["label"]) for s in get_steps())
+    st.markdown(_stepper_html(current_step, labels), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=64)
+def _stepper_html(current_step: int, labels) -> str:
+    '''스테퍼 HTML (단계 구성/현재 단계가 같으면 rerun 마다 다시 만들지 않음)'''
     items = []
-    for s in STEPS:
-        sid = s["id"]
+    for sid, label in labels:
         if sid < current_step:
             state = "done"
         elif sid == current_step:
             state = "active"
         else:
             state = "todo"
-        items.append((sid, s["label"], state))
+        items.append((sid, label, state))
 
     html = ["<div class='stepper stepper-fit'>"]
 
@@ -125,13 +149,14 @@ def _render_stepper(current_step: int):
             html.append("<div class='dash-line'></div>")
 
     html.append("</div>")
-    st.markdown("".join(html), unsafe_allow_html=True)
+    return "".join(html)
 
 
 def _render_wizard_nav():
     step = st.session_state.current_step
+    steps = get_steps()
     is_first = (step == 1)
-    is_last = (step == len(STEPS))
+    is_last = (step == len(steps))
 
     next_ok = _can_go_next(step)
 
@@ -151,12 +176,11 @@ def _render_wizard_nav():
             st.button("완료", type="primary", use_container_width=True, disabled=True)
 
     if not is_last and not next_ok:
+        current = steps[step - 1]
         if step == 1:
             st.info("다음 단계로 이동하려면 검색 키워드를 로드해주세요.")
-        elif step == 2:
-            st.info("다음 단계로 이동하려면 시스템 A의 Endpoint 입력 후 테스트를 성공시켜주세요.")
-        elif step == 3:
-            st.info("다음 단계로 이동하려면 시스템 B의 Endpoint 입력 후 테스트를 성공시켜주세요.")
+        elif "system" in current:
+            st.info(f"다음 단계로 이동하려면 시스템 {current['system']}의 Endpoint 입력 후 테스트를 성공시켜주세요.")
 
 
 # =====================================================
@@ -190,7 +214,7 @@ def _render_step_keywords():
     with top2:
         delimiter = st.text_input("구분자", value=",", help="예: , | ; 또는 \\n", key="kw_delim")
     with top3:
-        if get_keywords():
+        if get_keyword_count():
             st.markdown("<span class='badge done'>로드 완료</span>", unsafe_allow_html=True)
         else:
             st.markdown("<span class='badge todo'>미로드</span>", unsafe_allow_html=True)
@@ -211,15 +235,85 @@ def _render_step_keywords():
         uploaded_file = st.file_uploader("텍스트 파일 선택 (.txt)", type=["txt"], key="kw_txt_file")
     else:
         uploaded_file = st.file_uploader("CSV 파일 선택 (.csv)", type=["csv"], key="kw_csv_file")
-        st.caption("첫 번째 컬럼 데이터를 키워드로 사용합니다.")
 
-    keywords = get_keywords()
-    if keywords:
+    kw_column, strata_column, field_columns = 0, None, []
+    if method == "CSV 파일 업로드" and uploaded_file:
+        header = read_csv_header(uploaded_file)
+        c1, c2 = st.columns([1, 1])
+        with c1:
+            kw_column = st.selectbox(
+                "키워드 컬럼",
+                range(len(header)),
+                format_func=lambda i: header[i],
+                key="kw_csv_column"
+            )
+        with c2:
+            strata_column = st.selectbox(
+                "층화 컬럼 (층화 샘플링용)",
+                [None] + list(range(len(header))),
+                format_func=lambda i: "(키워드 길이 구간)" if i is None else header[i],
+                key="kw_csv_strata"
+            )
+        field_columns = st.multiselect(
+            "템플릿 변수 컬럼",
+            range(len(header)),
+            format_func=lambda i: header[i],
+            help="선택한 컬럼 값을 API 요청 템플릿에서 {{컬럼명}} 으로 쓸 수 있습니다. (예: 카테고리 필터)",
+            key="kw_csv_fields"
+        )
+
+    with st.expander("중복 제거 / 샘플링", expanded=False):
+        d1, d2 = st.columns([2, 1], vertical_alignment="bottom")
+        with d1:
+            dup_mode = st.radio(
+                "중복 처리",
+                ["keep", "dedupe", "count"],
+                index=1,
+                format_func=lambda m: {
+                    "keep": "유지",
+                    "dedupe": "제거",
+                    "count": "빈도 집계 (키워드, 횟수)",
+                }[m],
+                horizontal=True,
+                key="kw_dup_mode"
+            )
+        with d2:
+            normalize = st.checkbox(
+                "정규화",
+                help="유니코드 NFC(한글) + 소문자 + 공백 정리 후 중복을 판단합니다.",
+                key="kw_normalize"
+            )
+        s1, s2, s3 = st.columns([2, 1, 1])
+        with s1:
+            if dup_mode == "count":
+                modes = ["all", "first", "random", "weighted", "bands"]
+            else:
+                modes = ["all", "first", "random", "stratified"]
+            sample_mode = st.selectbox(
+                "샘플링 방식",
+                modes,
+                format_func=lambda m: {
+                    "all": "전체 사용",
+                    "first": "빈도 상위 N개" if dup_mode == "count" else "앞에서부터 N개",
+                    "random": "무작위 N개",
+                    "stratified": "층화 무작위 N개",
+                    "weighted": "빈도 가중 무작위 N개",
+                    "bands": "Head/Torso/Tail 균등 N개",
+                }[m],
+                key="kw_sample_mode"
+            )
+        with s2:
+            sample_n = st.number_input("N", min_value=1, value=1000, step=100, key="kw_sample_n")
+        with s3:
+            sample_seed = st.number_input("Seed", min_value=0, value=42, key="kw_sample_seed")
+
+    count = get_keyword_count()
+    if count:
         with st.expander("로드된 키워드 미리보기 (상위 5개)", expanded=False):
-            for i, kw in enumerate(get_keyword_preview(keywords, 5), 1):
+            for i, kw in enumerate(get_keyword_head(5), 1):
                 st.text(f"{i}. {kw}")
-            if len(keywords) > 5:
-                st.caption(f"... 외 {len(keywords) - 5}개")
+            if count > 5:
+                st.caption(f"... 외 {count - 5}개")
 
     st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
 
@@ -228,35 +322,44 @@ def _render_step_keywords():
             if not text_input or not text_input.strip():
                 st.warning("키워드를 입력해주세요.")
                 return
-            loaded = parse_keywords_from_text(text_input, delimiter)
+            rows = ((kw, None) for kw in iter_keywords_from_text(text_input, delimiter))
 
         elif method == "텍스트 파일 업로드":
             if not uploaded_file:
                 st.warning("먼저 텍스트 파일을 업로드해주세요.")
                 return
-            loaded = parse_keywords_from_file(uploaded_file, delimiter)
+            rows = ((kw, None) for kw in iter_keywords_from_file(uploaded_file, delimiter))
 
         else:
             if not uploaded_file:
                 st.warning("먼저 CSV 파일을 업로드해주세요.")
                 return
-            loaded = parse_keywords_from_csv(uploaded_file)
-
-        set_keywords(loaded)
+            rows = iter_rows_from_csv(uploaded_file, kw_column, strata_column, field_columns)
+
+        if normalize:
+            rows = normalize_pairs(rows)
+        with st.spinner("키워드 로드 중..."):
+            if dup_mode == "count":
+                items = sample_counted_keywords(count_keywords(rows), sample_mode, int(sample_n), int(sample_seed))
+            else:
+                if dup_mode == "dedupe":
+                    rows = dedupe_keywords(rows)
+                items = sample_keywords(rows, sample_mode, int(sample_n), int(sample_seed))
+            source = set_keywords(items)
         set_step_completed(1, True)
-        st.success(f"{len(loaded)}개의 키워드가 정상적으로 로드되었습니다.")
+        st.success(f"{source['count']}개의 키워드가 정상적으로 로드되었습니다. (검색량 합계 {source['volume']:,})")
         st.rerun()
 
 
 # =====================================================
-# STEP 2/3. API
+# STEP 2..N+1. API (시스템별)
 # =====================================================
-def _render_step_api(system: str, step_key: str):
-    if not get_keywords():
+def _render_step_api(system: str, step_no: int):
+    if not get_keyword_count():
         st.warning("먼저 검색 키워드를 설정해주세요.")
         return
 
-    step_no = 2 if system == "A" else 3
+    step_key = f"api_{system}"
 
     st.markdown("<div class='step-header'>", unsafe_allow_html=True)
     st.markdown(f"<div class='step-title'>{step_no}. 시스템 {system} API 설정</div>", unsafe_allow_html=True)
@@ -267,8 +370,8 @@ def _render_step_api(system: str, step_key: str):
     st.markdown("</div>", unsafe_allow_html=True)
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
 
-    keywords = get_keywords()
-    example_kw = keywords[0] if keywords else ""
+    head = get_keyword_head(1)
+    example_kw = head[0] if head else ""
 
     with st.container(border=True):
         c1, c2 = st.columns([1, 2])
@@ -283,7 +386,6 @@ def _render_step_api(system: str, step_key: str):
 
         keyword_param = st.text_input(
             "검색 키워드 파라미터명",
-            value="query",
             key=f"param_{system}"
         )
 
@@ -294,13 +396,102 @@ def _render_step_api(system: str, step_key: str):
             st.markdown("<span class='badge todo'>미테스트</span>", unsafe_allow_html=True)
 
     with st.expander("고급 요청 설정", expanded=False):
+        query = st.text_area(
+            "Query Parameters (JSON)",
+            height=80,
+            placeholder='{"q": "{{kw}}", "category": "{{category}}", "size": 10}',
+            help="값에 {{kw}} (키워드) 또는 {{컬럼명}} (키워드 CSV 의 템플릿 변수 컬럼)을 쓸 수 있습니다. "
+                 "쿼리나 Body 에 {{변수}} 가 있으면 검색 키워드 파라미터명은 쓰지 않습니다.",
+            key=f"qparams_{system}"
+        )
         body = None
         if method == "POST":
-            body = st.text_area("Request Body (JSON)", height=110, key=f"body_{system}")
+            body = st.text_area(
+                "Request Body (JSON)",
+                height=110,
+                help="중첩 필드의 문자열 값에도 {{kw}} / {{컬럼명}} 을 쓸 수 있습니다. "
+                     '예: {"query": {"match": {"title": "{{kw}}"}}}',
+                key=f"body_{system}"
+            )
         headers = st.text_area("HTTP Headers (JSON)", height=110, key=f"headers_{system}")
 
+        p1, p2, p3 = st.columns([1, 1, 1])
+        with p1:
+            st.number_input(
+                "커넥션 풀 크기",
+                min_value=1,
+                max_value=512,
+                help="keep-alive 커넥션 재사용 수. 일괄 실행 시 동시 요청 수보다 작으면 동시 요청 수로 맞춥니다.",
+                key=f"pool_{system}"
+            )
+        with p2:
+            st.number_input(
+                "재시도 횟수 (429/5xx)",
+                min_value=0,
+                max_value=10,
+                key=f"retries_{system}"
+            )
+        with p3:
+            http2 = st.checkbox("HTTP/2 사용", key=f"http2_{system}")
+        if http2 and not HTTP2_AVAILABLE:
+            st.caption("httpx[http2]가 설치되어 있지 않아 HTTP/1.1 keep-alive로 호출합니다.")
+
+        r1, r2 = st.columns([1, 1])
+        with r1:
+            st.number_input(
+                "QPS 제한 (0 = 무제한)",
+                min_value=0.0,
+                step=1.0,
+                help="토큰 버킷으로 초당 요청 수를 제한합니다.",
+                key=f"qps_{system}"
+            )
+        with r2:
+            st.number_input(
+                "목표 p95 지연 ms (0 = 미사용)",
+                min_value=0,
+                step=50,
+                help="최근 p95 지연이 목표를 넘거나 429 응답이 오면 동시 요청 수를 절반으로 줄이고, 정상화되면 다시 늘립니다.",
+                key=f"p95_{system}"
+            )
+
     with st.expander("응답 파싱", expanded=False):
-        parse_path = st.text_input("JSON Path", placeholder="data.results.0.title", key=f"parse_{system}")
+        parse_path = st.text_input(
+            "JSON Path",
+            placeholder="data.results[:10].{title,id,score}",
+            help="예: data.results.0.title / data.results.*.title / data.results[:10].{title,id,score}",
+            key=f"parse_{system}"
+        )
+        stream = st.checkbox(
+            "대용량 응답 스트리밍 (파싱 결과만 저장)",
+            help="일괄 실행 시 응답을 크기 제한까지만 스트리밍으로 읽고 JSON Path 값만 저장합니다. "
+                 "전체 응답은 샘플 비율만큼의 키워드만 압축해 보관합니다.",
+            key=f"stream_{system}"
+        )
+        s1, s2 = st.columns([1, 1])
+        with s1:
+            st.number_input(
+                "최대 응답 크기 (KB, 0 = 무제한)", min_value=0, step=256, disabled=not stream,
+                help="이 크기를 넘는 응답은 읽기를 멈추고 실패로 기록합니다.",
+                key=f"maxkb_{system}"
+            )
+        with s2:
+            st.number_input(
+                "전체 응답 보관 비율", min_value=0.0, max_value=1.0, step=0.01, disabled=not stream,
+                help="디버깅용으로 전체 응답을 보관할 키워드 비율 (키워드 기준이라 시스템 간에 같은 키워드가 선택됩니다).",
+                key=f"sample_rate_{system}"
+            )
+        if stream and not FAST_JSON_AVAILABLE:
+            st.caption("orjson 이 설치되어 있지 않아 표준 json 모듈로 파싱합니다.")
+
+    used = template_variables(parse_json_string(query) if query else None)
+    if body:
+        used |= template_variables(parse_json_string(body))
+    unknown = used - {KEYWORD_VARIABLE} - set(getattr(example_kw, "fields", None) or ())
+    if unknown:
+        st.warning(
+            f"키워드 데이터에 없는 템플릿 변수: {', '.join(sorted(unknown))} "
+            "(빈 문자열로 채워집니다. 키워드 CSV 의 템플릿 변수 컬럼을 확인해주세요.)"
+        )
 
     st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
 
@@ -311,6 +502,7 @@ def _render_step_api(system: str, step_key: str):
             return
 
         parsed_headers = parse_json_string(headers) if headers else None
+        parsed_query = parse_json_string(query) if query else None
         parsed_body = parse_json_string(body) if body else None
 
         with st.spinner("API 호출 중..."):
@@ -320,7 +512,9 @@ def _render_step_api(system: str, step_key: str):
                 example_kw,
                 keyword_param,
                 parsed_headers,
-                parsed_body
+                parsed_body,
+                cache=get_response_cache() if st.session_state.get("use_cache", True) else None,
+                query_params=parsed_query
             )
 
         ok = _display_test_result(result, parse_path, step_key)
@@ -332,19 +526,41 @@ def _render_step_api(system: str, step_key: str):
         st.rerun()
 
 
+def _render_response(data):
+    '''API 응답 표시. 큰 응답은 앞부분만 보내 브라우저가 멈추지 않게 함'''
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    if len(text) <= MAX_RESPONSE_PREVIEW_CHARS:
+        st.json(data)
+        return
+    st.code(text[:MAX_RESPONSE_PREVIEW_CHARS] + "\n... (생략)", language="json")
+    st.caption(f"전체 {len(text):,}자 중 앞 {MAX_RESPONSE_PREVIEW_CHARS:,}자만 표시")
+
+
 def _display_test_result(result, parse_path, step_key) -> bool:
     if not result["success"]:
         st.error(result["error"])
         return False
 
-    st.success(f"호출 성공 (Status {result['status']})")
+    cached = " · 캐시 응답" if result.get("cached") else ""
+    st.success(f"호출 성공 (Status {result['status']}{cached})")
+    if not result.get("cached"):
+        ttfb = result.get("ttfb_ms")
+        st.caption(
+            f"전체 {result['latency_ms']:.1f}ms · 커넥션 수립 {result['connect_ms']:.1f}ms · "
+            f"TTFB {f'{ttfb:.1f}ms' if ttfb is not None else '-'} · "
+            f"{result['bytes']:,} bytes · 재시도 {result['retries']}회"
+        )
 
     with st.expander("전체 API 응답", expanded=False):
-        st.json(result["data"])
+        _render_response(result["data"])
 
     if parse_path:
-        parsed = parse_json_path(result["data"], parse_path)
-        if parsed is not None:
+        try:
+            parsed = compile_json_path(parse_path).extract(result["data"])
+        except JsonPathError as e:
+            st.error(f"JSON Path 오류: {e}")
+            return True
+        if parsed not in (None, []):
             st.markdown("**파싱 결과**")
             st.json(parsed)
         else:
@@ -358,7 +574,7 @@ def _display_test_result(result, parse_path, step_key) -> bool:
 # =====================================================
 def _render_step_review():
     st.markdown("<div class='step-header'>", unsafe_allow_html=True)
-    st.markdown("<div class='step-title'>4. 설정 검토</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='step-title'>{len(get_steps())}. 설정 검토</div>", unsafe_allow_html=True)
     st.markdown(
         "<div class='step-subtitle'>입력된 키워드 및 API 설정을 최종 확인합니다.</div>",
         unsafe_allow_html=True
@@ -366,24 +582,85 @@ def _render_step_review():
     st.markdown("</div>", unsafe_allow_html=True)
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
 
-    kws = get_keywords() or []
+    count = get_keyword_count()
     st.markdown("#### 키워드")
-    if kws:
-        st.markdown(f"- 총 **{len(kws)}개**")
+    if count:
+        volume = get_keyword_volume()
+        st.markdown(f"- 총 **{count}개**" + (f" (검색량 합계 {volume:,})" if volume != count else ""))
         with st.expander("미리보기", expanded=False):
-            for i, kw in enumerate(get_keyword_preview(kws, 10), 1):
+            for i, kw in enumerate(get_keyword_head(10), 1):
                 st.text(f"{i}. {kw}")
     else:
         st.warning("키워드가 없습니다.")
 
     st.markdown("#### API 설정")
-    for system in ["A", "B"]:
+    systems = get_systems()
+    for system in systems:
         url = st.session_state.get(f"url_{system}", "")
         method = st.session_state.get(f"method_{system}", "")
         param = st.session_state.get(f"param_{system}", "")
         tested = st.session_state.get(f"api_tested_{system}", False)
 
-        st.markdown(
-            f"- **시스템 {system}**: `{method}` / `{url or '-'}` "
-            f"(param: `{param or '-'}`) {'✅' if tested else '⚠️'}"
-        )
\ No newline at end of file
+        line, remove = st.columns([6, 1], vertical_alignment="center")
+        with line:
+            st.markdown(
+                f"- **시스템 {system}**: `{method}` / `{url or '-'}` "
+                f"(param: `{param or '-'}`) {'✅' if tested else '⚠️'}"
+            )
+        with remove:
+            st.button(
+                "삭제", key=f"remove_system_{system}", use_container_width=True,
+                disabled=len(systems) <= 2, on_click=remove_system, args=(system,)
+            )
+
+    st.button(
+        f"비교 시스템 추가 ({len(systems)}/{MAX_SYSTEMS})",
+        use_container_width=True,
+        disabled=len(systems) >= MAX_SYSTEMS,
+        on_click=_add_system,
+        help="3개 이상이면 판정은 Swiss 토너먼트로 일부 쌍만 비교하고 Bradley–Terry 점수로 순위를 매깁니다."
+    )
+
+    _render_config_file()
+
+
+def _render_config_file():
+    '''실행 설정 내보내기/가져오기 (cli.py 와 같은 JSON 형식)'''
+    st.markdown("#### 설정 파일")
+    st.caption("키워드와 API/실행/판정 설정을 JSON 으로 저장합니다. `python cli.py 설정.json` 으로 헤드리스 실행할 수 있습니다.")
+    c1, c2 = st.columns([1, 1], vertical_alignment="bottom")
+    with c1:
+        st.download_button(
+            "설정 내보내기",
+            data=dump_run_config(export_run_config()),
+            file_name="run_config.json",
+            mime="application/json",
+            use_container_width=True
+        )
+    with c2:
+        st.file_uploader("설정 파일 (.json)", type=["json"], key="run_config_file")
+    st.button(
+        "설정 가져오기", use_container_width=True,
+        disabled=st.session_state.get("run_config_file") is None, on_click=_import_config
+    )
+    if st.session_state.get("run_config_error"):
+        st.error(st.session_state.run_config_error)
+
+
+def _import_config():
+    '''업로드한 설정 적용 (위젯 생성 전에 상태를 바꾸도록 on_click 콜백에서 실행)'''
+    st.session_state.run_config_error = None
+    try:
+        config = validate_run_config(json.loads(st.session_state.run_config_file.getvalue()))
+        if "path" in config["keywords"]:
+            raise ValueError("가져오기는 키워드가 items 로 포함된 설정만 지원합니다.")
+        import_run_config(config)
+    except ValueError as e:  # json.JSONDecodeError 포함
+        st.session_state.run_config_error = f"설정 파일 오류: {e}"
+
+
+def _add_system():
+    '''시스템 추가 후 새 시스템의 API 설정 단계로 이동'''
+    system = add_system()
+    if system:
+        st.session_state.current_step = next(s["id"] for s in get_steps() if s.get("system") == system)
\ No newline at end of file
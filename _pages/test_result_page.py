@@ -1,5 +1,42 @@
+import os
+import numpy as np
 import streamlit as st
-from utils.session_manager import get_keywords
+from utils.batch_runner import compile_parser
+from utils.response_cache import get_response_cache
+from utils.json_path import JsonPathError
+from utils.judge import JudgeEngine, create_backend, get_judge_cache, judge_fingerprint
+from utils.job_runner import (
+    get_job_manager, submit_batch_job, submit_judge_job, submit_tournament_job, resume_batch_job, judge_job_key,
+    trace_name, JOB_COMPLETED, JOB_FAILED
+)
+from utils.result_store import get_result_store, RUN_COMPLETED, PAIR_FILTERS, PAIR_SORTS
+from utils.latency_stats import build_latency_report
+from utils.retrieval_metrics import compute_run_metrics, summarize, DEFAULT_K, DEFAULT_RBO_P
+from utils.profiling import NULL_TRACER, PROFILE_MODES, TRACE_DIR, list_traces, load_trace_summary, trace_path
+from utils.significance import SEQUENTIAL_CHUNK_SIZE, SPRT_EQUAL, significance_summary
+from utils.tournament import all_pairs, default_rounds, standings, win_probability
+from utils.session_manager import (
+    get_keyword_path, get_keyword_count, get_api_configs,
+    get_current_run_id, set_current_run_id, get_distributed_options, get_early_stop_options, get_shuffle_seed,
+    get_profile_mode
+)
+
+RESULT_PREVIEW_ROWS = 200
+VIEWER_PAGE_SIZES = (25, 50, 100)
+PREVIEW_CHARS = 200
+FILTER_LABELS = {
+    "all": "전체", "A": "{a} 승", "B": "{b} 승", "tie": "무승부", "error": "오류", "unjudged": "미판정",
+}
+SORT_LABELS = {
+    "idx": "입력 순서", "keyword": "키워드", "latency_a": "{a} 지연시간", "latency_b": "{b} 지연시간",
+    "latency_diff": "지연시간 차이 ({b} - {a})",
+}
+PROFILE_LABELS = {"off": "사용 안 함", "cprofile": "cProfile", "sampling": "샘플링 (전체 스레드)"}
+STAGE_LABELS = {
+    "keywords": "키워드 읽기", "http": "HTTP 호출", "cache": "캐시 응답", "parse": "응답 파싱",
+    "store": "결과 기록", "judge": "판정", "ui": "화면 렌더링",
+}
+METRIC_NAMES = ("overlap", "jaccard", "rbo", "kendall_tau", "identical", "ndcg_b_vs_a", "ndcg_a_vs_b", "judge_ndcg")
 
 
 def render():
@@ -7,12 +44,877 @@ def render():
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.title("📊 테스트 결과")
     st.markdown("---")
-    st.info("💡 테스트 실행 기능은 다음 단계에서 구현됩니다.")
 
-    keywords = get_keywords()
-    if keywords:
-        st.metric("설정된 키워드 수", len(keywords))
-    else:
+    count = get_keyword_count()
+    run = get_result_store().get_run(get_current_run_id()) if get_current_run_id() else None
+    if not count and not run:
         st.warning("아직 테스트를 실행하지 않았습니다. '테스트 설정 및 진행' 메뉴에서 테스트를 시작하세요.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+
+    configs = get_api_configs()
+    missing = [system for system, config in configs.items() if not config["url"]]
+
+    st.metric("설정된 키워드 수", count)
+    # 실행 중이면 화면 렌더링 시간도 그 실행의 trace 에 기록 (실행과 같은 프로세스에서 GIL 을 나눠 씀)
+    job = get_job_manager().get(run["run_id"]) if run else None
+    tracer = job.tracer if job and job.is_active and job.tracer else NULL_TRACER
+    with tracer.span("ui.render"):
+        _render_run_panel(configs, missing, run)
+        if run:
+            _render_results(run["run_id"], _run_systems(run))
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def _run_systems(run):
+    '''실행(run)에 저장된 비교 시스템 목록 (현재 세션 설정과 무관)'''
+    return list(run["config"]["configs"])
+
+
+def _render_run_panel(configs, missing, run):
+    '''일괄 실행 패널 (시스템별 동시성 설정 + 백그라운드 실행/진행률)'''
+    with st.container(border=True):
+        st.markdown("#### 일괄 실행")
+        cols = st.columns(len(configs))
+        concurrency = {}
+        for col, system in zip(cols, configs):
+            with col:
+                concurrency[system] = st.number_input(
+                    f"시스템 {system} 동시 요청 수",
+                    min_value=1,
+                    max_value=256,
+                    key=f"concurrency_{system}"
+                )
+
+        c1, c2, c3 = st.columns([3, 3, 2], vertical_alignment="bottom")
+        with c1:
+            use_cache = st.checkbox(
+                "응답 캐시 사용",
+                help="동일한 API 설정 + 키워드 조합은 저장된 응답을 재사용합니다. (TTL 24시간)",
+                key="use_cache"
+            )
+        with c2:
+            share = st.checkbox(
+                "동일 실행 공유",
+                help="같은 키워드 × 시스템 설정의 실행이 진행 중이거나 최근(6시간) 완료됐으면 "
+                     "새로 호출하지 않고 그 실행에 연결합니다. (다른 사용자 세션 포함)",
+                key="share_runs"
+            )
+        with c3:
+            if st.button("캐시 비우기", use_container_width=True):
+                get_response_cache().clear()
+        cache_stats = get_response_cache().stats()
+        st.caption(
+            f"캐시 항목 {cache_stats['entries']:,}개 · 적중 {cache_stats['hits']:,} · 미적중 {cache_stats['misses']:,}"
+        )
+
+        shuffle_seed, profile = _render_run_options()
+        distributed = _render_distributed_settings()
+
+        if missing:
+            st.info(f"시스템 {', '.join(missing)}의 Endpoint가 설정되지 않았습니다. Test Settings에서 설정해주세요.")
+
+        notice = st.session_state.pop("run_notice", None)
+        if notice:
+            st.info(notice)
+
+        job = get_job_manager().get(run["run_id"]) if run else None
+        if job and job.is_active:
+            _render_batch_progress(job.id, _run_systems(run))
+            return
+
+        if job and job.status == JOB_FAILED:
+            _render_job_status(job)
+        elif run:
+            _render_run_status(run)
+
+        if st.button("테스트 실행", type="primary", use_container_width=True, disabled=bool(missing) or not get_keyword_count()):
+            try:
+                for config in configs.values():
+                    compile_parser(config)
+            except JsonPathError as e:
+                st.error(f"응답 파싱 경로 오류: {e}")
+                return
+
+            job, attached = submit_batch_job(
+                get_keyword_path(), get_keyword_count(), configs, concurrency, use_cache, share, distributed,
+                shuffle_seed, profile
+            )
+            if attached:
+                st.session_state.run_notice = f"같은 키워드 × 설정의 실행 {job.id}에 연결했습니다. (새로 호출하지 않음)"
+            set_current_run_id(job.id)
+            st.session_state.judge_job_id = None
+            st.rerun()
+
+
+def _render_run_options():
+    '''키워드 순서 무작위화 + 프로파일러 설정. 반환: submit_batch_job 의 (shuffle_seed, profile) 인자'''
+    r1, r2, r3 = st.columns([3, 2, 3], vertical_alignment="bottom")
+    with r1:
+        enabled = st.checkbox(
+            "키워드 순서 무작위화",
+            help="키워드를 섞은 순서로 호출합니다. 판정 조기 종료는 먼저 끝난 키워드만 보고 결론을 내리므로, "
+                 "입력 파일이 카테고리 등으로 정렬돼 있으면 켜야 편향이 없습니다.",
+            key="shuffle_keywords"
+        )
+    with r2:
+        st.number_input("Seed", min_value=0, step=1, disabled=not enabled, key="shuffle_seed")
+    with r3:
+        st.selectbox(
+            "프로파일러",
+            ["off", *PROFILE_MODES],
+            format_func=lambda m: PROFILE_LABELS[m],
+            help="단계별 시간은 항상 기록됩니다. 프로파일러는 함수 단위 시간까지 보려는 경우에만 켜세요. "
+                 "cProfile 은 프로세스 전체(다른 작업 포함)를 측정하고 한 번에 하나만 켤 수 있어, "
+                 "사용 중이면 샘플링으로 대체됩니다.",
+            key="profile_mode"
+        )
+    return get_shuffle_seed(), get_profile_mode()
+
+
+def _render_distributed_settings():
+    '''분산 실행(작업 큐) 설정. 반환: submit_batch_job 의 distributed 인자 (미사용 시 None)'''
+    with st.expander("분산 실행 (작업 큐)", expanded=False):
+        enabled = st.checkbox(
+            "작업 큐로 분산 실행",
+            help="키워드를 샤드로 나눠 작업 큐에 넣고 워커 프로세스들이 나눠 호출합니다. "
+                 "동시 요청 수와 QPS 제한은 워커마다 적용됩니다.",
+            key="dist_enabled"
+        )
+        d1, d2 = st.columns([1, 1])
+        with d1:
+            st.number_input("샤드 크기 (키워드)", min_value=1, step=500, disabled=not enabled, key="dist_shard_size")
+        with d2:
+            st.number_input(
+                "이 서버의 워커 프로세스 수", min_value=0, max_value=64, disabled=not enabled,
+                help="0 이면 다른 머신의 워커만 사용합니다.",
+                key="dist_local_workers"
+            )
+        st.text_input(
+            "작업 큐", disabled=not enabled,
+            help="<backend>:<위치>. 기본 SQLite 큐를 여러 머신에서 쓰려면 공유 파일시스템 경로를 지정합니다.",
+            key="dist_queue"
+        )
+        st.caption("다른 머신에서 워커 추가 (큐 / 결과 저장소 / .cache/runs 공유 필요):")
+        st.code(
+            f"python -m utils.work_queue --queue {st.session_state.get('dist_queue')} "
+            f"--store {get_result_store().path}",
+            language="bash"
+        )
+    return get_distributed_options()
+
+
+def _render_run_status(run):
+    '''저장된 실행 상태 + 재개 버튼 (서버 재시작 후에도 체크포인트부터 이어서 실행)'''
+    summary = get_result_store().summary(run["run_id"])
+    done = min((summary.get(system, {}).get("done", 0) for system in _run_systems(run)), default=0)
+    if run["status"] == RUN_COMPLETED:
+        st.success(f"실행 {run['run_id']} 완료 ({done:,}/{run['total']:,})")
+        return
+
+    st.warning(f"실행 {run['run_id']} 중단됨 ({done:,}/{run['total']:,} 완료)")
+    if st.button("이어서 실행", use_container_width=True, key=f"resume_{run['run_id']}"):
+        resume_batch_job(run["run_id"])
+        st.rerun()
+
+
+def _render_job_status(job):
+    '''종료된 작업 상태 + 재개 버튼'''
+    if job.status == JOB_COMPLETED:
+        st.success(f"작업 {job.id} 완료")
+        return
+
+    if job.status == JOB_FAILED:
+        st.error(f"작업 {job.id} 실패: {job.error}")
+    else:
+        st.warning(f"작업 {job.id} 취소됨")
+    if st.button("이어서 실행", use_container_width=True, key=f"resume_{job.id}"):
+        if job.kind == "batch":
+            resume_batch_job(job.id)
+        else:
+            job.resume()
+        st.rerun()
+
+
+@st.fragment(run_every=1.0)
+def _render_batch_progress(job_id, systems):
+    '''백그라운드 일괄 호출 진행률 (1초 간격 폴링)'''
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return
+    if not job.is_active:
+        st.rerun()
+
+    for system in systems:
+        p = job.progress.get(system)
+        if not p:
+            st.progress(0.0, text=f"시스템 {system} 대기 중")
+            continue
+        st.progress(min(1.0, p["done"] / p["total"]) if p["total"] else 1.0, text=f"시스템 {system} {p['done']}/{p['total']}")
+        if "shards" in p:
+            continue
+        st.caption(
+            f"QPS {p['qps']:.1f} · 제한 대기 {p['throttled']}건 · "
+            f"in-flight {p['in_flight']}/{p['limit']} · "
+            f"p50 {_ms(p['p50_ms'])} · p99 {_ms(p['p99_ms'])}"
+        )
+    distributed = next((p for p in job.progress.values() if "shards" in p), None)
+    if distributed:
+        shards = distributed["shards"]
+        # 모든 머신의 워커 결과를 합친 진행률 (결과 저장소 기준)
+        st.caption(
+            f"샤드 완료 {shards['done']}/{shards['total']} · 처리 중 {shards['leased']} · 대기 {shards['pending']} · "
+            f"실패 {shards['failed']} · 활성 워커 {shards['workers']}"
+        )
+        if not shards["workers"] and shards["pending"]:
+            st.caption("처리 중인 워커가 없습니다. 워커 프로세스를 시작해주세요.")
+        if shards["error"]:
+            log = f" · 로컬 워커 로그: {distributed['worker_log']}" if distributed.get("worker_log") else ""
+            st.caption(f"⚠️ 최근 샤드 오류 (순번 {shards['error_shard']:,}~, 재시도 중일 수 있음): {shards['error']}{log}")
+    if job.attached:
+        st.caption(f"다른 세션 {job.attached}곳과 공유 중인 실행입니다. 취소하면 모든 세션의 실행이 중단됩니다.")
+    if st.button("실행 취소", use_container_width=True, key=f"cancel_{job_id}"):
+        job.cancel()
+
+
+def _render_results(run_id, systems):
+    '''시스템별 결과 요약 + 판정 + 결과 미리보기 (저장소에서 필요한 만큼만 조회)'''
+    store = get_result_store()
+    summary = store.summary(run_id)
+    if not summary:
+        return
+
+    cols = st.columns(len(systems))
+    for col, system in zip(cols, systems):
+        stats = summary.get(system, {"done": 0, "success": 0, "cached": 0})
+        with col:
+            st.metric(f"시스템 {system} 성공", f"{stats['success']:,}/{stats['done']:,}")
+            st.caption(f"캐시 적중 {stats['cached']:,}건 · 미적중 {stats['done'] - stats['cached']:,}건")
+
+    # 시스템이 3개 이상이면 쌍 단위 패널(지연시간 차이 / 검색 지표 / 결과 뷰어)은 선택한 쌍을 비교
+    pair = _select_pair(systems)
+    _render_latency_panel(run_id, summary, systems, pair)
+    _render_metrics_panel(run_id, summary, pair, len(systems) > 2)
+    if len(systems) > 2:
+        _render_tournament_panel(run_id, systems)
+    else:
+        _render_judge_panel(run_id)
+
+    _render_result_viewer(run_id, pair, len(systems) > 2)
+    _render_diagnostics_panel(run_id)
+
+
+def _select_pair(systems):
+    if len(systems) == 2:
+        return tuple(systems)
+    return st.selectbox(
+        "비교 쌍",
+        all_pairs(systems),
+        format_func=lambda pair: f"{pair[0]} vs {pair[1]}",
+        key="compare_pair",
+        help="지연시간 차이 · 검색 지표 · 키워드별 결과에 사용할 두 시스템"
+    )
+
+
+def _render_result_viewer(run_id, pair, matches):
+    '''
+    키워드별 결과 뷰어. 필터/정렬/검색/페이지 조회를 저장소 쿼리로 처리해 현재 페이지만 전송하고,
+    전체 응답은 행을 선택했을 때만 불러옵니다. matches 면 토너먼트 판정의 해당 쌍 결과를 표시합니다.
+    '''
+    store = get_result_store()
+    x, y = pair
+    with st.container(border=True):
+        st.markdown("#### 키워드별 결과")
+        c1, c2, c3, c4 = st.columns([1, 1, 2, 1])
+        with c1:
+            pair_filter = st.selectbox(
+                "필터", PAIR_FILTERS, format_func=lambda f: FILTER_LABELS[f].format(a=x, b=y), key="viewer_filter"
+            )
+        with c2:
+            sort = st.selectbox(
+                "정렬", list(PAIR_SORTS), format_func=lambda f: SORT_LABELS[f].format(a=x, b=y), key="viewer_sort"
+            )
+        with c3:
+            search = st.text_input("키워드 검색", placeholder="부분 일치", key="viewer_search").strip()
+        with c4:
+            page_size = st.selectbox("페이지 크기", VIEWER_PAGE_SIZES, key="viewer_page_size")
+
+        judge = _current_judge()
+        total = store.count_pairs(run_id, pair_filter, search, pair, matches, judge)
+        pages = max(1, -(-total // page_size))
+        # 필터/검색으로 페이지 수가 줄면 마지막 페이지로 (위젯 value 대신 상태로 관리)
+        if st.session_state.get("viewer_page", 1) > pages or "viewer_page" not in st.session_state:
+            st.session_state.viewer_page = min(st.session_state.get("viewer_page", 1), pages)
+        p1, p2 = st.columns([1, 3], vertical_alignment="bottom")
+        with p1:
+            page = st.number_input(f"페이지 (/ {pages:,})", min_value=1, max_value=pages, key="viewer_page")
+        with p2:
+            descending = st.toggle("내림차순", key="viewer_desc")
+
+        offset = (page - 1) * page_size
+        pairs = store.query_pairs(
+            run_id, pair_filter, search, sort, descending, offset=offset, limit=page_size, systems=pair,
+            matches=matches, judge=judge
+        )
+        st.caption(f"{total:,}건 중 {offset + 1 if pairs else 0:,}–{offset + len(pairs):,}")
+        winners = {"A": x, "B": y}
+        event = st.dataframe(
+            [
+                {
+                    "keyword": row["keyword"],
+                    "winner": winners.get(row["winner"], row["winner"] or ""),
+                    f"status_{x}": row["a"]["status"],
+                    f"status_{y}": row["b"]["status"],
+                    f"latency_{x}": row["a"]["latency_ms"],
+                    f"latency_{y}": row["b"]["latency_ms"],
+                    f"parsed_{x}": _preview(row["a"]),
+                    f"parsed_{y}": _preview(row["b"]),
+                    "reason": row["reason"] or "",
+                }
+                for row in pairs
+            ],
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=f"viewer_table_{run_id}_{x}{y}"
+        )
+
+        selected = event.selection.rows if event else []
+        if selected and selected[0] < len(pairs):
+            _render_pair_detail(run_id, pairs[selected[0]], pair)
+        else:
+            st.caption("행을 선택하면 전체 응답을 불러옵니다.")
+
+
+def _preview(record):
+    text = str(record.get("parsed", record.get("error", "")))
+    return text if len(text) <= PREVIEW_CHARS else text[:PREVIEW_CHARS] + "…"
+
+
+def _render_pair_detail(run_id, row, systems):
+    '''선택한 키워드의 두 시스템 전체 응답 (선택 시에만 저장소에서 조회)'''
+    st.markdown(f"##### {row['keyword']}")
+    if row["reason"]:
+        st.caption(f"판정 사유: {row['reason']}")
+    cols = st.columns(len(systems))
+    for col, system in zip(cols, systems):
+        record = get_result_store().load_record(run_id, system, row["idx"])
+        with col:
+            st.markdown(f"**시스템 {system}** · Status {record['status']}")
+            if "error" in record:
+                st.error(record["error"])
+            if "parsed" in record:
+                st.json(record["parsed"], expanded=1)
+            with st.expander("전체 API 응답", expanded=False):
+                if record["payload_stored"]:
+                    st.json(record["data"], expanded=1)
+                elif record["success"]:
+                    st.caption("스트리밍 모드: 샘플로 선택된 키워드만 전체 응답을 보관합니다.")
+
+
+def _ms(value):
+    return f"{value:,.1f}ms" if value is not None else "-"
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _load_latency_report(run_id, systems, version):
+    '''지연시간 리포트 (완료 건수가 바뀔 때만 다시 계산)'''
+    return build_latency_report(get_result_store(), run_id, systems)
+
+
+def _render_latency_panel(run_id, summary, systems, pair):
+    '''시스템별 지연시간 백분위 · 오류율 · 처리량 비교 + 선택한 쌍의 키워드별 지연시간 차이'''
+    version = tuple(sorted((system, stats["done"]) for system, stats in summary.items()))
+    report = _load_latency_report(run_id, tuple(systems), version)
+    x, y = pair
+
+    def pct(value):
+        return f"{value * 100:.2f}%" if value is not None else "-"
+
+    def pct_point(value):
+        return f"{value * 100:+.2f}%p" if value is not None else "-"
+
+    def num(value):
+        return f"{value:,.1f}" if value is not None else "-"
+
+    def row(label, get, fmt=_ms, diff_fmt=None):
+        values = {system: get(report[system]) for system in systems}
+        va, vb = values[x], values[y]
+        diff = vb - va if va is not None and vb is not None else None
+        return {
+            "지표": label, **{system: fmt(value) for system, value in values.items()},
+            f"{y} - {x}": (diff_fmt or fmt)(diff),
+        }
+
+    with st.container(border=True):
+        st.markdown("#### 지연시간")
+        rows = [
+            row("p50", lambda r: r["latency"]["p50"]),
+            row("p90", lambda r: r["latency"]["p90"]),
+            row("p99", lambda r: r["latency"]["p99"]),
+            row("TTFB p50", lambda r: r["ttfb"]["p50"]),
+            row("TTFB p99", lambda r: r["ttfb"]["p99"]),
+            row("평균 커넥션 수립", lambda r: r["mean_connect_ms"]),
+            row("오류율", lambda r: r["error_rate"], pct, pct_point),
+            row("처리량 (호출/초)", lambda r: r["throughput"], num),
+            row("평균 응답 크기 (bytes)", lambda r: r["mean_bytes"], num),
+            row("재시도", lambda r: r["retries"], num),
+        ]
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+        st.caption("캐시 응답을 제외한 성공 호출 기준 · 백분위는 스트리밍 히스토그램 추정치 (오차 1% 이내)")
+
+        order = st.selectbox(
+            "키워드별 지연시간 차이",
+            ["abs", "slower_b", "slower_a"],
+            format_func=lambda o: {"abs": "차이 큰 순", "slower_b": f"{y} 가 느린 순", "slower_a": f"{x} 가 느린 순"}[o],
+            key="latency_diff_order"
+        )
+        diffs = get_result_store().latency_diffs(run_id, pair, limit=RESULT_PREVIEW_ROWS, order=order)
+        st.dataframe(
+            [
+                {"keyword": d["keyword"], f"{x} (ms)": d["latency_a"], f"{y} (ms)": d["latency_b"],
+                 f"{y} - {x} (ms)": d["diff"], f"TTFB {x} (ms)": d["ttfb_a"], f"TTFB {y} (ms)": d["ttfb_b"]}
+                for d in diffs
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+
+
+@st.cache_data(max_entries=8, show_spinner="검색 지표 계산 중...")
+def _load_run_metrics(run_id, k, p, pair, matches, judge, version):
+    '''검색 지표 (완료/판정 건수가 바뀔 때만 다시 계산)'''
+    run_metrics = compute_run_metrics(get_result_store(), run_id, k, p, pair, matches, judge)
+    return run_metrics, summarize({name: run_metrics[name] for name in METRIC_NAMES})
+
+
+def _render_metrics_panel(run_id, summary, pair, matches):
+    '''두 시스템(pair) 파싱 결과 목록 간 검색 지표 (LLM 없이 즉시 계산)'''
+    x, y = pair
+    with st.container(border=True):
+        st.markdown("#### 검색 지표")
+        c1, c2 = st.columns(2)
+        with c1:
+            k = st.number_input("k (상위 결과 수)", min_value=1, max_value=100, value=DEFAULT_K, key="metrics_k")
+        with c2:
+            p = st.number_input(
+                "RBO p", min_value=0.5, max_value=0.99, value=DEFAULT_RBO_P, step=0.01, key="metrics_rbo_p",
+                help="값이 클수록 하위 순위까지 비중을 둡니다."
+            )
+
+        judge = _current_judge()
+        verdicts = get_result_store().judge_savings(run_id, matches, judge)["total"]
+        version = (tuple(sorted((system, stats["done"]) for system, stats in summary.items())), verdicts)
+        run_metrics, stats = _load_run_metrics(run_id, k, p, tuple(pair), matches, judge, version)
+        if not stats["count"]:
+            st.caption("파싱 결과가 있는 성공 키워드가 없습니다. 응답 파싱 경로를 설정하면 계산됩니다.")
+            return
+
+        def fmt(value):
+            return f"{value:.3f}" if value is not None else "-"
+
+        m = st.columns(6)
+        m[0].metric(f"Overlap@{k}", fmt(stats["overlap"]))
+        m[1].metric("Jaccard", fmt(stats["jaccard"]))
+        m[2].metric("RBO", fmt(stats["rbo"]))
+        m[3].metric("Kendall τ", fmt(stats["kendall_tau"]))
+        m[4].metric(f"nDCG ({y} | {x})", fmt(stats["ndcg_b_vs_a"]))
+        m[5].metric("nDCG (판정 기준)", fmt(stats["judge_ndcg"]))
+        st.caption(
+            f"{stats['count']:,}개 키워드 · {x}/{y} 결과 동일 {stats['identical']:,}건 (판정 생략 가능) · "
+            f"nDCG ({y} | {x}) 는 {x} 순위를, 판정 기준 nDCG 는 판정에서 이긴 쪽 순위를 정답으로 본 값입니다."
+        )
+
+        order = np.argsort(run_metrics["rbo"], kind="stable")[:RESULT_PREVIEW_ROWS]
+        st.dataframe(
+            [
+                {
+                    "keyword": run_metrics["keyword"][i],
+                    "overlap": round(float(run_metrics["overlap"][i]), 3),
+                    "jaccard": round(float(run_metrics["jaccard"][i]), 3),
+                    "rbo": round(float(run_metrics["rbo"][i]), 3),
+                    "kendall_tau": None if np.isnan(run_metrics["kendall_tau"][i])
+                    else round(float(run_metrics["kendall_tau"][i]), 3),
+                    "winner": {"A": x, "B": y}.get(run_metrics["winner"][i], run_metrics["winner"][i] or ""),
+                }
+                for i in order
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("RBO 가 낮은(결과가 많이 다른) 순")
+
+
+def _render_judge_settings():
+    '''LLM 판정 설정 위젯. 반환: 판정 엔진 생성 함수 (설정 오류면 ValueError)'''
+    c1, c2 = st.columns([1, 1])
+    with c1:
+        backend_kind = st.selectbox(
+            "판정 백엔드",
+            ["openai", "stub"],
+            format_func=lambda k: {"openai": "OpenAI 호환 API", "stub": "로컬 스텁 (오프라인 테스트)"}[k],
+            key="judge_backend"
+        )
+    with c2:
+        mode = st.selectbox(
+            "판정 방식",
+            ["pairwise", "pointwise"],
+            format_func=lambda m: {"pairwise": "쌍 비교", "pointwise": "개별 점수 (1~5)"}[m],
+            key="judge_mode"
+        )
+
+    base_url, model, api_key = "", "", None
+    if backend_kind == "openai":
+        o1, o2, o3 = st.columns([2, 1, 1])
+        with o1:
+            base_url = st.text_input("Base URL", key="judge_base_url")
+        with o2:
+            model = st.text_input("모델", key="judge_model")
+        with o3:
+            api_key = st.text_input("API Key", type="password", key="judge_api_key")
+
+    b1, b2 = st.columns([1, 1])
+    with b1:
+        batch_size = st.number_input(
+            "배치 크기", min_value=1, max_value=128, key="judge_batch_size"
+        )
+    with b2:
+        workers = st.number_input(
+            "동시 판정 수", min_value=1, max_value=64, key="judge_workers"
+        )
+
+    def create_engine():
+        backend = create_backend(backend_kind, base_url, model, api_key)
+        return JudgeEngine(backend, mode, batch_size, workers, cache=get_judge_cache())
+
+    return create_engine
+
+
+def _current_judge():
+    '''현재 판정 설정의 식별자 (판정 작업 / 판정 결과 조회 범위). 판정 설정 위젯의 세션 상태로 계산'''
+    state = st.session_state
+    return judge_fingerprint(
+        state.get("judge_backend", ""), state.get("judge_mode", ""),
+        state.get("judge_base_url", ""), state.get("judge_model", "")
+    )
+
+
+def _render_prejudge_settings():
+    '''판정 전 단계 설정. 반환: (skip_identical, similarity_threshold 또는 None)'''
+    s1, s2 = st.columns([1, 1], vertical_alignment="bottom")
+    with s1:
+        skip_identical = st.checkbox(
+            "동일 결과는 판정 생략 (자동 무승부)",
+            help="두 시스템의 파싱 결과가 같은 키워드는 LLM 을 호출하지 않고 무승부로 확정합니다.",
+            key="judge_skip_identical"
+        )
+    with s2:
+        similarity_threshold = st.number_input(
+            "유사 결과 임계값 (RBO, 1 = 완전 동일만)",
+            min_value=0.5, max_value=1.0, step=0.01,
+            disabled=not skip_identical,
+            help="상위 결과 순위의 RBO 가 이 값 이상이면 유사 결과로 보고 자동 무승부 처리합니다.",
+            key="judge_similarity_threshold"
+        )
+    return skip_identical, similarity_threshold if similarity_threshold < 1.0 else None
+
+
+def _render_early_stop_settings():
+    '''판정 조기 종료(순차 검정) 설정. 반환: submit_judge_job 의 early_stop 인자 (미사용 시 None)'''
+    enabled = st.checkbox(
+        "유의한 차이가 확인되면 조기 종료",
+        help=f"판정 {SEQUENTIAL_CHUNK_SIZE}건마다 순차 검정(SPRT)을 해서 결론이 나면 남은 판정과 호출을 멈춥니다. "
+             "일괄 실행 중에도 끝난 키워드부터 판정할 수 있습니다.",
+        key="judge_early_stop"
+    )
+    e1, e2, e3 = st.columns([1, 1, 1])
+    with e1:
+        st.number_input(
+            "유의수준 (α)", min_value=0.001, max_value=0.2, step=0.01, format="%.3f", disabled=not enabled,
+            key="judge_alpha"
+        )
+    with e2:
+        st.number_input(
+            "β (1 - 검정력)", min_value=0.01, max_value=0.5, step=0.05, disabled=not enabled,
+            key="judge_beta"
+        )
+    with e3:
+        st.number_input(
+            "최소 효과 (승률 차)", min_value=0.01, max_value=0.45, step=0.01, disabled=not enabled,
+            help="승패가 갈린 키워드에서 한쪽 승률이 0.5 + 이 값 이상이면 '차이 있음'으로 봅니다.",
+            key="judge_delta"
+        )
+    return get_early_stop_options()
+
+
+def _render_judge_launcher(run_id, submit, streaming=False):
+    '''
+    판정 진행률 또는 실행 버튼. submit() 은 판정 작업을 시작해 Job 을 반환.
+    streaming 이면 일괄 실행 중에도 판정을 시작할 수 있음 (조기 종료 판정)
+    '''
+    # 다른 세션이 같은 실행을 판정 중이면 그 작업을 보여줌 (중복 판정 방지)
+    shared = get_job_manager().find(judge_job_key(run_id, _current_judge()))
+    job = shared if shared and shared.is_active else get_job_manager().get(st.session_state.get("judge_job_id"))
+    batch_job = get_job_manager().get(run_id)
+    if job and job.is_active:
+        _render_judge_progress(job.id)
+        return
+
+    if job:
+        _render_job_status(job)
+    batch_running = bool(batch_job and batch_job.is_active)
+    if st.button("판정 실행", type="primary", use_container_width=True, disabled=batch_running and not streaming):
+        try:
+            job = submit()
+        except ValueError as e:
+            st.error(str(e))
+            return
+        st.session_state.judge_job_id = job.id
+        st.rerun()
+
+
+def _render_savings_caption(savings):
+    saved = savings["auto"] + savings["cached"]
+    st.caption(
+        f"LLM 판정 절감 {saved:,}/{savings['total']:,}건 ({saved / savings['total'] * 100:.1f}%) · "
+        f"자동 무승부 {savings['auto']:,}건 · 판정 캐시 재사용 {savings['cached']:,}건"
+    )
+
+
+def _render_judge_panel(run_id):
+    '''LLM 판정 설정 + 실행 + 요약'''
+    with st.container(border=True):
+        st.markdown("#### LLM 판정")
+        create_engine = _render_judge_settings()
+        skip_identical, similarity_threshold = _render_prejudge_settings()
+        early_stop = _render_early_stop_settings()
+        _render_judge_launcher(
+            run_id,
+            lambda: submit_judge_job(create_engine(), run_id, skip_identical, similarity_threshold, early_stop),
+            streaming=early_stop is not None
+        )
+
+        judge = _current_judge()
+        counts = get_result_store().verdict_counts(run_id, judge)
+        if counts:
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("A 승", counts.get("A", 0))
+            m2.metric("B 승", counts.get("B", 0))
+            m3.metric("무승부", counts.get("tie", 0))
+            m4.metric("판정 오류", counts.get("error", 0))
+            _render_significance(run_id, counts, early_stop)
+            _render_savings_caption(get_result_store().judge_savings(run_id, judge=judge))
+
+
+def _render_significance(run_id, counts, early_stop):
+    '''판정 집계의 신뢰구간 + 순차 검정 상태'''
+    options = early_stop or {}
+    alpha = options.get("alpha", st.session_state.get("judge_alpha"))
+    summary = significance_summary(
+        counts, alpha, options.get("beta", st.session_state.get("judge_beta")),
+        options.get("delta", st.session_state.get("judge_delta"))
+    )
+    if not summary["n"]:
+        return
+
+    level = f"{(1 - alpha) * 100:.0f}%"
+    s1, s2, s3 = st.columns(3)
+    if summary["b_win_rate"] is not None:
+        low, high = summary["wilson"]
+        s1.metric("B 승률 (승패 갈린 키워드)", f"{summary['b_win_rate'] * 100:.1f}%")
+        s1.caption(f"{level} 구간 {low * 100:.1f}% ~ {high * 100:.1f}% (Wilson)")
+    low, high = summary["bootstrap"]
+    s2.metric("B 선호 점수 (무승부 0.5)", f"{summary['score'] * 100:.1f}%")
+    s2.caption(f"{level} 구간 {low * 100:.1f}% ~ {high * 100:.1f}% (bootstrap)")
+    decision = summary["sprt"]["decision"]
+    s3.metric(
+        "순차 검정 (SPRT)",
+        "진행 중" if decision is None else "차이 없음" if decision == SPRT_EQUAL else f"{decision} 우세"
+    )
+    s3.caption(f"판정 {summary['n']:,}건 · 승패 {summary['decisive']:,}건")
+
+    run = get_result_store().get_run(run_id)
+    if run and run["config"].get("shuffle_seed") is None and summary["n"] < run["total"]:
+        st.caption(
+            "⚠️ 키워드 순서를 무작위화하지 않은 실행입니다. "
+            "일부 키워드만 판정한 결론은 입력 순서에 따라 편향될 수 있습니다."
+        )
+
+
+def _render_tournament_panel(run_id, systems):
+    '''시스템 3개 이상: Swiss 토너먼트 판정 + Bradley–Terry 순위표'''
+    n = len(systems)
+    with st.container(border=True):
+        st.markdown("#### LLM 판정 (Swiss 토너먼트)")
+        create_engine = _render_judge_settings()
+        skip_identical, similarity_threshold = _render_prejudge_settings()
+        max_rounds = n - 1 + n % 2
+        rounds_key = f"tournament_rounds_{n}"
+        st.session_state[rounds_key] = min(st.session_state.get(rounds_key) or default_rounds(n), max_rounds)
+        rounds = st.number_input(
+            "라운드 수", min_value=1, max_value=max_rounds, key=rounds_key,
+            help="라운드마다 현재 점수가 비슷한 시스템끼리 아직 붙지 않은 상대와 짝지어 N/2 쌍만 판정합니다."
+        )
+        st.caption(
+            f"키워드당 판정 {rounds * (n // 2)}쌍 (전체 쌍 비교 시 {n * (n - 1) // 2}쌍) · "
+            "점수는 쌍별 승패로 추정한 Bradley–Terry 강도(log)입니다."
+        )
+        _render_judge_launcher(
+            run_id,
+            lambda: submit_tournament_job(create_engine(), run_id, rounds, skip_identical, similarity_threshold)
+        )
+
+        judge = _current_judge()
+        rows = get_result_store().match_summary(run_id, judge)
+        if not rows:
+            return
+        table = standings(rows, systems)
+        scores = {entry["system"]: entry["score"] for entry in table}
+        leader = table[0]["system"]
+        st.dataframe(
+            [
+                {
+                    "순위": rank, "시스템": entry["system"], "BT 점수": round(entry["score"], 3),
+                    f"{leader} 상대 승률": "-" if entry["system"] == leader
+                    else f"{win_probability(scores, entry['system'], leader) * 100:.1f}%",
+                    "승": entry["wins"], "패": entry["losses"], "무": entry["ties"], "판정 수": entry["matches"],
+                }
+                for rank, entry in enumerate(table, 1)
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        pairings = get_result_store().get_pairings(run_id, judge)
+        st.caption(" · ".join(
+            f"R{round_no + 1}: " + ", ".join(f"{x} vs {y}" for x, y in pairs)
+            for round_no, pairs in sorted(pairings.items())
+        ))
+        _render_savings_caption(get_result_store().judge_savings(run_id, matches=True, judge=judge))
+
+
+@st.fragment(run_every=1.0)
+def _render_judge_progress(job_id):
+    '''백그라운드 판정 진행률 (1초 간격 폴링)'''
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return
+    if not job.is_active:
+        st.rerun()
+
+    p = job.progress.get("judge")
+    if not p:
+        st.progress(0.0, text="판정 대기 중")
+    else:
+        stage = f"라운드 {p['round']}/{p['rounds']} · {p['pair'][0]} vs {p['pair'][1]} · " if "round" in p else ""
+        st.progress(p["done"] / p["total"] if p["total"] else 1.0, text=f"{stage}판정 {p['done']}/{p['total']}")
+        st.caption(
+            f"백엔드 호출 {p['backend_calls']}회 · 자동 무승부 {p['auto']}건 · "
+            f"중복 판정 제거 {p['deduped']}건 · 캐시 재사용 {p['cache_hits']}건"
+        )
+    if st.button("판정 취소", use_container_width=True, key=f"cancel_{job_id}"):
+        job.cancel()
+
+
+def _run_traces(run_id):
+    '''
+    실행의 trace 목록 {표시 이름: (trace 이름, 진행 중인 작업의 Tracer 또는 None)}.
+    진행 중인 작업은 메모리의 Tracer 를, 끝난 작업 / 분산 워커 샤드는 저장된 trace 파일을 봅니다.
+    '''
+    manager = get_job_manager()
+    live = {
+        trace_name(run_id, "batch"): manager.get(run_id),
+        trace_name(run_id, "judge"): manager.find(judge_job_key(run_id, _current_judge())),
+    }
+    names = list_traces(f"{run_id}.")
+    names += [name for name, job in live.items() if name not in names and job and job.is_active and job.tracer]
+    traces = {}
+    for name in names:
+        job = live.get(name)
+        stage = name[len(run_id) + 1:]
+        label = {"batch": "일괄 호출", "judge": "판정"}.get(stage, f"워커 샤드 {stage[len('shard-'):]}")
+        traces[label] = (name, job.tracer if job and job.is_active and job.tracer else None)
+    return traces
+
+
+def _render_diagnostics_panel(run_id):
+    '''실행 진단: 단계별 시간(span 집계) + 단계 사이 큐 깊이 + 프로파일 상위 함수 + trace 파일 내려받기'''
+    with st.expander("실행 진단", expanded=False):
+        traces = _run_traces(run_id)
+        if not traces:
+            st.caption("기록된 trace 가 없습니다.")
+            return
+        label = st.selectbox("구간", list(traces), key=f"diag_trace_{run_id}")
+        name, tracer = traces[label]
+        summary = tracer.summary() if tracer else load_trace_summary(name)
+        if not summary:
+            return
+
+        d1, d2, d3 = st.columns(3)
+        d1.metric("실행 시간", f"{summary['wall_s']:.1f}s" + (" (진행 중)" if tracer else ""))
+        d2.metric("기록된 span", f"{sum(stage['count'] for stage in summary['stages']):,}")
+        d3.metric("trace 이벤트", f"{summary['events']:,}")
+        if summary["dropped"]:
+            st.caption(f"이벤트 한도를 넘은 span {summary['dropped']:,}건은 집계에만 반영되고 trace 파일에는 없습니다.")
+
+        busy = sum(stage["total_s"] for stage in summary["stages"])
+        st.dataframe(
+            [
+                {
+                    "단계": stage["stage"], "구분": STAGE_LABELS.get(stage["stage"].split(".", 1)[0], ""),
+                    "횟수": stage["count"], "합계 (s)": round(stage["total_s"], 2),
+                    "비중": f"{stage['total_s'] / busy * 100:.1f}%" if busy else "-",
+                    "평균 (ms)": round(stage["mean_ms"], 2), "최대 (ms)": round(stage["max_ms"], 1),
+                    "평균 동시 실행": round(stage["concurrency"], 2) if stage["concurrency"] is not None else None,
+                }
+                for stage in summary["stages"]
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption(
+            "합계는 모든 스레드의 시간 합이라 실행 시간보다 클 수 있습니다. "
+            "평균 동시 실행 = 합계 / 실행 시간 (HTTP 는 동시 요청 수에 가까울수록 호출이 병목)"
+        )
+        if summary["counters"]:
+            st.markdown("**단계 사이 큐 깊이**")
+            st.dataframe(
+                [
+                    {
+                        "큐": counter["counter"], "현재": counter["last"], "최대": counter["max"],
+                        "평균": round(counter["mean"], 1) if counter["mean"] is not None else None,
+                    }
+                    for counter in summary["counters"]
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+
+        profile = summary.get("profile")
+        if profile:
+            st.markdown(f"**프로파일 상위 함수 ({PROFILE_LABELS[profile['mode']]})**")
+            if profile.get("note"):
+                st.caption(profile["note"])
+            st.dataframe(profile["top"], use_container_width=True, hide_index=True)
 
-    st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+        if tracer:
+            st.caption("trace 파일은 작업이 끝나면 저장됩니다.")
+            return
+        b1, b2 = st.columns(2)
+        with b1:
+            with open(trace_path(name), "rb") as f:
+                st.download_button(
+                    "Chrome trace 내려받기", f.read(), file_name=f"{name}.trace.json", mime="application/json",
+                    help="chrome://tracing 또는 https://ui.perfetto.dev 에서 엽니다.",
+                    use_container_width=True, key=f"diag_download_{name}"
+                )
+        if profile and os.path.exists(profile["path"]):
+            with b2:
+                with open(profile["path"], "rb") as f:
+                    st.download_button(
+                        "프로파일 내려받기", f.read(), file_name=os.path.basename(profile["path"]),
+                        help="cProfile: snakeviz / pstats, 샘플링: flamegraph.pl / speedscope (collapsed stack)",
+                        use_container_width=True, key=f"diag_profile_{name}"
+                    )
+        st.caption(f"저장 위치: {TRACE_DIR}")
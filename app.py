@@ -1,5 +1,5 @@
+import importlib
 import streamlit as st
-from _pages import readme_page, test_config_page, test_result_page
 from utils.css_loader import load_css
 from utils.session_manager import init_session_state
 
@@ -42,22 +42,25 @@ with st.sidebar:
 
     page = st.radio(
         "navigation",
-        ["description", "settings", "run&result"],  # 🔴 내부 값 = state 값
+        ["description", "settings", "run&result", "loadtest"],  # 🔴 내부 값 = state 값
         label_visibility="collapsed",
         key="page",  # 🔴 기존 state 그대로 사용
         format_func=lambda x: {
             "description": "📖ㅤDescription",
             "settings": "⚙️ㅤTest Settings",
             "run&result": "📊ㅤTest Run & Result",
+            "loadtest": "🚀ㅤLoad Test",
         }[x],
     )
 
 # -----------------------------
 # Page Routing
 # -----------------------------
-if st.session_state.page == "description":
-    readme_page.render()
-elif st.session_state.page == "settings":
-    test_config_page.render()
-elif st.session_state.page == "run&result":
-    test_result_page.render()
\ No newline at end of file
+# 페이지 모듈은 처음 열릴 때 import (numpy / 작업 실행기 등 무거운 의존성을 해당 페이지에서만 로드)
+PAGES = {
+    "description": "_pages.readme_page",
+    "settings": "_pages.test_config_page",
+    "run&result": "_pages.test_result_page",
+    "loadtest": "_pages.load_test_page",
+}
+importlib.import_module(PAGES[st.session_state.page]).render()
@@ -0,0 +1,198 @@
+import json
+import math
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+ERROR_STATUSES = (500, 503)
+STARTUP_TIMEOUT_S = 10.0
+
+# 이름 있는 서버 프로파일 (make_server_profile 인자)
+SERVER_PRESETS = {
+    "fast": {},
+    "realistic": {"latency": "lognormal", "latency_ms": 20.0, "sigma": 0.5, "error_rate": 0.01, "results": 20},
+    "heavy": {"latency": "uniform", "latency_ms": 50.0, "results": 100, "payload_bytes": 1024},
+}
+
+
+# =====================================================
+# Server Profile
+# =====================================================
+def make_server_profile(
+        latency: str = "constant",
+        latency_ms: float = 0.0,
+        sigma: float = 0.5,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        results: int = 10,
+        payload_bytes: int = 0,
+        keyword_param: str = "query",
+        seed: int = 42
+) -> Dict[str, Any]:
+    '''
+    모의 검색 API 동작 설정.
+
+    - latency: 응답 지연 분포. constant (고정) / uniform (0 ~ 2×평균) /
+      exponential (평균) / lognormal (평균, sigma = log 표준편차)
+    - error_rate: error_status 로 응답할 확률 (재시도 대상 5xx)
+    - results / payload_bytes: 응답 결과 수와 결과 1건당 snippet 크기 (응답 크기 조절)
+    '''
+    if latency not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"지원하지 않는 지연 분포: {latency}")
+    if not 0.0 <= error_rate <= 1.0:
+        raise ValueError("error_rate 는 0 ~ 1 사이여야 합니다.")
+    if error_status not in ERROR_STATUSES:
+        raise ValueError(f"지원하지 않는 오류 상태 코드: {error_status}")
+    return {
+        "latency": latency, "latency_ms": float(latency_ms), "sigma": float(sigma),
+        "error_rate": float(error_rate), "error_status": int(error_status),
+        "results": int(results), "payload_bytes": int(payload_bytes),
+        "keyword_param": keyword_param, "seed": seed,
+    }
+
+
+def sample_latency_ms(profile: Dict[str, Any], rng: random.Random) -> float:
+    mean = profile["latency_ms"]
+    if mean <= 0:
+        return 0.0
+    kind = profile["latency"]
+    if kind == "uniform":
+        return rng.uniform(0.0, 2 * mean)
+    if kind == "exponential":
+        return rng.expovariate(1.0 / mean)
+    if kind == "lognormal":
+        sigma = profile["sigma"]
+        # 평균이 mean 이 되도록 mu 보정 (E[X] = exp(mu + sigma²/2))
+        return rng.lognormvariate(math.log(mean) - sigma * sigma / 2, sigma)
+    return mean
+
+
+# =====================================================
+# HTTP Handler
+# =====================================================
+class _SearchHandler(BaseHTTPRequestHandler):
+    '''GET ?query= / POST {"query": ...} 모두 {"data": {"results": [...]}} 로 응답'''
+
+    protocol_version = "HTTP/1.1"  # keep-alive (클라이언트 커넥션 풀 재사용)
+    disable_nagle_algorithm = True  # 헤더/본문을 나눠 쓰므로 Nagle + delayed ACK 로 ~40ms 지연되는 것 방지
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        values = parse_qs(url.query).get(self.server.profile["keyword_param"], [""])
+        self._respond(values[0])
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, b'{"error": "invalid json"}')
+            return
+        self._respond(str(body.get(self.server.profile["keyword_param"], "")))
+
+    def _respond(self, keyword: str) -> None:
+        profile = self.server.profile
+        with self.server.rng_lock:
+            delay = sample_latency_ms(profile, self.server.rng)
+            failed = self.server.rng.random() < profile["error_rate"]
+        if delay:
+            time.sleep(delay / 1000)
+        if failed:
+            self._send(profile["error_status"], b'{"error": "mock failure"}')
+            return
+
+        # 키워드마다 결정적인 결과 순서 (같은 키워드면 같은 응답)
+        order = random.Random(keyword).sample(range(profile["results"] * 2), profile["results"])
+        body = json.dumps({
+            "data": {
+                "query": keyword,
+                "results": [
+                    {"id": doc_id, "title": f"{keyword} #{doc_id}", "snippet": self.server.padding}
+                    for doc_id in order
+                ],
+            }
+        }, ensure_ascii=False).encode("utf-8")
+        self._send(200, body)
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, profile: Dict[str, Any]):
+        super().__init__(address, _SearchHandler)
+        self.profile = profile
+        self.padding = "x" * profile["payload_bytes"]
+        self.rng = random.Random(profile["seed"])
+        self.rng_lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 응답 크기 제한 등으로 커넥션을 먼저 끊는 것은 정상 동작
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _serve(profile: Dict[str, Any], port_pipe) -> None:
+    server = _MockHTTPServer(("127.0.0.1", 0), profile)
+    port_pipe.send(server.server_address[1])
+    server.serve_forever()
+
+
+# =====================================================
+# Server Process
+# =====================================================
+class MockSearchServer:
+    '''
+    모의 검색 API 서버. 측정 대상 클라이언트와 GIL 을 나눠 쓰지 않도록 별도 프로세스에서 실행합니다.
+
+        with MockSearchServer(make_server_profile(latency_ms=5)) as server:
+            config = {"url": server.url, "method": "GET", ...}
+    '''
+
+    def __init__(self, profile: Optional[Dict[str, Any]] = None):
+        self.profile = profile or make_server_profile()
+        self.port: Optional[int] = None
+        self._process = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/search"
+
+    def start(self) -> "MockSearchServer":
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        self._process = context.Process(target=_serve, args=(self.profile, sender), daemon=True)
+        self._process.start()
+        if not receiver.poll(STARTUP_TIMEOUT_S):
+            self.stop()
+            raise RuntimeError("모의 서버가 시작되지 않았습니다.")
+        self.port = receiver.recv()
+        return self
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
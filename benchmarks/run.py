@@ -0,0 +1,349 @@
+'''
+재현 가능한 처리량 벤치마크. 로컬 모의 검색 API(GET/POST)를 띄우고 키워드 수별로
+처리량(keywords/sec), 꼬리 지연시간, 메모리 사용량을 측정해 JSON 으로 저장합니다.
+
+    python -m benchmarks.run --sizes 10,1000,100000 --server realistic --out bench.json
+    python -m benchmarks.run --out new.json --compare bench.json   # 회귀 시 종료 코드 1
+
+측정 케이스 (--cases):
+- parse: 텍스트 파일 → 키워드 분리 → 중복 제거 → 스풀 (네트워크 없음)
+- call:  ApiSession 1개로 순차 호출 (GET / POST 각각, 호출당 클라이언트 오버헤드)
+- batch: run_batch 로 GET 시스템 + POST 시스템 동시 호출 (화면의 일괄 실행과 같은 경로)
+  --stream 이면 스트리밍 응답 모드(크기 제한 + 파싱 경로 값만 보관)로 호출
+
+케이스마다 새 프로세스에서 실행하므로 메모리(최대 RSS)가 케이스 간에 섞이지 않습니다.
+'''
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.mock_server import (
+    LATENCY_DISTRIBUTIONS, SERVER_PRESETS, MockSearchServer, make_server_profile
+)
+
+BENCH_SCHEMA_VERSION = 1
+CASES = ("parse", "call", "batch")
+DEFAULT_SIZES = (10, 1000, 10000, 100000)
+MAX_CALL_KEYWORDS = 10000  # call 케이스는 순차 호출이므로 이 수까지만
+DUPLICATE_EVERY = 20  # 키워드 20개마다 1개는 앞 키워드 반복 (중복 제거 경로 측정)
+PERCENTILES = (50, 95, 99)
+DEFAULT_TOLERANCE = 0.10
+
+# 회귀 판정 지표: (경로, 클수록 좋은지)
+REGRESSION_METRICS = (
+    ("keywords_per_sec", True),
+    ("latency_ms.p99", False),
+    ("rss_peak_mb", False),
+)
+
+
+# =====================================================
+# Keyword Fixtures
+# =====================================================
+def write_keyword_file(path: str, size: int) -> None:
+    '''결정적인 합성 키워드 파일 (줄 단위, DUPLICATE_EVERY 마다 중복 1개)'''
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            n = i - 1 if i and i % DUPLICATE_EVERY == 0 else i
+            f.write(f"검색어 {n} query-{n * 7919 % 100003}\n")
+
+
+def _rss_mb() -> Optional[float]:
+    '''현재 프로세스의 최대 RSS (MB). resource 모듈이 없는 플랫폼은 None'''
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _latency_summary(histogram) -> Dict[str, Any]:
+    stats = histogram.summary(PERCENTILES)
+    return {key: stats[key] for key in ("mean", "max", *(f"p{q}" for q in PERCENTILES))}
+
+
+# =====================================================
+# Cases (자식 프로세스에서 실행)
+# =====================================================
+def _case_parse(keyword_file: str, size: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    from utils.keyword_loader import dedupe_keywords, iter_keywords_from_file, spool_keywords
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with open(keyword_file, "rb") as f:
+            pairs = dedupe_keywords((kw, None) for kw in iter_keywords_from_file(f, "\n"))
+            source = spool_keywords((kw for kw, _ in pairs), os.path.join(tmp, "spool.jsonl"))
+        elapsed = time.perf_counter() - start
+    return {"elapsed_s": elapsed, "keywords": source["count"], "keywords_per_sec": size / elapsed}
+
+
+def _case_call(keyword_file: str, size: int, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from utils.api_handler import ApiSession
+    from utils.keyword_loader import iter_keywords_from_file
+    from utils.latency_stats import LatencyHistogram
+
+    n = min(size, MAX_CALL_KEYWORDS)
+    rows = []
+    for method, url in (("GET", options["urls"]["GET"]), ("POST", options["urls"]["POST"])):
+        histogram, errors = LatencyHistogram(), 0
+        with open(keyword_file, "rb") as f, ApiSession(url, method, "query") as session, \
+                closing(iter_keywords_from_file(f, "\n")) as keywords:
+            start = time.perf_counter()
+            for keyword in islice(keywords, n):
+                result = session.call(keyword)
+                histogram.record(result["latency_ms"])
+                errors += not result["success"]
+            elapsed = time.perf_counter() - start
+        rows.append({
+            "method": method, "keywords": n, "elapsed_s": elapsed, "keywords_per_sec": n / elapsed,
+            "errors": errors, "latency_ms": _latency_summary(histogram),
+        })
+    return rows
+
+
+def _case_batch(keyword_file: str, size: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    from utils.batch_runner import run_batch
+    from utils.keyword_loader import iter_keywords_from_file
+    from utils.latency_stats import LatencyHistogram
+
+    configs = {
+        system: {"url": options["urls"][method], "method": method, "keyword_param": "query",
+                 "parse_path": "data.results", "stream_response": options["stream"]}
+        for system, method in (("A", "GET"), ("B", "POST"))
+    }
+    histograms = {system: LatencyHistogram() for system in configs}
+    errors = {system: 0 for system in configs}
+
+    def on_record(system, idx, record):
+        histograms[system].record(record.get("latency_ms"))
+        errors[system] += not record["success"]
+
+    concurrency = {system: options["concurrency"] for system in configs}
+    with open(keyword_file, "rb") as f:
+        start = time.perf_counter()
+        run_batch(iter_keywords_from_file(f, "\n"), configs, on_record, concurrency, total=size)
+        elapsed = time.perf_counter() - start
+
+    merged = LatencyHistogram()
+    for histogram in histograms.values():
+        merged.merge(histogram)
+    return {
+        "elapsed_s": elapsed,
+        "keywords": size,
+        "keywords_per_sec": size / elapsed,
+        "calls_per_sec": size * len(configs) / elapsed,
+        "errors": sum(errors.values()),
+        "latency_ms": _latency_summary(merged),
+        "latency_ms_by_system": {system: _latency_summary(h) for system, h in histograms.items()},
+    }
+
+
+CASE_FUNCTIONS = {"parse": _case_parse, "call": _case_call, "batch": _case_batch}
+
+
+def _run_case(case: str, keyword_file: str, size: int, options: Dict[str, Any], sender) -> None:
+    '''자식 프로세스 진입점: import 후 기준 RSS 를 재고 케이스 실행'''
+    import utils.batch_runner  # noqa: F401  (기준 RSS 에 모듈 import 포함)
+
+    baseline = _rss_mb()
+    try:
+        result = CASE_FUNCTIONS[case](keyword_file, size, options)
+        rows = result if isinstance(result, list) else [result]
+        for row in rows:
+            row.update({"rss_baseline_mb": baseline, "rss_peak_mb": _rss_mb()})
+        sender.send({"rows": rows})
+    except Exception as e:
+        sender.send({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_case(case: str, keyword_file: str, size: int, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_case, args=(case, keyword_file, size, options, sender))
+    process.start()
+    message = receiver.recv()
+    process.join()
+    if "error" in message:
+        raise RuntimeError(f"{case} (size={size}) 실패: {message['error']}")
+    return [{"case": case, "size": size, **row} for row in message["rows"]]
+
+
+# =====================================================
+# Report
+# =====================================================
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def _metadata() -> Dict[str, Any]:
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _result_key(row: Dict[str, Any]):
+    return row["case"], row["size"], row.get("method")
+
+
+def _metric(row: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = row
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def compare_reports(
+        baseline: Dict[str, Any],
+        current: Dict[str, Any],
+        tolerance: float = DEFAULT_TOLERANCE
+) -> List[Dict[str, Any]]:
+    '''
+    같은 (case, size, method) 결과끼리 REGRESSION_METRICS 비교.
+    tolerance 이상 나빠진 항목만 반환 ([{"case", "size", "method", "metric", "baseline", "current", "change"}]).
+    서버 프로파일이 다르면 비교하지 않습니다.
+    '''
+    for field in ("server", "stream"):
+        if baseline.get(field) != current.get(field):
+            raise ValueError(f"{field} 설정이 다른 결과는 비교할 수 없습니다.")
+    previous = {_result_key(row): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in current.get("results", []):
+        base = previous.get(_result_key(row))
+        if not base:
+            continue
+        for path, higher_is_better in REGRESSION_METRICS:
+            old, new = _metric(base, path), _metric(row, path)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append({
+                    "case": row["case"], "size": row["size"], "method": row.get("method"),
+                    "metric": path, "baseline": old, "current": new, "change": change,
+                })
+    return regressions
+
+
+# =====================================================
+# Main
+# =====================================================
+def _server_profile(args) -> Dict[str, Any]:
+    overrides = {
+        name: getattr(args, name) for name in
+        ("latency", "latency_ms", "sigma", "error_rate", "results", "payload_bytes")
+        if getattr(args, name) is not None
+    }
+    return make_server_profile(**{**SERVER_PRESETS[args.server], **overrides})
+
+
+def run_benchmarks(
+        cases: List[str],
+        sizes: List[int],
+        profile: Dict[str, Any],
+        concurrency: int,
+        stream: bool = False,
+        log=None
+) -> Dict[str, Any]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, MockSearchServer(profile) as get_server, \
+            MockSearchServer(profile) as post_server:
+        options = {
+            "urls": {"GET": get_server.url, "POST": post_server.url}, "concurrency": concurrency, "stream": stream,
+        }
+        for size in sizes:
+            keyword_file = os.path.join(tmp, f"keywords-{size}.txt")
+            write_keyword_file(keyword_file, size)
+            for case in cases:
+                rows = run_case(case, keyword_file, size, options)
+                results.extend(rows)
+                if log:
+                    for row in rows:
+                        log(_describe(row))
+            os.remove(keyword_file)
+    return {
+        "schema": BENCH_SCHEMA_VERSION,
+        "meta": _metadata(),
+        "server": profile,
+        "concurrency": concurrency,
+        "stream": stream,
+        "results": results,
+    }
+
+
+def _describe(row: Dict[str, Any]) -> str:
+    label = f"{row['case']}{'/' + row['method'] if row.get('method') else ''} n={row['size']:,}"
+    latency = row.get("latency_ms")
+    tail = f" p99 {latency['p99']:.1f}ms" if latency and latency.get("p99") is not None else ""
+    return f"{label}: {row['keywords_per_sec']:,.0f} kw/s{tail} · RSS {row['rss_peak_mb'] or 0:.0f}MB"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="모의 검색 API 기반 처리량 벤치마크")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"쉼표 구분 ({', '.join(CASES)})")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="키워드 수 (쉼표 구분, 10 ~ 1000000)")
+    parser.add_argument("--server", choices=sorted(SERVER_PRESETS), default="fast", help="모의 서버 프리셋")
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, help="지연 분포 (프리셋 덮어쓰기)")
+    parser.add_argument("--latency-ms", type=float, help="평균 지연시간 (ms)")
+    parser.add_argument("--sigma", type=float, help="lognormal 분포의 log 표준편차")
+    parser.add_argument("--error-rate", type=float, help="5xx 응답 비율 (0 ~ 1)")
+    parser.add_argument("--results", type=int, help="응답 결과 수")
+    parser.add_argument("--payload-bytes", type=int, help="결과 1건당 snippet 크기")
+    parser.add_argument("--concurrency", type=int, default=8, help="batch 케이스의 시스템별 동시 요청 수")
+    parser.add_argument("--stream", action="store_true", help="batch 케이스를 스트리밍 응답 모드로 실행")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: 표준 출력)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON (회귀 시 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="회귀 허용 비율 (기본 0.1)")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in args.cases.split(",") if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"알 수 없는 케이스: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    report = run_benchmarks(cases, sizes, _server_profile(args), args.concurrency, args.stream, log)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_reports(baseline, report, args.tolerance)
+        for r in regressions:
+            log(
+                f"회귀 {r['case']}{'/' + r['method'] if r['method'] else ''} n={r['size']:,} "
+                f"{r['metric']}: {r['baseline']:.4g} → {r['current']:.4g} ({r['change']:+.1%})"
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+'''
+헤드리스 실행: UI 에서 내보낸 것과 같은 실행 설정(JSON)으로 일괄 호출 → 판정 → 결과 파일 저장.
+
+    python cli.py run_config.json --out results/
+    python cli.py run_config.json --no-judge
+
+결과는 UI 와 같은 ResultStore 에 기록되므로 `?run=<run_id>` 로 화면에서도 열 수 있습니다.
+출력 디렉터리에는 records.jsonl / verdicts.jsonl (또는 matches.jsonl) / summary.json 과
+단계별 시간 trace (<run_id>.batch.trace.json 등, chrome://tracing / Perfetto 에서 열림)가 생성됩니다.
+'''
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from utils.batch_runner import compile_parser
+from utils.job_runner import JOB_COMPLETED, Job, submit_batch_job, submit_judge_job, submit_tournament_job
+from utils.json_path import JsonPathError
+from utils.keyword_loader import spool_keywords
+from utils.latency_stats import build_latency_report
+from utils.result_store import get_result_store
+from utils.retrieval_metrics import compute_run_metrics, summarize
+from utils.profiling import PROFILE_MODES, list_traces, load_trace_summary, trace_path
+from utils.run_config import create_judge_engine, iter_config_keywords, load_run_config
+from utils.significance import significance_summary
+from utils.tournament import standings
+
+PROGRESS_INTERVAL = 1.0
+
+
+# =====================================================
+# Helpers
+# =====================================================
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _wait(job: Job, describe) -> bool:
+    '''작업이 끝날 때까지 PROGRESS_INTERVAL 마다 진행률 출력. 반환: 정상 완료 여부'''
+    while job.is_active:
+        job.wait(PROGRESS_INTERVAL)
+        if job.progress:
+            _log(describe(job.progress))
+    if job.status != JOB_COMPLETED:
+        _log(f"[{job.kind}] {job.status}: {job.error or ''}".rstrip())
+        return False
+    return True
+
+
+def _describe_batch(progress: Dict[str, Dict[str, Any]]) -> str:
+    return "[batch] " + " · ".join(
+        f"{system} {p['done']:,}/{p['total']:,}" for system, p in sorted(progress.items())
+    )
+
+
+def _describe_judge(progress: Dict[str, Dict[str, Any]]) -> str:
+    p = progress.get("judge", {})
+    stage = f" R{p['round']}/{p['rounds']} {'-'.join(p['pair'])}" if "round" in p else ""
+    return f"[judge]{stage} {p.get('done', 0):,}/{p.get('total', 0):,} (자동 {p.get('auto', 0):,})"
+
+
+def _write_jsonl(path: Path, rows: Iterable[Dict[str, Any]]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def _iter_all_records(store, run_id: str, systems):
+    for system in systems:
+        for record in store.iter_records(run_id, system):
+            yield {"system": system, **record}
+
+
+def _copy_traces(run_id: str, out: Path) -> Dict[str, Any]:
+    '''실행의 trace (+ 프로파일) 파일을 출력 디렉터리로 복사. 반환: {trace 이름: 단계별 시간 요약}'''
+    traces = {}
+    for name in list_traces(f"{run_id}."):
+        shutil.copy(trace_path(name), out)
+        summary = load_trace_summary(name)
+        profile = summary.get("profile")
+        if profile and os.path.exists(profile["path"]):
+            shutil.copy(profile["path"], out)
+        traces[name] = {
+            "wall_s": summary["wall_s"],
+            "stages": {stage["stage"]: round(stage["total_s"], 3) for stage in summary["stages"]},
+        }
+    return traces
+
+
+# =====================================================
+# Main
+# =====================================================
+def run(
+        config_path: str,
+        out_dir: str,
+        judge: bool = True,
+        reuse: bool = False,
+        profile: Optional[str] = None
+) -> int:
+    '''
+    실행 설정 1건 실행. 반환: 종료 코드 (0 = 성공)
+    reuse 이면 같은 키워드 × 설정으로 최근 완료된 실행이 저장소에 있을 때 다시 호출하지 않고 그 결과를 씁니다.
+    profile 을 주면 설정 파일의 profile 대신 이 프로파일러를 씁니다.
+    '''
+    try:
+        config = load_run_config(config_path)
+        for api in config["systems"].values():
+            compile_parser(api)
+        # 판정 설정 오류는 일괄 호출 전에 알림 (호출을 다 마친 뒤 실패하지 않도록)
+        judge_config = config["judge"] if judge else None
+        engine = create_judge_engine(judge_config) if judge_config else None
+    except (OSError, ValueError, JsonPathError) as e:  # json.JSONDecodeError 포함
+        _log(f"설정 오류: {e}")
+        return 1
+
+    fd, keyword_path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        source = spool_keywords(iter_config_keywords(config), keyword_path)
+        if not source["count"]:
+            _log("키워드가 없습니다.")
+            return 1
+        job, attached = submit_batch_job(
+            keyword_path, source["count"], config["systems"], config["concurrency"], config["use_cache"], reuse,
+            config["distributed"], config["shuffle_seed"], profile or config["profile"]
+        )
+    finally:
+        os.remove(keyword_path)
+
+    run_id = job.id
+    systems = list(config["systems"])
+    _log(f"실행 {run_id}: 키워드 {source['count']:,}개 × 시스템 {', '.join(systems)}")
+    if attached:
+        _log(f"같은 키워드 × 설정의 실행 {run_id} 결과를 재사용합니다. (새로 호출하지 않음)")
+    store = get_result_store()
+    tournament = len(systems) > 2
+    early_stop = judge_config["early_stop"] if judge_config and not tournament else None
+    fingerprint = engine.fingerprint if engine else ""
+
+    judge_job = None
+    if early_stop:
+        # 조기 종료 판정은 일괄 호출과 동시에 진행: 결론이 나면 남은 호출도 취소됨
+        judge_job = submit_judge_job(
+            engine, run_id,
+            judge_config["skip_identical"], judge_config["similarity_threshold"], early_stop
+        )
+        ok = _wait(judge_job, _describe_judge)
+        ok = (_wait(job, _describe_batch) or "early_stop" in judge_job.results) and ok
+    else:
+        ok = _wait(job, _describe_batch)
+
+    if ok and judge_config and judge_job is None:
+        if tournament:
+            judge_job = submit_tournament_job(
+                engine, run_id, judge_config["rounds"],
+                judge_config["skip_identical"], judge_config["similarity_threshold"]
+            )
+        else:
+            judge_job = submit_judge_job(
+                engine, run_id, judge_config["skip_identical"], judge_config["similarity_threshold"]
+            )
+        ok = _wait(judge_job, _describe_judge)
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    _write_jsonl(out / "records.jsonl", _iter_all_records(store, run_id, systems))
+    summary: Dict[str, Any] = {
+        "run_id": run_id,
+        "status": store.get_run(run_id)["status"],
+        "keywords": source["count"],
+        "systems": systems,
+        "latency": build_latency_report(store, run_id, systems),
+    }
+    if judge_config:
+        if tournament:
+            _write_jsonl(out / "matches.jsonl", store.iter_verdicts(run_id, matches=True, judge=fingerprint))
+            summary["standings"] = standings(store.match_summary(run_id, fingerprint), systems)
+            summary["judge_savings"] = store.judge_savings(run_id, matches=True, judge=fingerprint)
+        else:
+            _write_jsonl(out / "verdicts.jsonl", store.iter_verdicts(run_id, judge=fingerprint))
+            summary["verdicts"] = store.verdict_counts(run_id, fingerprint)
+            summary["judge_savings"] = store.judge_savings(run_id, judge=fingerprint)
+            options = early_stop or {}
+            summary["significance"] = significance_summary(summary["verdicts"], **options)
+            if judge_job is not None and "early_stop" in judge_job.results:
+                summary["early_stop"] = judge_job.results["early_stop"]
+    if not tournament:
+        summary["metrics"] = summarize({
+            name: values for name, values in compute_run_metrics(store, run_id, systems=systems, judge=fingerprint).items()
+            if name not in ("idx", "keyword", "winner")
+        })
+    summary["traces"] = _copy_traces(run_id, out)
+    (out / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    _log(f"결과 저장: {out.resolve()}")
+    return 0 if ok else 2
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="검색 시스템 비교 + LLM 판정 헤드리스 실행")
+    parser.add_argument("config", help="실행 설정 JSON (UI 의 '설정 내보내기' 와 같은 형식)")
+    parser.add_argument("--out", default=None, help="결과 디렉터리 (기본: results/<시각>)")
+    parser.add_argument("--no-judge", action="store_true", help="일괄 호출만 하고 판정은 생략")
+    parser.add_argument("--reuse", action="store_true", help="최근 완료된 같은 키워드 × 설정 실행이 있으면 결과 재사용")
+    parser.add_argument("--profile", choices=PROFILE_MODES, help="실행 / 판정 작업 프로파일러 (설정 파일의 profile 대신)")
+    args = parser.parse_args(argv)
+    out_dir = args.out or os.path.join("results", time.strftime("%Y%m%d-%H%M%S"))
+    return run(args.config, out_dir, judge=not args.no_judge, reuse=args.reuse, profile=args.profile)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
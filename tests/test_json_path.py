@@ -0,0 +1,66 @@
+import pytest
+
+from utils.json_path import JsonPathError, compile_json_path
+
+RESPONSE = {
+    "data": {
+        "total": 3,
+        "results": [
+            {"title": "a", "id": 1, "meta": {"score": 0.9}},
+            {"title": "b", "id": 2, "meta": {"score": 0.5}},
+            {"title": "c", "id": 3},
+        ],
+    }
+}
+
+
+def test_single_value_path():
+    assert compile_json_path("data.total").extract(RESPONSE) == 3
+    assert compile_json_path("data.results.0.title").extract(RESPONSE) == "a"
+    assert compile_json_path("data.results[1].id").extract(RESPONSE) == 2
+    assert compile_json_path("data.results[-1].title").extract(RESPONSE) == "c"
+
+
+def test_missing_value_is_none_or_empty():
+    assert compile_json_path("data.missing").extract(RESPONSE) is None
+    assert compile_json_path("data.results[10].title").extract(RESPONSE) is None
+    assert compile_json_path("data.missing.*.title").extract(RESPONSE) == []
+
+
+def test_wildcard_and_slice_fan_out():
+    assert compile_json_path("data.results.*.title").extract(RESPONSE) == ["a", "b", "c"]
+    assert compile_json_path("data.results[*].id").extract(RESPONSE) == [1, 2, 3]
+    assert compile_json_path("data.results[:2].title").extract(RESPONSE) == ["a", "b"]
+    assert compile_json_path("data.results[1:].id").extract(RESPONSE) == [2, 3]
+    assert compile_json_path("data.results[::2].id").extract(RESPONSE) == [1, 3]
+
+
+def test_fan_out_skips_hits_without_value():
+    assert compile_json_path("data.results.*.meta.score").extract(RESPONSE) == [0.9, 0.5]
+
+
+def test_projection():
+    path = compile_json_path("data.results[:2].{title, meta.score}")
+    assert path.extract(RESPONSE) == [{"title": "a", "meta.score": 0.9}, {"title": "b", "meta.score": 0.5}]
+    assert compile_json_path("data.results[2].{id,meta.score}").extract(RESPONSE) == {"id": 3, "meta.score": None}
+
+
+def test_extract_list():
+    assert compile_json_path("data.results").extract_list(RESPONSE) == RESPONSE["data"]["results"]
+    assert compile_json_path("data.results.*.id").extract_list(RESPONSE) == [1, 2, 3]
+    assert compile_json_path("data.total").extract_list(RESPONSE) == [3]
+    assert compile_json_path("data.missing").extract_list(RESPONSE) == []
+
+
+@pytest.mark.parametrize("path", ["", "   ", "data[", "data[x]", "data[1:2:3:4]", "data[--1]", "data[::0]", "data.{}", "data.{title}.id"])
+def test_invalid_paths(path):
+    with pytest.raises(JsonPathError):
+        compile_json_path(path)
+
+
+def test_json_path_error_is_value_error():
+    assert issubclass(JsonPathError, ValueError)
+
+
+def test_compiled_paths_are_cached():
+    assert compile_json_path("data.results.*.id") is compile_json_path("data.results.*.id")
@@ -0,0 +1,193 @@
+import json
+import threading
+
+import pytest
+
+from utils import judge
+from utils.judge import (
+    JudgeBackend, JudgeEngine, StubJudgeBackend, build_judge_item, normalize_winner, parse_judge_output, prejudge
+)
+from utils.response_cache import ResponseCache
+
+
+class ScriptedBackend(JudgeBackend):
+    '''프롬프트 → 응답 함수로 동작하는 테스트용 백엔드 (호출마다 받은 프롬프트 수 기록)'''
+
+    name = "scripted"
+    kind = "scripted"
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    def complete(self, prompts):
+        self.calls.append(len(prompts))
+        return [self.respond(prompt) for prompt in prompts]
+
+
+def _winner(winner):
+    return lambda prompt: json.dumps({"winner": winner, "reason": "test"})
+
+
+def _items(n):
+    return [
+        build_judge_item(f"keyword {i}", {"success": True, "parsed": [i]}, {"success": True, "parsed": [i, 1]}, i)
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(judge.time, "sleep", lambda seconds: None)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("A", "A"), (" b ", "B"), ("TIE", "tie"), ("tie", "tie"), ("C", None), ("", None), (None, None), (1, None),
+])
+def test_normalize_winner(value, expected):
+    assert normalize_winner(value) == expected
+
+
+def test_parse_judge_output_extracts_json():
+    assert parse_judge_output('답: {"winner": "A", "reason": "x"} 끝') == {"winner": "A", "reason": "x"}
+    assert parse_judge_output("no json") is None
+    assert parse_judge_output("{broken") is None
+    assert parse_judge_output(None) is None
+
+
+def test_pairwise_verdicts_keep_order_and_idx():
+    engine = JudgeEngine(ScriptedBackend(_winner("b")), batch_size=2, max_workers=2)
+    verdicts = engine.judge(_items(5))
+    assert [v["idx"] for v in verdicts] == list(range(5))
+    assert {v["winner"] for v in verdicts} == {"B"}
+    assert engine.backend_calls == 3
+
+
+def test_invalid_winner_is_error():
+    verdicts = JudgeEngine(ScriptedBackend(_winner("C"))).judge(_items(1))
+    assert verdicts[0]["winner"] is None
+    assert "winner" in verdicts[0]["reason"]
+
+
+def test_pointwise_compares_scores():
+    def respond(prompt):
+        return json.dumps({"score": 5 if "strong" in prompt else 2, "reason": "test"})
+
+    item = build_judge_item("keyword", {"parsed": ["weak"]}, {"parsed": ["strong"]})
+    verdicts = JudgeEngine(ScriptedBackend(respond), mode="pointwise").judge([item])
+    assert verdicts[0]["winner"] == "B"
+    assert (verdicts[0]["score_a"], verdicts[0]["score_b"]) == (2, 5)
+
+
+def test_retry_resends_only_failed_prompts():
+    failed_once = set()
+
+    def respond(prompt):
+        if "keyword 1" in prompt and prompt not in failed_once:
+            failed_once.add(prompt)
+            return RuntimeError("temporary")
+        return json.dumps({"winner": "A"})
+
+    backend = ScriptedBackend(respond)
+    engine = JudgeEngine(backend, batch_size=4, max_workers=1, max_retries=2)
+    verdicts = engine.judge(_items(4))
+    assert backend.calls == [4, 1]
+    assert [v["winner"] for v in verdicts] == ["A"] * 4
+
+
+def test_retries_exhausted_only_fail_that_prompt():
+    def respond(prompt):
+        return RuntimeError("down") if "keyword 2" in prompt else json.dumps({"winner": "tie"})
+
+    backend = ScriptedBackend(respond)
+    engine = JudgeEngine(backend, batch_size=4, max_workers=1, max_retries=2)
+    verdicts = engine.judge(_items(4))
+    assert backend.calls == [4, 1, 1]
+    assert [v["winner"] for v in verdicts] == ["tie", "tie", None, "tie"]
+    assert verdicts[2]["reason"] == "down"
+
+
+def test_whole_batch_failure_is_retried():
+    class Flaky(ScriptedBackend):
+        def complete(self, prompts):
+            if not self.calls:
+                self.calls.append(len(prompts))
+                raise ConnectionError("reset")
+            return super().complete(prompts)
+
+    backend = Flaky(_winner("A"))
+    verdicts = JudgeEngine(backend, batch_size=3, max_retries=1).judge(_items(3))
+    assert backend.calls == [3, 3]
+    assert [v["winner"] for v in verdicts] == ["A"] * 3
+
+
+def test_cache_skips_backend_and_ignores_errors(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), table="judge_verdicts", ttl_seconds=None)
+    backend = ScriptedBackend(lambda prompt: RuntimeError("down") if "keyword 0" in prompt else '{"winner": "A"}')
+    JudgeEngine(backend, max_retries=0, cache=cache).judge(_items(2))
+
+    backend = ScriptedBackend(_winner("B"))
+    verdicts = JudgeEngine(backend, cache=cache).judge(_items(2))
+    # 오류는 캐시에 남지 않아 다시 판정, 성공한 판정은 캐시 재사용
+    assert backend.calls == [1]
+    assert [(v["winner"], v["cached"]) for v in verdicts] == [("B", False), ("A", True)]
+
+
+def test_duplicate_items_share_one_prompt():
+    backend = ScriptedBackend(_winner("A"))
+    engine = JudgeEngine(backend)
+    items = _items(1) * 3
+    assert len(engine.judge(items)) == 3
+    assert backend.calls == [1]
+    assert engine.deduped == 2
+
+
+def test_cancel_returns_finished_items_only():
+    cancel = threading.Event()
+
+    def respond(prompt):
+        cancel.set()
+        return '{"winner": "A"}'
+
+    verdicts = JudgeEngine(ScriptedBackend(respond), batch_size=1, max_workers=1).judge(_items(5), cancel_event=cancel)
+    assert 1 <= len(verdicts) < 5
+
+
+def test_fingerprint_depends_on_judge_settings():
+    pairwise = JudgeEngine(StubJudgeBackend()).fingerprint
+    assert pairwise == JudgeEngine(StubJudgeBackend()).fingerprint
+    assert pairwise != JudgeEngine(StubJudgeBackend(), mode="pointwise").fingerprint
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        JudgeEngine(StubJudgeBackend(), mode="listwise")
+
+
+def test_prejudge_resolves_identical_pairs():
+    items = [
+        build_judge_item("same", {"parsed": {"x": 1, "y": [1, 2]}}, {"parsed": {"y": [1, 2], "x": 1}}, 0),
+        build_judge_item("diff", {"parsed": [1, 2]}, {"parsed": [3, 4]}, 1),
+    ]
+    divergent, verdicts = prejudge(items)
+    assert [item["idx"] for item in divergent] == [1]
+    assert verdicts == [{
+        "keyword": "same", "winner": "tie", "reason": "A/B 결과 동일 (자동 무승부)", "score_a": None, "score_b": None,
+        "cached": False, "auto": True, "idx": 0,
+    }]
+
+
+def test_prejudge_similarity_threshold():
+    near = build_judge_item("near", {"parsed": list(range(10))}, {"parsed": list(range(9)) + [99]}, 0)
+    far = build_judge_item("far", {"parsed": list(range(10))}, {"parsed": list(range(50, 60))}, 1)
+    divergent, verdicts = prejudge([near, far])
+    assert len(divergent) == 2 and not verdicts
+
+    divergent, verdicts = prejudge([near, far], similarity_threshold=0.8)
+    assert [item["keyword"] for item in divergent] == ["far"]
+    assert verdicts[0]["keyword"] == "near" and verdicts[0]["winner"] == "tie"
+    assert "RBO" in verdicts[0]["reason"]
+
+
+def test_prejudge_empty():
+    assert prejudge([]) == ([], [])
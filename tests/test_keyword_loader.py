@@ -0,0 +1,118 @@
+import json
+from collections import Counter
+from itertools import islice
+
+import pytest
+
+from utils.keyword_loader import (
+    KeywordDeduper, KeywordRow, dedupe_keywords, iter_spooled_counts, iter_spooled_keywords, sample_keywords,
+    shuffle_spool, spool_keywords, spool_offsets
+)
+
+
+def pairs(keywords, stratum=None):
+    return ((keyword, stratum) for keyword in keywords)
+
+
+# =====================================================
+# Spool
+# =====================================================
+def test_spool_round_trip(tmp_path):
+    path = str(tmp_path / "kw.jsonl")
+    keywords = ["노트북", 'quote "x"', KeywordRow("폰", {"category": "전자"})]
+    summary = spool_keywords(iter(keywords), path, preview_size=2)
+    assert summary == {"path": path, "count": 3, "volume": 3, "preview": ["노트북", 'quote "x"']}
+
+    loaded = list(iter_spooled_keywords(path))
+    assert loaded == ["노트북", 'quote "x"', "폰"]
+    assert isinstance(loaded[2], KeywordRow) and loaded[2].fields == {"category": "전자"}
+    assert not isinstance(loaded[0], KeywordRow)
+
+
+def test_spool_keeps_counts(tmp_path):
+    path = str(tmp_path / "kw.jsonl")
+    summary = spool_keywords([("a", 5), ("b", 1)], path)
+    assert summary["count"] == 2 and summary["volume"] == 6
+    assert list(iter_spooled_counts(path)) == [("a", 5), ("b", 1)]
+    assert json.loads(open(path, encoding="utf-8").readline()) == {"keyword": "a", "count": 5}
+
+
+def test_spool_offsets_start_shards(tmp_path):
+    path = str(tmp_path / "kw.jsonl")
+    keywords = [f"키워드{i}" for i in range(10)]
+    spool_keywords(keywords, path)
+    offsets = spool_offsets(path, 4)
+    assert len(offsets) == 3 and offsets[0] == 0
+    for shard, offset in enumerate(offsets):
+        assert list(islice(iter_spooled_keywords(path, offset), 4)) == keywords[shard * 4:shard * 4 + 4]
+
+
+def test_shuffle_spool_is_seeded_permutation(tmp_path):
+    source, a, b = (str(tmp_path / name) for name in ("kw.jsonl", "a.jsonl", "b.jsonl"))
+    keywords = [f"k{i}" for i in range(200)]
+    spool_keywords([KeywordRow("row", {"c": "1"}), *keywords], source)
+    shuffle_spool(source, a, seed=7)
+    shuffle_spool(source, b, seed=7)
+
+    shuffled = list(iter_spooled_keywords(a))
+    assert shuffled == list(iter_spooled_keywords(b))
+    assert sorted(shuffled) == sorted(["row", *keywords])
+    assert shuffled != ["row", *keywords]
+    assert next(k for k in shuffled if k == "row").fields == {"c": "1"}
+
+
+# =====================================================
+# Dedupe
+# =====================================================
+def test_dedupe_keeps_first_occurrence():
+    stream = [("a", "x"), ("b", "y"), ("a", "z"), ("c", None), ("b", None)]
+    assert list(dedupe_keywords(stream)) == [("a", "x"), ("b", "y"), ("c", None)]
+
+
+def test_deduper_counts_unique_keywords():
+    deduper = KeywordDeduper()
+    assert [deduper.add(k) for k in ["a", "b", "a", "A"]] == [True, True, False, True]
+    assert len(deduper) == 3
+
+
+# =====================================================
+# Sampling
+# =====================================================
+def test_sample_all_and_first():
+    keywords = [f"k{i}" for i in range(10)]
+    assert list(sample_keywords(pairs(keywords))) == keywords
+    assert list(sample_keywords(pairs(keywords), "first", 3)) == keywords[:3]
+    assert list(sample_keywords(pairs(keywords), "random", 0)) == keywords
+
+
+def test_reservoir_sample_is_seeded_subset():
+    keywords = [f"k{i}" for i in range(1000)]
+    sample = list(sample_keywords(pairs(keywords), "random", 50, seed=3))
+    assert len(sample) == len(set(sample)) == 50
+    assert set(sample) <= set(keywords)
+    assert sample == list(sample_keywords(pairs(keywords), "random", 50, seed=3))
+
+
+def test_reservoir_returns_everything_when_stream_is_small():
+    assert sorted(sample_keywords(pairs(["a", "b"]), "random", 5, seed=0)) == ["a", "b"]
+
+
+def test_reservoir_is_uniform():
+    keywords = [f"k{i}" for i in range(10)]
+    hits = Counter()
+    for seed in range(2000):
+        hits.update(sample_keywords(pairs(keywords), "random", 3, seed=seed))
+    # 키워드마다 기대 600회 (2000 × 3/10)
+    assert all(480 < hits[keyword] < 720 for keyword in keywords)
+
+
+def test_stratified_sample_keeps_proportions():
+    stream = [(f"a{i}", "big") for i in range(900)] + [(f"b{i}", "small") for i in range(100)]
+    sample = list(sample_keywords(iter(stream), "stratified", 50, seed=1))
+    assert len(sample) == 50
+    assert sum(keyword.startswith("a") for keyword in sample) == 45
+
+
+def test_unknown_sample_mode():
+    with pytest.raises(ValueError):
+        sample_keywords(pairs(["a"]), "weighted", 1)
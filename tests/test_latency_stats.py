@@ -0,0 +1,84 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from utils import result_store
+from utils.keyword_loader import spool_keywords
+from utils.latency_stats import DEFAULT_PRECISION, LatencyHistogram, build_latency_report
+from utils.result_store import ResultStore
+
+
+def test_percentiles_within_precision():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(4, 1) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    histogram.record_many(values)
+    for q in (50, 90, 99):
+        exact = np.percentile(values, q, method="inverted_cdf")
+        assert histogram.percentile(q) == pytest.approx(exact, rel=2 * DEFAULT_PRECISION)
+    assert histogram.count == len(values)
+    assert histogram.mean == pytest.approx(np.mean(values))
+    assert (histogram.min, histogram.max) == (min(values), max(values))
+
+
+def test_percentile_clamped_to_observed_range():
+    histogram = LatencyHistogram()
+    histogram.record(123.4)
+    assert histogram.percentile(0) == histogram.percentile(100) == 123.4
+
+
+def test_ignores_missing_and_negative():
+    histogram = LatencyHistogram()
+    histogram.record_many([None, -1.0, 0.0, 5.0])
+    assert histogram.count == 2
+    assert histogram.min == 0.0
+
+
+def test_empty_summary():
+    assert LatencyHistogram().summary() == {
+        "count": 0, "mean": None, "min": None, "max": None, "p50": None, "p90": None, "p99": None,
+    }
+
+
+def test_merge_equals_single_histogram():
+    values = [float(v) for v in range(1, 1001)]
+    whole, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    whole.record_many(values)
+    left.record_many(values[:300])
+    right.record_many(values[300:])
+    left.merge(right)
+    assert left.summary() == whole.summary()
+    with pytest.raises(ValueError):
+        left.merge(LatencyHistogram(precision=0.05))
+
+
+def test_dict_roundtrip_through_json():
+    histogram = LatencyHistogram()
+    histogram.record_many([1.0, 2.5, 40.0, 900.0])
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+    assert restored.summary() == histogram.summary()
+
+
+def test_build_latency_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, "RUN_KEYWORD_DIR", str(tmp_path / "runs"))
+    keyword_path = str(tmp_path / "kw.jsonl")
+    spool_keywords(["a", "b", "c", "d"], keyword_path)
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    store.create_run("run", keyword_path, 4, {})
+    with store.writer("run") as writer:
+        writer.add("A", 0, {"keyword": "a", "success": True, "latency_ms": 10.0, "ttfb_ms": 4.0})
+        writer.add("A", 1, {"keyword": "b", "success": True, "latency_ms": 30.0, "ttfb_ms": 6.0})
+        writer.add("A", 2, {"keyword": "c", "success": False, "latency_ms": 500.0, "error": "timeout"})
+        writer.add("A", 3, {"keyword": "d", "success": True, "latency_ms": 0.1, "cached": True})
+
+    report = build_latency_report(store, "run", ["A", "B"])
+    a = report["A"]
+    assert (a["done"], a["success"], a["cached"]) == (4, 3, 1)
+    assert a["error_rate"] == 0.25
+    # 캐시 응답과 실패 호출은 지연시간 분포에서 제외
+    assert a["latency"]["count"] == 2
+    assert (a["latency"]["min"], a["latency"]["max"]) == (10.0, 30.0)
+    assert a["ttfb"]["count"] == 2
+    assert report["B"]["done"] == 0 and report["B"]["error_rate"] is None
@@ -0,0 +1,91 @@
+import threading
+import time
+
+from utils.rate_limiter import AimdController, EndpointLimiter, TokenBucket
+
+
+def test_token_bucket_unlimited_never_waits():
+    bucket = TokenBucket(0)
+    assert not any(bucket.acquire() for _ in range(100))
+
+
+def test_token_bucket_paces_to_rate():
+    bucket = TokenBucket(50)
+    start = time.monotonic()
+    waited = [bucket.acquire() for _ in range(6)]
+    elapsed = time.monotonic() - start
+    # 첫 토큰은 바로, 나머지 5개는 1/50 초 간격
+    assert waited[0] is False and all(waited[1:])
+    assert elapsed >= 5 / 50 * 0.9
+
+
+def test_token_bucket_burst_is_free():
+    bucket = TokenBucket(1, burst=3)
+    assert [bucket.acquire() for _ in range(3)] == [False, False, False]
+
+
+def test_aimd_halves_on_429_and_grows_back():
+    controller = AimdController(8)
+    controller.acquire()
+    controller.release(10.0, 429)
+    # 최근 감소 이후 한도만큼 응답이 쌓이기 전이라 아직 줄지 않음
+    assert controller.limit == 8
+    for _ in range(8):
+        controller.acquire()
+        controller.release(10.0, 429)
+    assert controller.limit == 4
+    before = controller.limit
+    controller.acquire()
+    controller.release(10.0, 200)
+    assert controller.limit == before + 1 / before
+
+
+def test_aimd_respects_min_and_max():
+    controller = AimdController(2, min_limit=1)
+    for _ in range(50):
+        controller.acquire()
+        controller.release(10.0, 429)
+    assert controller.limit == 1
+    for _ in range(50):
+        controller.acquire()
+        controller.release(10.0, 200)
+    assert controller.limit == 2
+
+
+def test_aimd_decreases_when_p95_exceeds_target():
+    controller = AimdController(4, target_p95_ms=100)
+    for _ in range(40):
+        controller.acquire()
+        controller.release(500.0, 200)
+    assert controller.limit < 4
+    assert controller.p95() == 500.0
+
+
+def test_aimd_blocks_above_limit():
+    controller = AimdController(1)
+    controller.acquire()
+    acquired = threading.Event()
+
+    def worker():
+        controller.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert not acquired.wait(0.1)
+    controller.release(1.0, 200)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_endpoint_limiter_snapshot():
+    limiter = EndpointLimiter(4)
+    for status in (200, 200, 500):
+        with limiter.slot() as info:
+            info["status"] = status
+    snapshot = limiter.snapshot()
+    assert limiter.completed == 3
+    assert snapshot["in_flight"] == 0
+    assert snapshot["throttled"] == 0
+    assert snapshot["limit"] == 4
+    assert snapshot["qps"] > 0
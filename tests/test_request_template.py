@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from utils.keyword_loader import KeywordRow
+from utils.request_template import (
+    RequestTemplate, TemplateError, compile_request_template, keyword_values, template_variables
+)
+
+
+def test_template_variables_only_in_string_values():
+    value = {"{{key}}": "{{kw}}", "nested": [{"a": "x {{ category }} y"}, 1, None]}
+    assert template_variables(value) == {"kw", "category"}
+    assert template_variables({}) == set()
+
+
+def test_keyword_values_include_csv_fields():
+    assert keyword_values("검색어") == {"kw": "검색어"}
+    row = KeywordRow("검색어", {"category": "books"})
+    assert keyword_values(row) == {"category": "books", "kw": "검색어"}
+
+
+def test_get_without_placeholders_puts_keyword_in_keyword_param():
+    template = RequestTemplate("http://host/search", "GET", "q", {"size": 10})
+    assert template.render_url(keyword_values("a b&c")) == "http://host/search?size=10&q=a+b%26c"
+    assert template.render_body(keyword_values("a")) is None
+
+
+def test_get_appends_to_existing_query_string():
+    template = RequestTemplate("http://host/search?lang=ko", "GET", "q")
+    assert template.render_url({"kw": "x"}) == "http://host/search?lang=ko&q=x"
+
+
+def test_get_with_placeholders_keeps_template():
+    template = RequestTemplate("http://host/s", "GET", "q", {"query": "{{kw}} in {{category}}"})
+    assert template.variables == {"kw", "category"}
+    url = template.render_url(keyword_values(KeywordRow("노트북", {"category": "전자"})))
+    assert url == "http://host/s?query=%EB%85%B8%ED%8A%B8%EB%B6%81+in+%EC%A0%84%EC%9E%90"
+    # 키워드 파라미터를 따로 넣지 않음
+    assert "q=" not in url
+
+
+def test_missing_variable_renders_empty():
+    template = RequestTemplate("http://host/s", "GET", "q", {"query": "{{kw}}", "cat": "{{category}}"})
+    assert template.render_url({"kw": "x"}) == "http://host/s?query=x&cat="
+
+
+def test_post_without_placeholders_adds_top_level_field():
+    template = RequestTemplate("http://host/s", "POST", "query", None, {"size": 5, "filters": {"on": True}})
+    assert template.render_url({"kw": "x"}) == "http://host/s"
+    assert json.loads(template.render_body({"kw": "x"})) == {"size": 5, "filters": {"on": True}, "query": "x"}
+
+
+@pytest.mark.parametrize("keyword", ['say "hi"', "back\\slash", "line\nbreak\ttab", "\x01ctrl", "한글 검색어"])
+def test_post_body_escapes_values(keyword):
+    body = {"query": {"match": {"title": "{{kw}}"}}, "size": 10, "tags": ["{{kw}}!"]}
+    template = RequestTemplate("http://host/s", "POST", "q", None, body)
+    rendered = json.loads(template.render_body({"kw": keyword}))
+    assert rendered == {"query": {"match": {"title": keyword}}, "size": 10, "tags": [keyword + "!"]}
+
+
+def test_non_string_values_are_not_templated():
+    template = RequestTemplate("http://host/s", "POST", "q", None, {"q": "{{kw}}", "size": 10, "exact": None})
+    assert json.loads(template.render_body({"kw": "x"})) == {"q": "x", "size": 10, "exact": None}
+
+
+def test_reserved_marker_is_rejected():
+    with pytest.raises(TemplateError):
+        RequestTemplate("http://host/s", "POST", "q", None, {"q": "\x1eTPL\x1e{{kw}}"})
+
+
+def test_compiled_templates_are_cached():
+    a = compile_request_template("http://host/s", "GET", "q", {"size": 10})
+    assert a is compile_request_template("http://host/s", "GET", "q", {"size": 10})
+    assert a is not compile_request_template("http://host/s", "GET", "q", {"size": 20})
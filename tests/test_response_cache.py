@@ -0,0 +1,83 @@
+import types
+
+import pytest
+
+from utils import response_cache
+from utils.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+def test_make_key_is_order_independent_for_dicts():
+    assert ResponseCache.make_key("u", {"a": 1, "b": 2}) == ResponseCache.make_key("u", {"b": 2, "a": 1})
+    assert ResponseCache.make_key("u", "k1") != ResponseCache.make_key("u", "k2")
+
+
+def test_get_set_and_stats(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    assert cache.get("k") is None
+    cache.set("k", {"status": 200, "parsed": ["한글"]})
+    assert cache.get("k") == {"status": 200, "parsed": ["한글"]}
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    cache.clear()
+    assert cache.stats() == {"entries": 0, "hits": 0, "misses": 0}
+
+
+def test_expired_entry_is_dropped(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+    cache.set("k", {"v": 1})
+    clock.now += 30
+    assert cache.get("k") == {"v": 1}
+    # TTL 은 생성 시각 기준 (조회해도 연장되지 않음)
+    clock.now += 31
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_no_ttl_never_expires(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=None)
+    cache.set("k", {"v": 1})
+    clock.now += 10 ** 9
+    assert cache.get("k") == {"v": 1}
+
+
+def test_evicts_least_recently_used(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(response_cache, "EVICT_EVERY", 1)
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", {"v": "a"})
+    clock.now += 1
+    cache.set("b", {"v": "b"})
+    clock.now += 1
+    assert cache.get("a") == {"v": "a"}
+    clock.now += 1
+    cache.set("c", {"v": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "a"}
+    assert cache.get("c") == {"v": "c"}
+
+
+def test_tables_are_separate(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    responses = ResponseCache(path, table="responses")
+    verdicts = ResponseCache(path, table="verdicts")
+    responses.set("k", {"v": 1})
+    assert verdicts.get("k") is None
+
+
+def test_entries_survive_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    ResponseCache(path).set("k", {"v": 1})
+    assert ResponseCache(path).get("k") == {"v": 1}
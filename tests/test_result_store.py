@@ -0,0 +1,179 @@
+import os
+import sqlite3
+
+import pytest
+
+from utils import result_store
+from utils.keyword_loader import iter_spooled_keywords, spool_keywords
+from utils.result_store import RUN_CANCELLED, RUN_COMPLETED, RUN_RUNNING, ResultStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, "RUN_KEYWORD_DIR", str(tmp_path / "runs"))
+    return ResultStore(str(tmp_path / "results.sqlite3"))
+
+
+@pytest.fixture
+def keyword_path(tmp_path):
+    path = str(tmp_path / "kw.jsonl")
+    spool_keywords([f"k{i}" for i in range(10)], path)
+    return path
+
+
+def _record(keyword, success=True, **extra):
+    return {"keyword": keyword, "success": success, "status": 200 if success else 500, "latency_ms": 10.0, **extra}
+
+
+def test_create_run_keeps_absolute_keyword_copy(store, keyword_path):
+    store.create_run("run", keyword_path, 10, {"systems": ["A", "B"]})
+    run = store.get_run("run")
+    assert run["status"] == RUN_RUNNING and run["total"] == 10
+    assert run["config"] == {"systems": ["A", "B"]}
+    assert os.path.isabs(run["keyword_path"]) and run["keyword_path"] != keyword_path
+    assert list(iter_spooled_keywords(run["keyword_path"])) == list(iter_spooled_keywords(keyword_path))
+    store.set_run_status("run", RUN_CANCELLED)
+    assert store.get_run("run")["status"] == RUN_CANCELLED
+    assert store.get_run("missing") is None
+
+
+def test_shuffled_run_keeps_keywords(store, keyword_path):
+    store.create_run("run", keyword_path, 10, {}, shuffle_seed=7)
+    shuffled = list(iter_spooled_keywords(store.get_run("run")["keyword_path"]))
+    assert sorted(shuffled) == sorted(iter_spooled_keywords(keyword_path))
+
+
+def test_writer_flushes_on_exit(store, keyword_path):
+    store.create_run("run", keyword_path, 10, {})
+    with store.writer("run") as writer:
+        for idx in range(3):
+            writer.add("A", idx, _record(f"k{idx}", parsed=[idx]))
+        assert store.done_indices("run", "A") == set()
+    assert store.done_indices("run", "A") == {0, 1, 2}
+    assert store.summary("run") == {"A": {"done": 3, "success": 3, "cached": 0}}
+
+
+def test_done_indices_for_resume(store, keyword_path):
+    store.create_run("run", keyword_path, 10, {})
+    with store.writer("run") as writer:
+        for idx in (0, 1, 4, 7):
+            writer.add("A", idx, _record(f"k{idx}"))
+        writer.add("B", 0, _record("k0"))
+    assert store.done_indices("run", "A") == {0, 1, 4, 7}
+    assert store.done_indices("run", "A", start=2, stop=7) == {4}
+    assert store.done_indices("run", "B") == {0}
+    # 재개 시 같은 키 재기록은 덮어씀 (중복 없음)
+    with store.writer("run") as writer:
+        writer.add("A", 4, _record("k4", success=False, error="timeout"))
+    assert store.summary("run")["A"] == {"done": 4, "success": 3, "cached": 0}
+
+
+def test_records_roundtrip(store, keyword_path):
+    store.create_run("run", keyword_path, 10, {})
+    with store.writer("run") as writer:
+        writer.add("A", 0, _record("k0", parsed=["x"], data={"raw": 1}, connect_ms=1.5, bytes=42, retries=1))
+        writer.add("A", 1, _record("k1", success=False, error="boom"))
+    records = list(store.iter_records("run", "A", with_data=True))
+    assert [r["idx"] for r in records] == [0, 1]
+    assert records[0]["parsed"] == ["x"] and records[0]["data"] == {"raw": 1}
+    assert (records[0]["connect_ms"], records[0]["bytes"], records[0]["retries"]) == (1.5, 42, 1)
+    assert records[1]["error"] == "boom" and not records[1]["success"]
+    loaded = store.load_record("run", "A", 0)
+    assert loaded["data"] == {"raw": 1} and loaded["payload_stored"]
+    assert store.load_record("run", "A", 9) is None
+
+
+def test_iter_pairs_only_when_both_systems_done(store, keyword_path):
+    store.create_run("run", keyword_path, 10, {})
+    with store.writer("run") as writer:
+        for idx in range(3):
+            writer.add("A", idx, _record(f"k{idx}"))
+        writer.add("B", 1, _record("k1"))
+    pairs = list(store.iter_pairs("run"))
+    assert [p["idx"] for p in pairs] == [1]
+    assert pairs[0]["keyword"] == "k1"
+
+
+def _judged_run(store, keyword_path, n=4):
+    store.create_run("run", keyword_path, 10, {})
+    with store.writer("run") as writer:
+        for idx in range(n):
+            writer.add("A", idx, _record(f"k{idx}"))
+            writer.add("B", idx, _record(f"k{idx}", success=idx != n - 1))
+
+
+def _verdict(idx, winner):
+    return {"idx": idx, "keyword": f"k{idx}", "winner": winner, "reason": "test"}
+
+
+def test_find_run_by_fingerprint(store, keyword_path):
+    store.create_run("old", keyword_path, 10, {}, fingerprint="fp")
+    store.set_run_status("old", RUN_COMPLETED)
+    store.create_run("other", keyword_path, 10, {}, fingerprint="other")
+    assert store.find_run("fp")["run_id"] == "old"
+    assert store.find_run("fp", status=RUN_RUNNING) is None
+    assert store.find_run("fp", since=store.get_run("old")["created_at"] + 1) is None
+
+
+def test_verdicts_are_scoped_by_judge(store, keyword_path):
+    _judged_run(store, keyword_path)
+    store.write_verdicts("run", [_verdict(0, "A"), _verdict(1, "B")], judge="j1")
+    store.write_verdicts("run", [_verdict(0, "tie")], judge="j2")
+    assert store.verdict_counts("run", "j1") == {"A": 1, "B": 1}
+    assert store.verdict_counts("run", "j2") == {"tie": 1}
+    assert [p["idx"] for p in store.iter_pairs("run", unjudged_only=True, judge="j1")] == [2]
+    assert [p["idx"] for p in store.iter_pairs("run", unjudged_only=True, judge="j2")] == [1, 2]
+    assert store.judgeable_count("run") == 3
+
+
+def test_error_verdicts_are_judged_again(store, keyword_path):
+    _judged_run(store, keyword_path)
+    store.write_verdicts("run", [_verdict(0, "A"), _verdict(1, None), _verdict(2, "B")], judge="j")
+    assert store.verdict_counts("run", "j") == {"A": 1, "B": 1, "error": 1}
+    assert [p["idx"] for p in store.iter_pairs("run", unjudged_only=True, judge="j")] == [1]
+    assert store.pending_judge_count("run", judge="j") == 1
+    # UI 필터의 미판정은 판정 기록이 없는 쌍만, 오류는 호출 실패 + 판정 오류
+    assert store.count_pairs("run", "unjudged", judge="j") == 0
+    assert store.count_pairs("run", "error", judge="j") == 2
+
+    store.write_verdicts("run", [_verdict(1, "tie")], judge="j")
+    assert store.verdict_counts("run", "j") == {"A": 1, "B": 1, "tie": 1}
+    assert store.pending_judge_count("run", judge="j") == 0
+
+
+def test_matches_and_pairings_are_scoped_by_judge(store, keyword_path):
+    _judged_run(store, keyword_path)
+    store.write_matches("run", ("A", "B"), 1, [_verdict(0, "A"), _verdict(1, None)], judge="j")
+    store.set_pairings("run", 1, [("A", "B")], judge="j")
+    assert store.match_summary("run", "j") == [
+        {"system_a": "A", "system_b": "B", "a": 1, "b": 0, "tie": 0, "error": 1}
+    ]
+    assert store.match_summary("run", "other") == []
+    assert store.get_pairings("run", "j") == {1: [("A", "B")]}
+    assert store.pending_judge_count("run", matches=True, judge="j") == 2
+
+
+def test_unscoped_verdicts_are_migrated(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, "RUN_KEYWORD_DIR", str(tmp_path / "runs"))
+    path = str(tmp_path / "results.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE verdicts (
+            run_id TEXT NOT NULL, idx INTEGER NOT NULL, keyword TEXT NOT NULL, winner TEXT,
+            score_a REAL, score_b REAL, reason TEXT, cached INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (run_id, idx)
+        );
+        INSERT INTO verdicts (run_id, idx, keyword, winner, reason) VALUES ('run', 0, 'k0', 'A', 'old');
+        INSERT INTO verdicts (run_id, idx, keyword, winner, reason) VALUES ('run', 1, 'k1', NULL, 'old');
+    """)
+    conn.commit()
+    conn.close()
+
+    store = ResultStore(path)
+    assert store.verdict_counts("run") == {"A": 1, "error": 1}
+    assert [v["reason"] for v in store.iter_verdicts("run")] == ["old", "old"]
+    store.write_verdicts("run", [_verdict(0, "B")], judge="new")
+    assert store.verdict_counts("run", "new") == {"B": 1}
+    assert store.verdict_counts("run") == {"A": 1, "error": 1}
+    # 다시 열어도 그대로
+    assert ResultStore(path).verdict_counts("run") == {"A": 1, "error": 1}
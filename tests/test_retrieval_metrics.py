@@ -0,0 +1,127 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils import retrieval_metrics
+from utils.retrieval_metrics import (
+    PAD, IdInterner, as_result_list, compute_metrics, item_key, judge_ndcg, ndcg, summarize
+)
+
+
+def metrics_for(a, b, k=None, p=0.9):
+    k = k or max(len(a), len(b), 1)
+    interner = IdInterner()
+    return {name: values[0] for name, values in compute_metrics(interner.pack([a], k), interner.pack([b], k), p).items()}
+
+
+# =====================================================
+# Packing
+# =====================================================
+def test_item_key_prefers_id_fields():
+    assert item_key({"title": "x", "doc_id": 7}) == "7"
+    assert item_key({"id": None, "url": "http://a"}) == "http://a"
+    assert item_key({"b": 1, "a": 2}) == item_key({"a": 2, "b": 1})
+    assert item_key("x") == "x"
+
+
+def test_as_result_list():
+    assert as_result_list(None) == []
+    assert as_result_list("x") == ["x"]
+    assert as_result_list([1, 2]) == [1, 2]
+
+
+def test_pack_dedupes_truncates_and_pads():
+    interner = IdInterner()
+    packed = interner.pack([["a", "b", "a", "c"], ["c"], []], 3)
+    a, b, c = interner.intern("a"), interner.intern("b"), interner.intern("c")
+    assert packed.tolist() == [[a, b, c], [c, PAD, PAD], [PAD, PAD, PAD]]
+    assert len(interner) == 3
+
+
+# =====================================================
+# Metrics
+# =====================================================
+def test_identical_lists():
+    m = metrics_for(["a", "b", "c"], ["a", "b", "c"])
+    assert m["identical"]
+    for name in ("overlap", "jaccard", "rbo", "kendall_tau", "ndcg_b_vs_a", "ndcg_a_vs_b"):
+        assert m[name] == pytest.approx(1.0), name
+
+
+def test_reversed_lists():
+    m = metrics_for(["a", "b", "c"], ["c", "b", "a"])
+    assert not m["identical"]
+    assert m["overlap"] == pytest.approx(1.0)
+    assert m["kendall_tau"] == pytest.approx(-1.0)
+    assert m["rbo"] < 1.0
+    assert m["ndcg_b_vs_a"] < 1.0
+
+
+def test_disjoint_lists():
+    m = metrics_for(["a", "b"], ["c", "d"])
+    assert m["overlap"] == 0.0 and m["jaccard"] == 0.0 and m["rbo"] == 0.0
+    assert math.isnan(m["kendall_tau"])
+    assert m["ndcg_b_vs_a"] == 0.0
+
+
+def test_rbo_known_value():
+    # 깊이 1 일치 0, 깊이 2 일치 1 → (1 - p) / p · p² + 외삽 p² = 0.09 + 0.81
+    assert metrics_for(["a", "b"], ["b", "a"])["rbo"] == pytest.approx(0.9)
+
+
+def test_rbo_is_top_weighted():
+    top = metrics_for(["a", "b", "c", "d"], ["a", "b", "d", "c"])["rbo"]
+    bottom = metrics_for(["a", "b", "c", "d"], ["b", "a", "c", "d"])["rbo"]
+    assert top > bottom
+
+
+def test_kendall_uses_common_items_only():
+    m = metrics_for(["a", "b", "x", "c"], ["a", "y", "b", "c"])
+    assert m["kendall_tau"] == pytest.approx(1.0)
+    assert m["overlap"] == pytest.approx(0.75)
+    assert m["jaccard"] == pytest.approx(3 / 5)
+
+
+def test_empty_lists():
+    m = metrics_for([], [], k=3)
+    assert m["rbo"] == 1.0 and m["jaccard"] == 1.0 and m["identical"]
+    assert math.isnan(m["ndcg_b_vs_a"])
+
+
+def test_ndcg_grades_by_reference_rank():
+    interner = IdInterner()
+    reference = interner.pack([["a", "b", "c"]], 3)
+    best = ndcg(interner.pack([["a", "b", "c"]], 3), reference)[0]
+    swapped = ndcg(interner.pack([["b", "a", "c"]], 3), reference)[0]
+    missing = ndcg(interner.pack([["a", "x", "y"]], 3), reference)[0]
+    assert best == pytest.approx(1.0)
+    assert 0.0 < missing < swapped < 1.0
+
+
+def test_chunked_computation_matches(monkeypatch):
+    rng = np.random.default_rng(0)
+    lists = [[f"d{i}" for i in rng.permutation(20)[:10]] for _ in range(40)]
+    interner = IdInterner()
+    a, b = interner.pack(lists[:20], 10), interner.pack(lists[20:], 10)
+    whole = compute_metrics(a, b)
+    monkeypatch.setattr(retrieval_metrics, "MAX_CELLS_PER_CHUNK", 300)
+    chunked = compute_metrics(a, b)
+    for name in whole:
+        np.testing.assert_allclose(chunked[name], whole[name], equal_nan=True)
+
+
+def test_judge_ndcg_uses_winner_as_reference():
+    metrics = {"ndcg_b_vs_a": np.array([0.2, 0.2, 0.2, 0.2]), "ndcg_a_vs_b": np.array([0.7, 0.7, 0.7, 0.7])}
+    result = judge_ndcg(metrics, ["A", "B", "tie", None])
+    assert result[:3].tolist() == [0.2, 0.7, 1.0]
+    assert math.isnan(result[3])
+
+
+def test_summarize_skips_nan():
+    summary = summarize({
+        "identical": np.array([True, False, False]),
+        "rbo": np.array([1.0, 0.5, np.nan]),
+        "kendall_tau": np.array([np.nan, np.nan, np.nan]),
+    })
+    assert summary == {"count": 3, "identical": 1, "rbo": 0.75, "kendall_tau": None}
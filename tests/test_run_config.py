@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+import cli
+from utils.keyword_loader import KeywordRow, spool_keywords
+from utils.run_config import (
+    API_FIELDS, JUDGE_FIELDS, RUN_CONFIG_VERSION, build_run_config, dump_run_config, iter_config_keywords,
+    load_run_config, validate_run_config
+)
+
+SYSTEMS = {"A": {"url": "http://a"}, "B": {"url": "http://b"}}
+
+
+def _config(**overrides):
+    return {"keywords": {"items": ["k"]}, "systems": SYSTEMS, **overrides}
+
+
+def test_defaults_filled():
+    config = validate_run_config(_config())
+    assert config["version"] == RUN_CONFIG_VERSION
+    assert config["systems"]["A"] == {**API_FIELDS, "url": "http://a"}
+    assert config["use_cache"] is True
+    assert config["judge"] is None and config["distributed"] is None
+
+
+@pytest.mark.parametrize("config", [
+    [],
+    _config(version=RUN_CONFIG_VERSION + 1),
+    _config(version="1"),
+    _config(version=1.0),
+    _config(keywords={}),
+    _config(keywords={"path": "kw.txt", "format": "xml"}),
+    _config(systems={"A": {"url": "http://a"}}),
+    _config(systems={**SYSTEMS, "C": {"url": ""}}),
+    _config(systems={**SYSTEMS, "C": {"url": "http://c", "method": "PUT"}}),
+    _config(systems={**SYSTEMS, "C": {"url": "http://c", "timeout": 3}}),
+    _config(distributed={"shard_size": 0}),
+    _config(distributed={"workers": 2}),
+    _config(shuffle_seed="7"),
+    _config(profile="perf"),
+])
+def test_invalid_configs(config):
+    with pytest.raises(ValueError):
+        validate_run_config(config)
+
+
+@pytest.mark.parametrize("judge", [
+    {"backend": "claude"},
+    {"backend": "stub", "modle": "x"},
+    {"backend": "stub", "mode": "listwise"},
+    {"backend": "stub", "batch_size": 0},
+    {"backend": "stub", "workers": "4"},
+    {"backend": "stub", "workers": True},
+    {"backend": "openai", "model": ""},
+    {"backend": "openai", "base_url": None},
+    {"backend": "stub", "early_stop": {"alpha": 1.5}},
+    {"backend": "stub", "early_stop": {"gamma": 0.1}},
+])
+def test_invalid_judge_configs(judge):
+    with pytest.raises(ValueError):
+        validate_run_config(_config(judge=judge))
+
+
+def test_judge_defaults_and_early_stop():
+    judge = validate_run_config(_config(judge={"backend": "stub", "early_stop": {"alpha": 0.01}}))["judge"]
+    assert judge["mode"] == JUDGE_FIELDS["mode"]
+    assert judge["early_stop"]["alpha"] == 0.01
+    assert judge["early_stop"]["delta"] > 0
+
+
+def test_export_roundtrip(tmp_path):
+    spool = str(tmp_path / "kw.jsonl")
+    spool_keywords([("popular", 3), KeywordRow("templated", {"brand": "x"}), "plain"], spool)
+    judge = {"backend": "stub", "rounds": 2}
+    exported = json.loads(dump_run_config(build_run_config(spool, SYSTEMS, {"A": 4}, judge=judge)))
+    config = validate_run_config(exported)
+    assert config["judge"]["rounds"] == 2
+    assert config["concurrency"] == {"A": 4}
+    keywords = list(iter_config_keywords(config))
+    assert keywords == [("popular", 3), "templated", "plain"]
+    assert keywords[1].fields == {"brand": "x"}
+
+
+def test_jsonl_keyword_file_reads_count_and_fields(tmp_path):
+    spool = tmp_path / "kw.jsonl"
+    spool_keywords([("popular", 3), KeywordRow("templated", {"brand": "x"}), "plain", "plain"], str(spool))
+    config = validate_run_config(_config(keywords={"path": str(spool), "format": "jsonl", "count": True}))
+    keywords = list(iter_config_keywords(config))
+    assert keywords == [("popular", 3), ("templated", 1), ("plain", 2)]
+    assert keywords[1][0].fields == {"brand": "x"}
+
+    config = validate_run_config(_config(keywords={"path": str(spool), "format": "jsonl"}))
+    assert list(iter_config_keywords(config)) == ["popular", "templated", "plain"]
+
+
+def test_load_resolves_relative_keyword_path(tmp_path):
+    (tmp_path / "kw.txt").write_text("a\nb\na\n", encoding="utf-8")
+    path = tmp_path / "run.json"
+    path.write_text(json.dumps(_config(keywords={"path": "kw.txt"})), encoding="utf-8")
+    config = load_run_config(path)
+    assert config["keywords"]["path"] == str(tmp_path / "kw.txt")
+    assert list(iter_config_keywords(config)) == ["a", "b"]
+
+
+@pytest.mark.parametrize("config", [
+    _config(systems={"A": {"url": "http://a"}}),
+    _config(systems={**SYSTEMS, "C": {"url": "http://c", "parse_path": "data[--1]"}}),
+    _config(judge={"backend": "openai", "model": ""}),
+])
+def test_cli_rejects_bad_config_before_running(tmp_path, config):
+    path = tmp_path / "run.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    assert cli.main([str(path), "--out", str(tmp_path / "out")]) == 1
+    assert not (tmp_path / "out").exists()
+
+
+def test_cli_rejects_broken_json(tmp_path):
+    path = tmp_path / "run.json"
+    path.write_text("{", encoding="utf-8")
+    assert cli.main([str(path), "--out", str(tmp_path / "out")]) == 1
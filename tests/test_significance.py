@@ -0,0 +1,104 @@
+import pytest
+
+from utils.significance import (
+    MIN_SEQUENTIAL_SAMPLES, SPRT_A, SPRT_B, SPRT_EQUAL,
+    bootstrap_interval, early_stop_decision, significance_summary, sprt, wilson_interval
+)
+
+
+# =====================================================
+# Wilson
+# =====================================================
+def test_wilson_known_value():
+    low, high = wilson_interval(50, 100)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+
+
+def test_wilson_stays_in_unit_interval_at_extremes():
+    low, high = wilson_interval(0, 10)
+    assert low == pytest.approx(0.0, abs=1e-12) and high == pytest.approx(0.2775, abs=1e-4)
+    low, high = wilson_interval(10, 10)
+    assert low == pytest.approx(0.7225, abs=1e-4) and high == 1.0
+
+
+def test_wilson_narrows_with_more_samples_and_lower_confidence():
+    width = lambda interval: interval[1] - interval[0]
+    assert width(wilson_interval(500, 1000)) < width(wilson_interval(50, 100))
+    assert width(wilson_interval(50, 100, alpha=0.2)) < width(wilson_interval(50, 100, alpha=0.05))
+
+
+def test_wilson_without_samples():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+# =====================================================
+# Bootstrap
+# =====================================================
+def test_bootstrap_contains_point_estimate_and_is_reproducible():
+    interval = bootstrap_interval(30, 50, 20)
+    score = (50 + 0.5 * 20) / 100
+    assert interval[0] < score < interval[1]
+    assert bootstrap_interval(30, 50, 20) == interval
+
+
+def test_bootstrap_degenerate_counts():
+    assert bootstrap_interval(0, 40, 0) == (1.0, 1.0)
+    assert bootstrap_interval(0, 0, 40) == (0.5, 0.5)
+    assert bootstrap_interval(0, 0, 0) == (0.0, 1.0)
+
+
+# =====================================================
+# SPRT
+# =====================================================
+def test_sprt_detects_clear_winner():
+    assert sprt(2, 40)["decision"] == SPRT_B
+    assert sprt(40, 2)["decision"] == SPRT_A
+
+
+def test_sprt_is_symmetric():
+    a, b = sprt(12, 30), sprt(30, 12)
+    assert a["llr_b"] == pytest.approx(b["llr_a"])
+    assert a["llr_a"] == pytest.approx(b["llr_b"])
+
+
+def test_sprt_accepts_equal_after_balanced_evidence():
+    assert sprt(100, 100)["decision"] == SPRT_EQUAL
+
+
+def test_sprt_continues_when_undecided():
+    result = sprt(10, 10)
+    assert result["decision"] is None
+    assert result["lower"] < result["llr_b"] < result["upper"]
+
+
+def test_early_stop_waits_for_minimum_samples():
+    options = {"delta": 0.3}
+    assert sprt(0, 10, delta=0.3)["decision"] == SPRT_B
+    assert early_stop_decision({"B": 10}, options) is None
+    # 무승부도 최소 판정 수에는 포함
+    assert early_stop_decision({"B": 10, "tie": MIN_SEQUENTIAL_SAMPLES - 10}, options) == SPRT_B
+
+
+def test_early_stop_ignores_errors():
+    assert early_stop_decision({"A": 5, "B": 5, "error": 100}, {}) is None
+
+
+# =====================================================
+# Summary
+# =====================================================
+def test_summary_separates_ties():
+    summary = significance_summary({"A": 20, "B": 60, "tie": 20, "error": 3})
+    assert summary["n"] == 100
+    assert summary["decisive"] == 80
+    assert summary["b_win_rate"] == pytest.approx(0.75)
+    assert summary["score"] == pytest.approx(0.7)
+    assert summary["wilson"] == wilson_interval(60, 80)
+    assert summary["sprt"]["decision"] == SPRT_B
+
+
+def test_summary_without_verdicts():
+    summary = significance_summary({})
+    assert summary["n"] == 0
+    assert summary["b_win_rate"] is None and summary["score"] is None
+    assert summary["sprt"]["decision"] is None
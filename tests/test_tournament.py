@@ -0,0 +1,96 @@
+import math
+import random
+
+import pytest
+
+from utils.tournament import (
+    all_pairs, bradley_terry, default_rounds, ordered_pair, standings, swiss_pairings, win_probability
+)
+
+SYSTEMS = ["A", "B", "C", "D"]
+
+
+# =====================================================
+# Swiss
+# =====================================================
+@pytest.mark.parametrize("n, rounds", [(1, 1), (2, 1), (3, 2), (4, 2), (5, 3), (8, 3), (9, 4)])
+def test_default_rounds(n, rounds):
+    assert default_rounds(n) == rounds
+
+
+def test_ordered_pair_follows_system_order():
+    assert ordered_pair(SYSTEMS, "C", "A") == ("A", "C")
+    assert ordered_pair(SYSTEMS, "A", "C") == ("A", "C")
+
+
+def test_first_round_pairs_every_system_once():
+    pairs = swiss_pairings(SYSTEMS, {}, set(), random.Random(1))
+    assert len(pairs) == 2
+    assert sorted(s for pair in pairs for s in pair) == SYSTEMS
+    assert all(pair == ordered_pair(SYSTEMS, *pair) for pair in pairs)
+
+
+def test_odd_count_leaves_one_bye():
+    pairs = swiss_pairings(["A", "B", "C"], {"A": 2.0, "B": 1.0, "C": 0.0}, set())
+    assert pairs == [("A", "B")]
+
+
+def test_pairs_by_score_and_avoids_rematches():
+    scores = {"A": 3.0, "B": 2.0, "C": 1.0, "D": 0.0}
+    assert swiss_pairings(SYSTEMS, scores, set()) == [("A", "B"), ("C", "D")]
+    assert swiss_pairings(SYSTEMS, scores, {("A", "B"), ("C", "D")}) == [("A", "C"), ("B", "D")]
+
+
+def test_rematch_when_everyone_played():
+    played = set(all_pairs(SYSTEMS))
+    scores = {"A": 3.0, "B": 2.0, "C": 1.0, "D": 0.0}
+    assert swiss_pairings(SYSTEMS, scores, played) == [("A", "B"), ("C", "D")]
+
+
+# =====================================================
+# Bradley–Terry
+# =====================================================
+def test_equal_results_give_equal_scores():
+    scores = bradley_terry([("A", "B", 10, 10), ("B", "C", 10, 10), ("A", "C", 10, 10)], ["A", "B", "C"])
+    assert scores["A"] == pytest.approx(scores["B"]) == pytest.approx(scores["C"])
+
+
+def test_scores_recover_win_rate():
+    scores = bradley_terry([("A", "B", 750, 250)], ["A", "B"])
+    # 사전 무승부 경기 때문에 약간 0.5 쪽으로 당겨짐
+    assert win_probability(scores, "A", "B") == pytest.approx(0.75, abs=0.01)
+    assert win_probability(scores, "A", "B") + win_probability(scores, "B", "A") == pytest.approx(1.0)
+
+
+def test_transitive_ordering_without_direct_match():
+    scores = bradley_terry([("A", "B", 8, 2), ("B", "C", 8, 2)], ["A", "B", "C"])
+    assert scores["A"] > scores["B"] > scores["C"]
+
+
+def test_undefeated_system_has_finite_score():
+    scores = bradley_terry([("A", "B", 20, 0)], ["A", "B", "C"])
+    assert all(math.isfinite(score) for score in scores.values())
+    assert scores["A"] > scores["C"] > scores["B"]
+
+
+# =====================================================
+# Standings
+# =====================================================
+def test_standings_counts_ties_for_both_sides():
+    rows = [
+        {"system_a": "A", "system_b": "B", "a": 6, "b": 2, "tie": 2, "error": 1},
+        {"system_a": "B", "system_b": "C", "a": 5, "b": 5, "tie": 0, "error": 0},
+    ]
+    table = standings(rows, ["A", "B", "C"])
+    by_system = {entry["system"]: entry for entry in table}
+    assert table[0]["system"] == "A"
+    assert [entry["score"] for entry in table] == sorted((entry["score"] for entry in table), reverse=True)
+    assert by_system["A"] == {**by_system["A"], "wins": 6, "losses": 2, "ties": 2, "matches": 10}
+    assert by_system["B"] == {**by_system["B"], "wins": 7, "losses": 11, "ties": 2, "matches": 20}
+    assert by_system["C"]["matches"] == 10
+
+
+def test_standings_without_matches():
+    table = standings([], ["A", "B"])
+    assert [entry["matches"] for entry in table] == [0, 0]
+    assert table[0]["score"] == pytest.approx(table[1]["score"])
@@ -0,0 +1,120 @@
+import pytest
+
+from utils.keyword_loader import iter_spooled_keywords, spool_keywords
+from utils.work_queue import (
+    MAX_ATTEMPTS, TASK_CANCELLED, TASK_DONE, TASK_FAILED, TASK_LEASED, TASK_PENDING, SqliteWorkQueue, make_shards
+)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SqliteWorkQueue(str(tmp_path / "queue.sqlite3"))
+
+
+def test_make_shards_cover_spool(tmp_path):
+    path = str(tmp_path / "kw.jsonl")
+    keywords = [f"k{i}" for i in range(25)]
+    spool_keywords(keywords, path)
+    shards = make_shards(path, len(keywords), 10)
+    assert [(start, stop) for start, stop, _ in shards] == [(0, 10), (10, 20), (20, 25)]
+    for start, stop, offset in shards:
+        assert next(iter_spooled_keywords(path, offset)) == keywords[start]
+
+
+def test_enqueue_is_idempotent(queue):
+    shards = [(0, 10, 0), (10, 20, 100)]
+    assert queue.enqueue("run", shards) == 2
+    assert queue.enqueue("run", shards) == 0
+    assert queue.stats("run")["total"] == 2
+
+
+def test_lease_is_exclusive(queue):
+    queue.enqueue("run", [(0, 10, 0)])
+    task = queue.lease("w1")
+    assert task == {"task_id": "run:0", "run_id": "run", "start": 0, "stop": 10, "offset": 0, "attempts": 1}
+    assert queue.lease("w2") is None
+    stats = queue.stats("run")
+    assert stats[TASK_LEASED] == 1 and stats["workers"] == 1
+
+
+def test_complete_only_by_owner(queue):
+    queue.enqueue("run", [(0, 10, 0)])
+    task = queue.lease("w1")
+    assert not queue.complete(task["task_id"], "w2")
+    assert queue.complete(task["task_id"], "w1")
+    assert not queue.complete(task["task_id"], "w1")
+    assert queue.stats("run")[TASK_DONE] == 1
+    assert queue.lease("w2") is None
+
+
+def test_expired_lease_is_redelivered(queue):
+    queue.enqueue("run", [(0, 10, 0)])
+    first = queue.lease("w1", lease_seconds=-1)
+    second = queue.lease("w2")
+    assert second["task_id"] == first["task_id"]
+    assert second["attempts"] == 2
+    # 임대를 잃은 워커는 연장 / 완료할 수 없음
+    assert not queue.renew(first["task_id"], "w1")
+    assert not queue.complete(first["task_id"], "w1")
+    assert queue.renew(second["task_id"], "w2")
+    assert queue.complete(second["task_id"], "w2")
+
+
+def test_expired_lease_fails_after_max_attempts(queue):
+    queue.enqueue("run", [(0, 10, 0)])
+    for attempt in range(MAX_ATTEMPTS):
+        assert queue.lease(f"w{attempt}", lease_seconds=-1)["attempts"] == attempt + 1
+    assert queue.lease("last") is None
+    stats = queue.stats("run")
+    assert stats[TASK_FAILED] == 1 and stats["error"] == "lease expired"
+
+
+def test_release_retries_then_fails(queue):
+    queue.enqueue("run", [(0, 10, 0)])
+    for attempt in range(MAX_ATTEMPTS):
+        task = queue.lease("w1")
+        assert task["attempts"] == attempt + 1
+        queue.release(task["task_id"], "w1", f"boom {attempt}")
+        stats = queue.stats("run")
+        assert stats["error"] == f"boom {attempt}" and stats["error_shard"] == 0
+    stats = queue.stats("run")
+    assert stats[TASK_FAILED] == 1 and stats[TASK_PENDING] == 0
+    assert queue.lease("w1") is None
+
+
+def test_released_shard_goes_behind_pending_shards(queue):
+    queue.enqueue("run", [(0, 10, 0), (10, 20, 0)])
+    task = queue.lease("w1")
+    assert task["task_id"] == "run:0"
+    queue.release(task["task_id"], "w1", "boom")
+    assert queue.lease("w1")["task_id"] == "run:10"
+    assert queue.lease("w2")["task_id"] == "run:0"
+
+
+def test_release_by_other_worker_is_ignored(queue):
+    queue.enqueue("run", [(0, 10, 0)])
+    task = queue.lease("w1")
+    queue.release(task["task_id"], "w2", "not mine")
+    stats = queue.stats("run")
+    assert stats[TASK_LEASED] == 1 and stats["error"] is None
+
+
+def test_cancel_stops_owner_and_requeue_resets(queue):
+    queue.enqueue("run", [(0, 10, 0), (10, 20, 0)])
+    task = queue.lease("w1")
+    queue.cancel("run")
+    assert not queue.renew(task["task_id"], "w1")
+    assert queue.lease("w2") is None
+    assert queue.stats("run")[TASK_CANCELLED] == 2
+
+    assert queue.requeue("run") == 2
+    task = queue.lease("w2")
+    assert task["attempts"] == 1
+
+
+def test_runs_are_isolated(queue):
+    queue.enqueue("a", [(0, 10, 0)])
+    queue.enqueue("b", [(0, 10, 0)])
+    queue.cancel("a")
+    assert queue.stats("b")[TASK_PENDING] == 1
+    assert queue.lease("w1")["run_id"] == "b"
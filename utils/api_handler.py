@@ -1,6 +1,253 @@
 import requests
 import json
+import threading
+import time
+import zlib
+from contextlib import nullcontext
 from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from utils.json_path import JsonPathError, compile_json_path
+from utils.request_template import compile_request_template, keyword_values
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx http2=True 사용 시 필요)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    json_loads = orjson.loads
+    FAST_JSON_AVAILABLE = True
+except ImportError:
+    json_loads = json.loads
+    FAST_JSON_AVAILABLE = False
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+TIMING_FIELDS = ("latency_ms", "connect_ms", "ttfb_ms", "bytes", "retries")
+JSON_HEADERS = {"Content-Type": "application/json"}
+STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_RESPONSE_KB = 1024
+DEFAULT_PAYLOAD_SAMPLE_RATE = 0.01
+
+
+class ResponseTooLarge(ValueError):
+    '''스트리밍 모드에서 응답 본문이 max_response_bytes 를 넘음'''
+
+
+# =====================================================
+# 요청 단계별 시간 측정
+# =====================================================
+# 호출 1건은 한 스레드에서 끝나므로(재시도 포함) 스레드 로컬에 단계별 시간을 누적합니다.
+_timing = threading.local()
+
+
+def _reset_timing() -> None:
+    _timing.connect_ms = 0.0
+    _timing.ttfb_ms = None
+    _timing.retries = 0
+
+
+class _TimedConnectMixin:
+    '''새 커넥션 수립 시간(DNS + TCP + TLS) 측정. keep-alive 재사용 시에는 0'''
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _timing.connect_ms = getattr(_timing, "connect_ms", 0.0) + (time.perf_counter() - start) * 1000
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    '''커넥션 수립 시간을 측정하는 HTTPAdapter'''
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def _httpx_trace(event_name: str, info: Dict[str, Any]) -> None:
+    '''httpx trace 확장: 커넥션 수립 / 응답 헤더 수신 시점 기록'''
+    now = time.perf_counter()
+    if event_name.endswith(".started"):
+        _timing.phase_start = now
+    elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+        _timing.connect_ms += (now - _timing.phase_start) * 1000
+    elif event_name.endswith("receive_response_headers.complete"):
+        _timing.ttfb_ms = (now - _timing.request_start) * 1000
+
+
+class ApiSession:
+    '''
+    시스템별 keep-alive 커넥션 풀 세션.
+
+    시스템 A/B 설정(URL, Method, 헤더, 쿼리 파라미터, Body)으로 한 번 생성해두고
+    모든 키워드 호출에서 재사용합니다. 요청 템플릿도 이때 한 번 컴파일합니다.
+    429/5xx 응답은 지수 백오프로 재시도합니다.
+    http2=True 이고 httpx[http2]가 설치되어 있으면 HTTP/2 클라이언트를 사용합니다.
+    cache / limiter 를 지정하면 call() 이 응답 캐시와 QPS·동시성 제한을 거칩니다.
+
+    stream_response=True 면 응답 본문을 STREAM_CHUNK_SIZE 단위로 max_response_bytes 까지만 읽고
+    (초과 시 실패 처리), 빠른 JSON 파서(orjson, 설치 시)로 디코딩한 뒤 parser 경로 값만 남깁니다.
+    전체 응답은 payload_sample_rate 비율의 키워드만 zlib 압축 원문(payload)으로 보관합니다.
+    '''
+
+    def __init__(
+            self,
+            url: str,
+            method: str,
+            keyword_param: str,
+            headers: Optional[Dict] = None,
+            body_params: Optional[Dict] = None,
+            pool_size: int = DEFAULT_POOL_SIZE,
+            max_retries: int = DEFAULT_MAX_RETRIES,
+            backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+            http2: bool = False,
+            timeout: float = DEFAULT_TIMEOUT,
+            cache=None,
+            limiter=None,
+            stream_response: bool = False,
+            max_response_bytes: int = DEFAULT_MAX_RESPONSE_KB * 1024,
+            parser=None,
+            payload_sample_rate: float = DEFAULT_PAYLOAD_SAMPLE_RATE,
+            query_params: Optional[Dict] = None
+    ):
+        self.url = url
+        self.method = method
+        self.keyword_param = keyword_param
+        self.headers = headers
+        self.body_params = body_params
+        self.query_params = query_params
+        self.template = compile_request_template(url, method, keyword_param, query_params, body_params)
+        self.request_headers = {**JSON_HEADERS, **(headers or {})} if method == "POST" else headers
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = limiter
+        self.http2 = bool(http2 and HTTP2_AVAILABLE)
+        self.stream_response = stream_response
+        self.max_response_bytes = int(max_response_bytes or 0)
+        self.parser = parser
+        self.payload_sample_rate = payload_sample_rate
+
+        if self.http2:
+            limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            self._client = httpx.Client(http2=True, limits=limits)
+        else:
+            retry = Retry(
+                total=max_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUS,
+                allowed_methods=None,  # POST 검색 API도 재시도 대상
+                raise_on_status=False,
+                respect_retry_after_header=True
+            )
+            adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+            self._client = requests.Session()
+            self._client.mount("http://", adapter)
+            self._client.mount("https://", adapter)
+
+    def send(self, method: str, url: str, **kwargs):
+        '''요청 전송 (httpx 경로는 429/5xx 재시도를 직접 처리)'''
+        kwargs.setdefault("timeout", self.timeout)
+        if not self.http2:
+            response = self._client.request(method, url, stream=self.stream_response, **kwargs)
+            _timing.ttfb_ms = response.elapsed.total_seconds() * 1000
+            retries = getattr(response.raw, "retries", None)
+            _timing.retries = len(retries.history) if retries else 0
+            return response
+
+        if isinstance(kwargs.get("data"), bytes):
+            kwargs["content"] = kwargs.pop("data")  # httpx 는 바이트 본문을 content 로 받음
+        for attempt in range(self.max_retries + 1):
+            _timing.request_start = time.perf_counter()
+            _timing.retries = attempt
+            request = self._client.build_request(method, url, extensions={"trace": _httpx_trace}, **kwargs)
+            response = self._client.send(request, stream=self.stream_response)
+            if response.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                return response
+            response.close()
+            time.sleep(self.backoff_factor * (2 ** attempt))
+        return response
+
+    def read_body(self, response) -> bytes:
+        '''스트리밍 응답 본문을 max_response_bytes 까지만 읽기 (초과하면 ResponseTooLarge, 커넥션은 닫힘)'''
+        limit = self.max_response_bytes
+        try:
+            length = response.headers.get("Content-Length")
+            if limit and length and length.isdigit() and int(length) > limit:
+                raise ResponseTooLarge(f"응답 크기 초과: {int(length):,} bytes > {limit:,} bytes")
+            chunks = response.iter_bytes(STREAM_CHUNK_SIZE) if self.http2 else response.iter_content(STREAM_CHUNK_SIZE)
+            body = bytearray()
+            for chunk in chunks:
+                body += chunk
+                if limit and len(body) > limit:
+                    raise ResponseTooLarge(f"응답 크기 초과: {limit:,} bytes 이상")
+            return bytes(body)
+        finally:
+            response.close()
+
+    def extract(self, keyword: str, body: bytes) -> Dict[str, Any]:
+        '''스트리밍 응답 본문 → {"parsed": 파싱 경로 값, "payload": 샘플 키워드면 zlib 압축 원문}'''
+        data = json_loads(body)
+        result = {"parsed": self.parser.extract(data) if self.parser else data}
+        if is_payload_sampled(keyword, self.payload_sample_rate):
+            result["payload"] = zlib.compress(body)
+        return result
+
+    def call(self, keyword: str) -> Dict[str, Any]:
+        '''설정된 Endpoint로 키워드 호출'''
+        return make_api_call(
+            self.url,
+            self.method,
+            keyword,
+            self.keyword_param,
+            self.headers,
+            self.body_params,
+            session=self,
+            cache=self.cache,
+            limiter=self.limiter,
+            query_params=self.query_params
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 def make_api_call(
@@ -9,44 +256,144 @@ def make_api_call(
         keyword: str,
         keyword_param: str,
         headers: Optional[Dict] = None,
-        body_params: Optional[Dict] = None
+        body_params: Optional[Dict] = None,
+        session: Optional[ApiSession] = None,
+        cache=None,
+        limiter=None,
+        query_params: Optional[Dict] = None
+) -> Dict[str, Any]:
+    '''
+    API 호출 실행.
+
+    - query_params / body_params: {{kw}} 나 CSV 컬럼 {{컬럼명}} 을 넣을 수 있는 요청 템플릿
+      (utils.request_template). 컬럼 값은 키워드의 fields 에서 가져옵니다.
+    - session: 지정 시 커넥션 풀 + 컴파일된 요청 템플릿 재사용
+    - cache: ResponseCache 지정 시 동일 요청은 캐시에서 반환 (성공 응답만 저장)
+    - limiter: EndpointLimiter 지정 시 실제 네트워크 호출만 QPS·동시성 제한을 받음
+
+    결과에는 단계별 시간이 함께 담깁니다. (제한 대기 시간 제외, ms)
+    latency_ms: 전체 / connect_ms: 새 커넥션 수립(DNS+TCP+TLS) / ttfb_ms: 첫 응답 헤더까지 /
+    bytes: 응답 본문 크기 / retries: 재시도 횟수. 캐시 응답은 latency_ms 만 (조회 시간) 담깁니다.
+    '''
+    key = None
+    if cache is not None:
+        parts = [url, method, keyword_param, headers, body_params, keyword]
+        fields = getattr(keyword, "fields", None)
+        if query_params or fields:
+            parts.extend([query_params, fields])
+        if session is not None and session.stream_response:
+            # 스트리밍 모드 캐시 값은 파싱 결과만 담으므로 경로별로 키를 분리
+            parts.append(session.parser.path if session.parser else None)
+        key = cache.make_key(*parts)
+        start = time.perf_counter()
+        cached = cache.get(key)
+        if cached is not None:
+            return {**cached, "cached": True, "latency_ms": (time.perf_counter() - start) * 1000}
+
+    with (limiter.slot() if limiter else nullcontext({})) as slot:
+        result = _send_request(url, method, keyword, keyword_param, headers, body_params, session, query_params)
+        slot["status"] = result["status"]
+
+    if key is not None and result["success"]:
+        cache.set(key, {k: v for k, v in result.items() if k not in TIMING_FIELDS and k != "payload"})
+    return result
+
+
+def is_payload_sampled(keyword: str, rate: float) -> bool:
+    '''전체 응답 보관 대상 키워드인지 (키워드 해시 기준이라 시스템 간에 같은 키워드가 뽑힘)'''
+    return rate > 0 and zlib.crc32(keyword.encode("utf-8")) < rate * 0x100000000
+
+
+def _send_request(
+        url: str,
+        method: str,
+        keyword: str,
+        keyword_param: str,
+        headers: Optional[Dict],
+        body_params: Optional[Dict],
+        session: Optional[ApiSession],
+        query_params: Optional[Dict] = None
 ) -> Dict[str, Any]:
-    '''API 호출 실행'''
+    '''실제 HTTP 요청 1건 (단계별 시간 포함)'''
+    _reset_timing()
+    start = time.perf_counter()
+    response = None
     try:
+        if session:
+            template, request_headers = session.template, session.request_headers
+        else:
+            template = compile_request_template(url, method, keyword_param, query_params, body_params)
+            request_headers = {**JSON_HEADERS, **(headers or {})} if method == "POST" else headers
+        values = keyword_values(keyword)
+        request_url = template.render_url(values)
         if method == "GET":
-            params = {keyword_param: keyword}
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-        else:  # POST
-            body = body_params.copy() if body_params else {}
-            body[keyword_param] = keyword
-            response = requests.post(url, json=body, headers=headers, timeout=10)
+            if session:
+                response = session.send("GET", request_url, headers=request_headers)
+            else:
+                response = requests.get(request_url, headers=request_headers, timeout=DEFAULT_TIMEOUT)
+        else:  # POST: 미리 직렬화된 Body 조각에 변수 값만 채운 바이트를 그대로 전송
+            body = template.render_body(values)
+            if session:
+                response = session.send("POST", request_url, data=body, headers=request_headers)
+            else:
+                response = requests.post(request_url, data=body, headers=request_headers, timeout=DEFAULT_TIMEOUT)
+        if session is None:
+            _timing.ttfb_ms = response.elapsed.total_seconds() * 1000
 
         response.raise_for_status()
+        if session is not None and session.stream_response:
+            content = session.read_body(response)
+            return {
+                "success": True,
+                **session.extract(keyword, content),
+                "status": response.status_code,
+                **_timing_fields(start, len(content))
+            }
         return {
             "success": True,
             "data": response.json(),
-            "status": response.status_code
+            "status": response.status_code,
+            **_timing_fields(start, _content_size(response))
         }
     except Exception as e:
+        # HTTP 에러 응답이면 상태 코드를 남겨 429 등을 구분할 수 있게 함
+        # (크기 초과는 예외에 response 가 없으므로 여기서 잡은 response 를 씀)
+        if getattr(e, "response", None) is not None:
+            response = e.response
+        streamed = session is not None and session.stream_response
+        if streamed and response is not None:
+            response.close()
         return {
             "success": False,
             "error": str(e),
-            "status": None
+            "status": getattr(response, "status_code", None),
+            **_timing_fields(start, None if streamed else _content_size(response))
         }
 
 
+def _content_size(response) -> Optional[int]:
+    content = getattr(response, "content", None)
+    return len(content) if content is not None else None
+
+
+def _timing_fields(start: float, size: Optional[int]) -> Dict[str, Any]:
+    return {
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "connect_ms": _timing.connect_ms,
+        "ttfb_ms": _timing.ttfb_ms,
+        "bytes": size,
+        "retries": _timing.retries,
+    }
+
+
 def parse_json_path(data: Any, path: str) -> Any:
-    '''JSON 경로로 데이터 파싱 (예: 'data.results.0.title')'''
+    '''
+    JSON 경로로 데이터 파싱 (예: 'data.results.0.title', 'data.results[:10].{title,id}')
+    경로는 compile_json_path 로 한 번만 컴파일되며, 잘못된 경로면 None 을 반환합니다.
+    '''
     try:
-        keys = path.split('.')
-        result = data
-        for key in keys:
-            if key.isdigit():
-                result = result[int(key)]
-            else:
-                result = result[key]
-        return result
-    except:
+        return compile_json_path(path).extract(data)
+    except JsonPathError:
         return None
 
 
@@ -55,4 +402,4 @@ def parse_json_string(json_str: str) -> Optional[Dict]:
     try:
         return json.loads(json_str)
     except:
-        return None
\ No newline at end of file
+        return None
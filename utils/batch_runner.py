@@ -0,0 +1,180 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from utils.api_handler import ApiSession, DEFAULT_POOL_SIZE, DEFAULT_MAX_RETRIES
+from utils.json_path import JsonPath, compile_json_path
+from utils.profiling import Tracer, current_tracer
+from utils.rate_limiter import EndpointLimiter
+from utils.response_cache import ResponseCache
+
+DEFAULT_CONCURRENCY = 8
+SUBMIT_WINDOW = 4
+
+
+def create_session(
+        config: Dict[str, Any],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[EndpointLimiter] = None
+) -> ApiSession:
+    '''시스템 설정으로 커넥션 풀 세션 생성 (풀 크기는 최소 동시 요청 수 이상)'''
+    return ApiSession(
+        config["url"],
+        config["method"],
+        config["keyword_param"],
+        headers=config.get("headers"),
+        body_params=config.get("body_params"),
+        query_params=config.get("query_params"),
+        pool_size=max(int(config.get("pool_size") or DEFAULT_POOL_SIZE), concurrency),
+        max_retries=int(config.get("max_retries", DEFAULT_MAX_RETRIES)),
+        http2=bool(config.get("http2")),
+        cache=cache,
+        limiter=limiter,
+        stream_response=bool(config.get("stream_response")),
+        max_response_bytes=int(config.get("max_response_kb") or 0) * 1024,
+        parser=compile_parser(config),
+        payload_sample_rate=float(config.get("payload_sample_rate") or 0)
+    )
+
+
+def create_limiter(config: Dict[str, Any], concurrency: int = DEFAULT_CONCURRENCY) -> EndpointLimiter:
+    '''시스템 설정으로 QPS 제한 + AIMD 동시성 제어기 생성'''
+    return EndpointLimiter(
+        concurrency,
+        max_qps=float(config.get("max_qps") or 0),
+        target_p95_ms=float(config.get("target_p95_ms") or 0) or None
+    )
+
+
+def compile_parser(config: Dict[str, Any]) -> Optional[JsonPath]:
+    '''시스템 설정의 응답 파싱 경로 컴파일 (미설정 시 None)'''
+    parse_path = (config.get("parse_path") or "").strip()
+    return compile_json_path(parse_path) if parse_path else None
+
+
+def _call_keyword(
+        session: ApiSession,
+        parser: Optional[JsonPath],
+        keyword: str,
+        system: str,
+        tracer: Tracer
+) -> Dict[str, Any]:
+    '''단일 키워드 호출 + 응답 파싱 (단계별 시간은 tracer 의 http / cache / parse span)'''
+    start = time.perf_counter()
+    result = session.call(keyword)
+    tracer.add_span(f"{'cache' if result.get('cached') else 'http'}.{system}", start, time.perf_counter() - start)
+    record = {"keyword": keyword, **result}
+    if result["success"] and parser and "parsed" not in result:  # 스트리밍 모드는 세션에서 추출됨
+        with tracer.span(f"parse.{system}"):
+            record["parsed"] = parser.extract(result["data"])
+    return record
+
+
+def run_batch(
+        keywords: Iterable[str],
+        configs: Dict[str, Dict[str, Any]],
+        on_record: Callable[[str, int, Dict[str, Any]], None],
+        concurrency: Optional[Dict[str, int]] = None,
+        on_progress: Optional[Callable[[str, int, int, Dict[str, Any]], None]] = None,
+        cache: Optional[ResponseCache] = None,
+        skip: Optional[Dict[str, Set[int]]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        total: Optional[int] = None,
+        start_idx: int = 0
+) -> Dict[str, int]:
+    '''
+    키워드 스트림을 시스템별 스레드 풀로 동시에 호출하고 결과를 on_record 로 흘려보냅니다.
+
+    - configs: {"A": {...}, "B": {...}} 형태의 시스템별 API 설정
+    - on_record(system, idx, record): 완료 건마다 호출한 스레드에서 호출됩니다. (idx = 키워드 순번)
+    - concurrency: 시스템별 최대 동시 요청 수 (미지정 시 DEFAULT_CONCURRENCY).
+      실제 동시성은 AIMD 제어기가 이 한도 안에서 조정합니다.
+    - on_progress(system, done, total, stats): 완료 건마다 호출됩니다.
+      stats 는 EndpointLimiter.snapshot() 값입니다.
+    - cache: 지정 시 캐시 적중 키워드는 네트워크 호출 없이 반환됩니다.
+    - skip: 시스템별로 이미 완료된 키워드 순번 (체크포인트 재개 시 건너뜀)
+    - cancel_event: set 되면 대기 중인 호출을 취소하고 진행 중인 호출만 마친 뒤 반환합니다.
+      이미 끝난 / 진행 중이던 호출의 결과도 on_record 로 기록됩니다.
+    - total: 키워드 수 (진행률 표시용, 미지정 시 len(keywords))
+    - start_idx: 첫 키워드의 순번 (작업 큐 샤드처럼 중간부터 읽은 키워드 스트림일 때)
+
+    키워드는 필요한 만큼만 읽어 제출하므로(동시 요청 수의 SUBMIT_WINDOW 배) 목록 전체가
+    메모리에 올라가지 않습니다. 응답 파싱 경로는 시스템별로 한 번만 컴파일되며,
+    잘못된 경로면 JsonPathError 가 발생합니다.
+
+    호출한 스레드에 Tracer 가 활성화돼 있으면(utils.profiling.traced) 키워드 읽기 / HTTP / 파싱 단계 span 과
+    시스템별 대기 호출 수(queue.http.<시스템>) 카운터를 기록합니다.
+
+    반환값은 시스템별 완료 건수입니다.
+    '''
+    concurrency = concurrency or {}
+    skip = skip or {}
+    if total is None:
+        total = len(keywords)
+    done = {system: len(skip.get(system, ())) for system in configs}
+
+    limits = {
+        system: max(1, int(concurrency.get(system, DEFAULT_CONCURRENCY)))
+        for system in configs
+    }
+    parsers = {system: compile_parser(config) for system, config in configs.items()}
+    limiters = {system: create_limiter(config, limits[system]) for system, config in configs.items()}
+    sessions = {
+        system: create_session(config, limits[system], cache, limiters[system])
+        for system, config in configs.items()
+    }
+    executors = {
+        system: ThreadPoolExecutor(max_workers=limits[system], thread_name_prefix=f"batch-{system}")
+        for system in configs
+    }
+    window = sum(limits.values()) * SUBMIT_WINDOW
+    pending = {}
+    queued = {system: 0 for system in configs}
+    tracer = current_tracer()
+
+    def cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    def record(future) -> None:
+        system, idx = pending.pop(future)
+        queued[system] -= 1
+        tracer.count(f"queue.http.{system}", queued[system])
+        on_record(system, idx, future.result())
+        done[system] += 1
+        if on_progress:
+            on_progress(system, done[system], total, limiters[system].snapshot())
+
+    def drain() -> None:
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            record(future)
+
+    try:
+        for idx, keyword in enumerate(tracer.iterate("keywords.read", keywords), start_idx):
+            if cancelled():
+                break
+            for system in configs:
+                if idx in skip.get(system, ()):
+                    continue
+                future = executors[system].submit(
+                    _call_keyword, sessions[system], parsers[system], keyword, system, tracer
+                )
+                pending[future] = (system, idx)
+                queued[system] += 1
+            while len(pending) >= window:
+                drain()
+
+        while pending and not cancelled():
+            drain()
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+        for session in sessions.values():
+            session.close()
+
+    # 취소 시 shutdown 이 진행 중인 호출을 끝까지 기다렸으므로, 취소되지 않은 호출 결과는 버리지 않고 기록
+    for future in [future for future in pending if not future.cancelled()]:
+        record(future)
+    return done
@@ -1,25 +1,53 @@
+import re
+from functools import lru_cache
 from pathlib import Path
+from typing import Tuple
 import streamlit as st
 
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_SPACE = re.compile(r"\s+")
+_AROUND_PUNCT = re.compile(r"\s*([{};,>])\s*")
+_AFTER_COLON = re.compile(r":\s+")
+
+
+def minify_css(css: str) -> str:
+    '''주석 제거 + 공백 축약 (선택자/값 안의 의미 있는 공백 1칸은 유지)'''
+    css = _COMMENT.sub("", css)
+    css = _SPACE.sub(" ", css)
+    css = _AROUND_PUNCT.sub(r"\1", css)
+    css = _AFTER_COLON.sub(":", css)  # 앞 공백은 선택자(' :hover')일 수 있어 유지
+    return css.replace(";}", "}").strip()
+
+
+def _stamp(relative_paths: Tuple[str, ...]) -> Tuple[Tuple[str, int], ...]:
+    '''파일별 (경로, 수정 시각) — 파일이 바뀌면 번들 캐시 키가 달라짐'''
+    stamps = []
+    for rel in relative_paths:
+        path = Path(rel)
+        if not path.exists():
+            raise FileNotFoundError(f"[load_css] CSS file not found: {path.resolve()}")
+        stamps.append((rel, path.stat().st_mtime_ns))
+    return tuple(stamps)
+
+
+@lru_cache(maxsize=8)
+def _build_bundle(stamps: Tuple[Tuple[str, int], ...]) -> str:
+    '''CSS 파일들을 읽어 하나의 축약된 <style> 블록으로 (프로세스당 파일 변경 시에만 다시 생성)'''
+    css = "\n".join(Path(rel).read_text(encoding="utf-8") for rel, _ in stamps)
+    return f"<style>{minify_css(css)}</style>"
+
 
 def load_css(*relative_paths: str) -> None:
     """
     여러 CSS 파일을 읽어서 한 번에 <style>로 주입합니다.
 
+    번들은 파일 수정 시각(mtime)을 키로 프로세스 안에서 캐시되므로,
+    rerun 마다 stat 만 하고 파일을 다시 읽거나 합치지 않습니다.
+
     사용 예)
       load_css(
         "css/00_tokens.css",
         "css/10_global.css",
       )
     """
-    css_chunks = []
-
-    for rel in relative_paths:
-        path = Path(rel)
-
-        if not path.exists():
-            raise FileNotFoundError(f"[load_css] CSS file not found: {path.resolve()}")
-
-        css_chunks.append(path.read_text(encoding="utf-8"))
-
-    st.markdown("<style>\n" + "\n\n".join(css_chunks) + "\n</style>", unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown(_build_bundle(_stamp(relative_paths)), unsafe_allow_html=True)
@@ -0,0 +1,640 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+import threading
+import time
+import traceback
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from utils.batch_runner import run_batch
+from utils.keyword_loader import iter_spooled_keywords
+from utils.latency_stats import LatencyHistogram
+from utils.load_test import find_saturation, profile_duration, run_load_test
+from utils.profiling import Tracer, current_tracer, traced
+from utils.response_cache import get_response_cache
+from utils.significance import SEQUENTIAL_CHUNK_SIZE, early_stop_decision
+from utils.result_store import RUN_CANCELLED, RUN_COMPLETED, RUN_RUNNING, RUN_KEYWORD_DIR, get_result_store
+from utils.work_queue import (
+    DEFAULT_QUEUE_URL, DEFAULT_SHARD_SIZE, TASK_FAILED, TASK_LEASED, TASK_PENDING,
+    make_shards, open_work_queue, start_local_workers, worker_log_path
+)
+
+if TYPE_CHECKING:
+    from utils.judge import JudgeEngine
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_CANCELLED = "cancelled"
+JOB_FAILED = "failed"
+
+# 종료된 작업 보관 한도 (진행률/부하 테스트 시계열 등 메모리 결과를 들고 있으므로 오래된 것부터 정리)
+MAX_FINISHED_JOBS = 50
+FINISHED_JOB_TTL = 6 * 60 * 60
+# 이 시간 안에 완료된 같은 키워드 × 설정 실행은 다시 호출하지 않고 결과를 공유
+SHARED_RUN_TTL = 6 * 60 * 60
+DISTRIBUTED_POLL_INTERVAL = 2.0
+
+
+class Job:
+    '''
+    백그라운드 스레드에서 실행되는 작업 1건.
+
+    Streamlit 세션 상태가 아니라 프로세스 공용 JobManager 가 소유하므로
+    화면 rerun 이나 탭 종료와 무관하게 계속 실행됩니다. 세션은 job id 만 보관하고
+    progress / results 를 폴링합니다. 취소 후 resume() 하면 target 을 다시 실행하며,
+    target 은 job.results 에 남은 부분 결과를 보고 이어서 진행해야 합니다.
+
+    key 가 있는 작업은 같은 key 로 다시 제출하면 새로 실행하지 않고 이 작업에 연결(attach)됩니다.
+    attached 는 연결된 횟수입니다. tracer 는 단계별 시간 추적 중인 작업(실행 / 판정)의 Tracer 입니다.
+    '''
+
+    def __init__(
+            self,
+            kind: str,
+            target: Callable[["Job"], None],
+            job_id: Optional[str] = None,
+            key: Optional[str] = None
+    ):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.key = key
+        self.attached = 0
+        self.status = JOB_PENDING
+        self.progress: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.tracer: Optional[Tracer] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self._target = target
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JOB_PENDING, JOB_RUNNING)
+
+    def start(self) -> None:
+        self.status = JOB_RUNNING
+        self.error = None
+        self.finished_at = None
+        self._thread = threading.Thread(target=self._run, name=f"job-{self.kind}-{self.id}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._target(self)
+            self.status = JOB_CANCELLED if self.cancel_event.is_set() else JOB_COMPLETED
+        except Exception as e:
+            self.status = JOB_FAILED
+            self.error = f"{e}\n{traceback.format_exc(limit=5)}"
+        finally:
+            self.finished_at = time.time()
+
+    def cancel(self) -> None:
+        '''취소 요청 (진행 중인 호출이 끝나는 대로 멈춤)'''
+        self.cancel_event.set()
+
+    def resume(self) -> None:
+        '''취소/실패한 작업을 부분 결과부터 이어서 실행'''
+        if self.is_active:
+            return
+        self.cancel_event.clear()
+        self.start()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        if self._thread:
+            self._thread.join(timeout)
+
+
+class JobManager:
+    '''
+    프로세스 공용 작업 레지스트리 (스레드 안전).
+
+    같은 key 의 작업이 진행 중이면 submit 은 그 작업을 돌려주므로, 여러 세션이 같은 작업을
+    중복 실행하지 않습니다. 종료된 작업은 max_finished 개 / finished_ttl 초까지만 보관합니다.
+    '''
+
+    def __init__(self, max_finished: int = MAX_FINISHED_JOBS, finished_ttl: float = FINISHED_JOB_TTL):
+        self.max_finished = max_finished
+        self.finished_ttl = finished_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+            self,
+            kind: str,
+            target: Callable[[Job], None],
+            job_id: Optional[str] = None,
+            key: Optional[str] = None,
+            attach: bool = True
+    ) -> Job:
+        '''작업 시작. attach=False 면 같은 key 의 작업이 진행 중이어도 새로 실행 (이후 key 조회는 새 작업)'''
+        with self._lock:
+            existing = self._jobs.get(self._keys.get(key)) if key and attach else None
+            if existing and existing.is_active:
+                existing.attached += 1
+                return existing
+            job = Job(kind, target, job_id, key)
+            self._add(job)
+        job.start()
+        return job
+
+    def register(self, job: Job) -> Job:
+        '''실행하지 않고 등록만 (이미 끝난 실행을 다른 세션에 연결할 때)'''
+        with self._lock:
+            existing = self._jobs.get(job.id)
+            if existing:
+                existing.attached += 1
+                return existing
+            self._add(job)
+        return job
+
+    def _add(self, job: Job) -> None:
+        self._evict()
+        self._jobs[job.id] = job
+        if job.key:
+            self._keys[job.key] = job.id
+
+    def _evict(self) -> None:
+        '''오래된 종료 작업 정리 (진행 중인 작업은 유지)'''
+        finished = sorted(
+            (job for job in self._jobs.values() if not job.is_active and job.finished_at),
+            key=lambda job: job.finished_at
+        )
+        cutoff = time.time() - self.finished_ttl
+        overflow = len(finished) - self.max_finished + 1
+        for i, job in enumerate(finished):
+            if i >= overflow and job.finished_at >= cutoff:
+                break
+            del self._jobs[job.id]
+            if job.key and self._keys.get(job.key) == job.id:
+                del self._keys[job.key]
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def find(self, key: Optional[str]) -> Optional[Job]:
+        '''key 로 마지막에 등록된 작업 조회'''
+        if not key:
+            return None
+        with self._lock:
+            return self._jobs.get(self._keys.get(key))
+
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+
+@lru_cache(maxsize=None)
+def get_job_manager() -> JobManager:
+    '''프로세스 공용 JobManager (모든 Streamlit 세션이 공유)'''
+    return JobManager()
+
+
+# =====================================================
+# Job Targets
+# =====================================================
+JUDGE_CHUNK_SIZE = 500
+STREAM_POLL_INTERVAL = 1.0
+
+
+_share_lock = threading.Lock()
+
+
+def run_fingerprint(
+        keyword_path: str,
+        configs: Dict[str, Dict[str, Any]],
+        use_cache: bool = False,
+        shuffle_seed: Optional[int] = None
+) -> str:
+    '''
+    실행 공유 키: 키워드 스풀 내용 + 시스템 설정 + 캐시 사용 여부 (+ 순서 무작위화 seed) 의 해시.
+    동시 요청 수는 결과가 아니라 속도만 바꾸므로 포함하지 않습니다.
+    '''
+    digest = hashlib.sha256()
+    key = [configs, use_cache] if shuffle_seed is None else [configs, use_cache, shuffle_seed]
+    digest.update(json.dumps(key, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    with open(keyword_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def batch_job_key(fingerprint: str) -> str:
+    return f"batch:{fingerprint}"
+
+
+def judge_job_key(run_id: str, judge: str = "") -> str:
+    '''판정 작업 키. judge 는 판정 설정 식별자 (JudgeEngine.fingerprint) 로, 설정이 다르면 별도 작업입니다.'''
+    return f"judge:{run_id}:{judge}"
+
+
+def submit_batch_job(
+        keyword_path: str,
+        total: int,
+        configs: Dict[str, Dict[str, Any]],
+        concurrency: Optional[Dict[str, int]] = None,
+        use_cache: bool = False,
+        share: bool = True,
+        distributed: Optional[Dict[str, Any]] = None,
+        shuffle_seed: Optional[int] = None,
+        profile: Optional[str] = None
+) -> Tuple[Job, bool]:
+    '''
+    키워드 × 시스템 일괄 호출 실행(run) 을 등록하고 시작. 반환: (작업, attached)
+    결과는 ResultStore 에 체크포인트로 기록되며 job.id 가 곧 run_id 입니다.
+
+    distributed({"queue", "shard_size", "local_workers"}) 를 주면 이 프로세스에서 호출하지 않고
+    키워드를 샤드로 나눠 작업 큐에 넣은 뒤 워커 프로세스들이 처리하는 것을 기다립니다 (utils.work_queue).
+
+    share 이면 같은 키워드 × 설정의 실행이 진행 중이거나 SHARED_RUN_TTL 안에 완료된 경우
+    새로 호출하지 않고 그 실행의 작업을 돌려줍니다 (여러 분석자가 같은 평가를 돌려도 백엔드 부하는 1회).
+    이렇게 기존 실행에 연결했으면 attached 가 True 입니다.
+
+    shuffle_seed 를 주면 키워드를 그 seed 로 섞은 순서로 호출합니다. 판정 조기 종료 시
+    앞쪽 일부만 보고 결론을 내리므로, 원본 순서(카테고리별 정렬 등)의 편향을 없애는 용도입니다.
+
+    단계별 시간은 항상 추적해 .cache/traces/<run_id>.batch.trace.json 에 저장하며 (utils.profiling),
+    profile("cprofile" | "sampling") 을 주면 이 실행과 판정 작업에 프로파일러도 켭니다.
+    '''
+    fingerprint = run_fingerprint(keyword_path, configs, use_cache, shuffle_seed)
+    manager = get_job_manager()
+    store = get_result_store()
+    with _share_lock:
+        if share:
+            job = manager.find(batch_job_key(fingerprint))
+            if job and job.is_active:
+                job.attached += 1
+                return job, True
+            run = store.find_run(fingerprint, RUN_COMPLETED, time.time() - SHARED_RUN_TTL)
+            if run:
+                return _attach_finished_run(run["run_id"], fingerprint), True
+
+        run_id = uuid.uuid4().hex[:12]
+        store.create_run(run_id, keyword_path, total, {
+            "configs": configs, "concurrency": concurrency or {}, "use_cache": use_cache,
+            "distributed": distributed, "shuffle_seed": shuffle_seed, "profile": profile,
+        }, fingerprint, shuffle_seed)
+        return _start_batch_job(run_id, batch_job_key(fingerprint), attach=share), False
+
+
+def _attach_finished_run(run_id: str, fingerprint: str) -> Job:
+    '''완료된 실행을 작업으로 등록 (이미 등록돼 있으면 그 작업). 다시 실행하지는 않음'''
+    job = Job("batch", _batch_target(run_id), job_id=run_id, key=batch_job_key(fingerprint))
+    job.status = JOB_COMPLETED
+    job.finished_at = time.time()
+    return get_job_manager().register(job)
+
+
+def resume_batch_job(run_id: str) -> Optional[Job]:
+    '''
+    저장된 실행을 이어서 진행. 같은 프로세스에 작업이 남아 있으면 그 작업을 재개하고,
+    서버 재시작 등으로 작업이 사라졌으면 저장된 설정으로 새 작업을 만들어 남은 키워드만 호출합니다.
+    '''
+    job = get_job_manager().get(run_id)
+    if job:
+        job.resume()
+        return job
+    run = get_result_store().get_run(run_id)
+    if not run:
+        return None
+    key = batch_job_key(run["fingerprint"]) if run["fingerprint"] else None
+    return _start_batch_job(run_id, key, attach=False)
+
+
+def trace_name(run_id: str, stage: str) -> str:
+    '''실행(run)의 단계별 trace 이름 (stage: "batch" | "judge" | "shard-<시작 순번>")'''
+    return f"{run_id}.{stage}"
+
+
+def _traced_target(run_id: str, stage: str, target: Callable[[Job], None]) -> Callable[[Job], None]:
+    '''
+    작업 target 을 단계별 시간 추적으로 감쌈. 진행 중에는 job.tracer 로 조회하고, 끝나면 trace 파일로 저장합니다.
+    실행 설정의 profile("cprofile" | "sampling") 이 있으면 프로파일러도 켭니다.
+    '''
+    def traced_target(job: Job) -> None:
+        profile = get_result_store().get_run(run_id)["config"].get("profile")
+        with traced(trace_name(run_id, stage), profile) as tracer:
+            job.tracer = tracer
+            target(job)
+
+    return traced_target
+
+
+def _start_batch_job(run_id: str, key: Optional[str] = None, attach: bool = True) -> Job:
+    return get_job_manager().submit("batch", _batch_target(run_id), job_id=run_id, key=key, attach=attach)
+
+
+def _batch_target(run_id: str) -> Callable[[Job], None]:
+    store = get_result_store()
+
+    def target(job: Job) -> None:
+        run = store.get_run(run_id)
+        if run["config"].get("distributed"):
+            _run_distributed(job, run)
+            return
+        configs = run["config"]["configs"]
+        cache = get_response_cache() if run["config"].get("use_cache") else None
+        skip = {system: store.done_indices(run_id, system) for system in configs}
+
+        histograms = {system: LatencyHistogram() for system in configs}
+
+        def on_record(system, idx, record):
+            writer.add(system, idx, record)
+            if record["success"] and not record.get("cached"):
+                histograms[system].record(record.get("latency_ms"))
+
+        def on_progress(system, done, total, snapshot):
+            latency = histograms[system]
+            job.progress[system] = {
+                "done": done, "total": total, **snapshot,
+                "p50_ms": latency.percentile(50), "p99_ms": latency.percentile(99),
+            }
+
+        store.set_run_status(run_id, RUN_RUNNING)
+        with store.writer(run_id) as writer:
+            run_batch(
+                iter_spooled_keywords(run["keyword_path"]), configs, on_record,
+                run["config"].get("concurrency"), on_progress, cache,
+                skip=skip, cancel_event=job.cancel_event, total=run["total"]
+            )
+        store.set_run_status(run_id, RUN_CANCELLED if job.cancel_event.is_set() else RUN_COMPLETED)
+
+    return _traced_target(run_id, "batch", target)
+
+
+def _run_distributed(job: Job, run: Dict[str, Any]) -> None:
+    '''
+    분산 실행 조정: 샤드 등록(재개 시 멱등) → 로컬 워커 시작 → 모든 샤드가 끝날 때까지 대기.
+    진행률은 결과 저장소의 시스템별 기록 수라서 모든 머신의 워커 결과가 합쳐져 보입니다.
+    '''
+    store = get_result_store()
+    run_id, options = run["run_id"], run["config"]["distributed"]
+    queue_url = options.get("queue") or DEFAULT_QUEUE_URL
+    queue = open_work_queue(queue_url)
+    queue.enqueue(run_id, make_shards(run["keyword_path"], run["total"], options.get("shard_size") or DEFAULT_SHARD_SIZE))
+    queue.requeue(run_id)
+    store.set_run_status(run_id, RUN_RUNNING)
+    log_path = worker_log_path(run_id)
+    workers = start_local_workers(queue_url, store.path, options.get("local_workers", 0), log_path=log_path)
+
+    while True:
+        stats = queue.stats(run_id)
+        summary = store.summary(run_id)
+        for system in run["config"]["configs"]:
+            job.progress[system] = {
+                "done": summary.get(system, {}).get("done", 0), "total": run["total"], "shards": stats,
+                "worker_log": log_path if workers else None,
+            }
+        if job.cancel_event.is_set() or not (stats[TASK_PENDING] or stats[TASK_LEASED]):
+            break
+        job.cancel_event.wait(DISTRIBUTED_POLL_INTERVAL)
+
+    if job.cancel_event.is_set():
+        # 원격 워커는 다음 임대 연장 때 멈추고, 로컬 워커는 바로 종료 (처리 중이던 결과는 이미 기록됨)
+        queue.cancel(run_id)
+        for process in workers:
+            process.terminate()
+        store.set_run_status(run_id, RUN_CANCELLED)
+        return
+    if stats[TASK_FAILED]:
+        store.set_run_status(run_id, RUN_CANCELLED)
+        detail = f" · 로컬 워커 로그: {log_path}" if workers else ""
+        raise RuntimeError(f"샤드 {stats[TASK_FAILED]}개 실패 (재개하면 다시 시도): {stats['error']}{detail}")
+    store.set_run_status(run_id, RUN_COMPLETED)
+
+
+def submit_judge_job(
+        engine: "JudgeEngine",
+        run_id: str,
+        skip_identical: bool = True,
+        similarity_threshold: Optional[float] = None,
+        early_stop: Optional[Dict[str, float]] = None
+) -> Job:
+    '''
+    실행(run) 결과에 대한 LLM 판정 작업 시작. 판정 결과는 ResultStore 에 기록됩니다.
+    아직 판정되지 않은 쌍만 JUDGE_CHUNK_SIZE 단위로 읽어 판정하므로 재개 시 이어서 진행됩니다.
+    skip_identical 이면 판정 전 단계(prejudge)에서 동일/유사 결과 쌍을 무승부로 확정하고
+    나머지만 LLM 으로 보냅니다. 같은 실행의 판정이 이미 진행 중이면 그 작업을 돌려줍니다.
+
+    early_stop({"alpha", "beta", "delta"}) 를 주면 SEQUENTIAL_CHUNK_SIZE 건마다 순차 검정(SPRT)을 하고
+    결론이 나면 판정을 멈춥니다. 일괄 호출이 진행 중이어도 끝난 키워드부터 판정하며,
+    조기 종료하면 남은 호출도 취소합니다 (키워드 순서가 무작위인 실행이어야 편향이 없음).
+    '''
+    store = get_result_store()
+    judge = engine.fingerprint
+
+    def target(job: Job) -> None:
+        batch_job = get_job_manager().get(run_id)
+        streaming = bool(early_stop and batch_job and batch_job.is_active)
+        total = store.get_run(run_id)["total"] if streaming else store.judgeable_count(run_id)
+        # 판정 오류는 이번 작업에서 다시 판정하므로 진행률에서 제외
+        counts = store.verdict_counts(run_id, judge)
+        done = sum(counts.values()) - counts.get("error", 0)
+        auto = store.judge_savings(run_id, judge=judge)["auto"]
+
+        def report(current, auto_total):
+            job.progress["judge"] = {
+                "done": current, "total": total, "auto": auto_total, "deduped": engine.deduped,
+                "backend_calls": engine.backend_calls, "cache_hits": engine.cache_hits
+            }
+
+        def should_stop() -> bool:
+            decision = early_stop_decision(store.verdict_counts(run_id, judge), early_stop)
+            if decision:
+                job.results["early_stop"] = decision
+                if batch_job and batch_job.is_active:
+                    batch_job.cancel()
+            return bool(decision)
+
+        _judge_pending(
+            job, engine, run_id, ("A", "B"), lambda verdicts: store.write_verdicts(run_id, verdicts, judge),
+            skip_identical, similarity_threshold, done, auto, report,
+            chunk_size=SEQUENTIAL_CHUNK_SIZE if early_stop else JUDGE_CHUNK_SIZE,
+            should_stop=should_stop if early_stop else None,
+            waiting=(lambda: batch_job.is_active) if streaming else None
+        )
+
+    return get_job_manager().submit(
+        "judge", _traced_target(run_id, "judge", target), key=judge_job_key(run_id, judge)
+    )
+
+
+def submit_tournament_job(
+        engine: "JudgeEngine",
+        run_id: str,
+        rounds: Optional[int] = None,
+        skip_identical: bool = True,
+        similarity_threshold: Optional[float] = None
+) -> Job:
+    '''
+    시스템이 3개 이상인 실행의 Swiss 토너먼트 판정 작업 시작.
+
+    라운드마다 현재 Bradley–Terry 점수로 대진(N/2 쌍)을 정해 쌍별로 전체 키워드를 판정하므로
+    LLM 판정 수는 라운드 수 × N/2 × 키워드 수입니다 (전체 쌍 비교는 N(N-1)/2 × 키워드 수).
+    대진은 pairings 에 먼저 기록하므로 재개 시 같은 대진의 남은 키워드부터 이어서 판정합니다.
+    '''
+    from utils.tournament import default_rounds, standings, swiss_pairings
+
+    store = get_result_store()
+    systems = list(store.get_run(run_id)["config"]["configs"])
+    rounds = rounds or default_rounds(len(systems))
+    judge = engine.fingerprint
+
+    def target(job: Job) -> None:
+        pairings = store.get_pairings(run_id, judge)
+        for round_no in range(rounds):
+            if job.cancel_event.is_set():
+                break
+            pairs = pairings.get(round_no)
+            if not pairs:
+                scores = {entry["system"]: entry["score"] for entry in standings(store.match_summary(run_id, judge), systems)}
+                played = {pair for previous in pairings.values() for pair in previous}
+                pairs = swiss_pairings(systems, scores, played, random.Random(f"{run_id}:{round_no}"))
+                store.set_pairings(run_id, round_no, pairs, judge)
+                pairings[round_no] = pairs
+
+            for pair in pairs:
+                if job.cancel_event.is_set():
+                    break
+                total = store.judgeable_count(run_id, pair)
+
+                def report(current, auto_total, pair=pair, total=total, round_no=round_no):
+                    job.progress["judge"] = {
+                        "done": current, "total": total, "auto": auto_total, "deduped": engine.deduped,
+                        "backend_calls": engine.backend_calls, "cache_hits": engine.cache_hits,
+                        "round": round_no + 1, "rounds": rounds, "pair": pair,
+                    }
+
+                judged = total - store.pending_judge_count(run_id, pair, matches=True, judge=judge)
+                _judge_pending(
+                    job, engine, run_id, pair,
+                    lambda verdicts, pair=pair, round_no=round_no: store.write_matches(run_id, pair, round_no, verdicts, judge),
+                    skip_identical, similarity_threshold, judged, 0, report, matches=True
+                )
+
+    return get_job_manager().submit(
+        "judge", _traced_target(run_id, "judge", target), key=judge_job_key(run_id, judge)
+    )
+
+
+def _judge_pending(
+        job: Job,
+        engine: "JudgeEngine",
+        run_id: str,
+        systems: Tuple[str, str],
+        write: Callable[[List[Dict[str, Any]]], None],
+        skip_identical: bool,
+        similarity_threshold: Optional[float],
+        done: int,
+        auto: int,
+        report: Callable[[int, int], None],
+        matches: bool = False,
+        chunk_size: int = JUDGE_CHUNK_SIZE,
+        should_stop: Optional[Callable[[], bool]] = None,
+        waiting: Optional[Callable[[], bool]] = None
+) -> None:
+    '''
+    두 시스템(systems)의 아직 판정되지 않은 결과 쌍을 chunk_size 씩 판정해 write 로 기록.
+    - should_stop(): chunk 마다 호출, True 면 중단 (순차 검정 조기 종료)
+    - waiting(): 판정할 쌍이 없을 때 True 면 새 호출 결과를 기다렸다가 처음부터 다시 조회
+    '''
+    # 판정 모듈(numpy 지표 포함)은 판정 작업에서만 필요하므로 여기서 import
+    from utils.judge import build_judge_item, prejudge
+
+    store = get_result_store()
+    tracer = current_tracer()
+    start_idx = 0
+    # 이번 작업에서 이미 다시 판정했는데도 오류인 순번 (처음부터 다시 조회할 때 무한 재시도 방지)
+    failed: Set[int] = set()
+    while not job.cancel_event.is_set():
+        with tracer.span("judge.read"):
+            pairs = list(store.iter_pairs(
+                run_id, systems, limit=chunk_size, unjudged_only=True, start_idx=start_idx, with_data=True,
+                matches=matches, judge=engine.fingerprint
+            ))
+        if not pairs:
+            if waiting is None:
+                break
+            # 동시 호출로 앞 순번이 늦게 끝났을 수 있으므로 처음부터 다시 조회
+            active = waiting()
+            if not active and start_idx == 0:
+                break
+            start_idx = 0
+            if active:
+                job.cancel_event.wait(STREAM_POLL_INTERVAL)
+            continue
+        start_idx = pairs[-1]["idx"] + 1
+        items = [build_judge_item(p["keyword"], p["a"], p["b"], p["idx"]) for p in pairs if p["idx"] not in failed]
+        if not items:
+            continue
+
+        if skip_identical:
+            with tracer.span("judge.prejudge"):
+                items, auto_verdicts = prejudge(items, similarity_threshold)
+            with tracer.span("judge.write"):
+                write(auto_verdicts)
+            auto += len(auto_verdicts)
+            done += len(auto_verdicts)
+            report(done, auto)
+
+        # 진행률은 판정 단위(task)가 아니라 키워드 기준으로 환산
+        def on_progress(tasks_done, tasks_total, base=done, size=len(items)):
+            report(base + (size * tasks_done // tasks_total if tasks_total else size), auto)
+
+        verdicts = engine.judge(items, on_progress, job.cancel_event) if items else []
+        with tracer.span("judge.write"):
+            write(verdicts)
+        failed.update(verdict["idx"] for verdict in verdicts if verdict["winner"] is None)
+        done += len(verdicts)
+        if should_stop and should_stop():
+            break
+    report(done, auto)
+
+
+def submit_load_test_job(
+        configs: Dict[str, Dict[str, Any]],
+        keyword_path: str,
+        profile: Dict[str, Any],
+        workers: int,
+        max_in_flight: int,
+        timeout: float
+) -> Job:
+    '''
+    부하 테스트 작업 시작. job.results["timeline"] 에 시스템 × 초 단위 시계열이,
+    종료 후 job.results["summary"] / ["saturation"] 에 시스템별 합계와 포화 지점이 채워짐.
+    취소 후 재개하면 프로파일을 처음부터 다시 실행합니다.
+    '''
+    duration = profile_duration(profile)
+
+    def target(job: Job) -> None:
+        # 세션에서 키워드를 다시 불러와 원본 스풀이 지워져도 영향이 없도록 사본 사용
+        run_keyword_path = str(Path(RUN_KEYWORD_DIR) / f"load-{job.id}.keywords.jsonl")
+        Path(RUN_KEYWORD_DIR).mkdir(parents=True, exist_ok=True)
+        if not os.path.exists(run_keyword_path):
+            shutil.copyfile(keyword_path, run_keyword_path)
+
+        def on_update(timeline, elapsed):
+            job.progress["load"] = {"elapsed": min(elapsed, duration), "duration": duration}
+            job.results["timeline"] = timeline.rows()
+
+        timeline = run_load_test(
+            configs, run_keyword_path, profile, workers, max_in_flight, timeout,
+            on_update=on_update, cancel_event=job.cancel_event
+        )
+        rows = timeline.rows()
+        job.results["summary"] = {system: timeline.summary(system) for system in configs}
+        job.results["saturation"] = {system: find_saturation(rows, system) for system in configs}
+
+    return get_job_manager().submit("load", target)
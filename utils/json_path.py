@@ -0,0 +1,164 @@
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+# 단계 종류
+_KEY = "key"
+_INDEX = "index"
+_SLICE = "slice"
+_WILD = "wild"
+
+# 정수 인덱스 (부호는 하나만)
+_INT = re.compile(r"-?\d+", re.ASCII)
+
+
+class JsonPathError(ValueError):
+    '''잘못된 JSON 경로 문법'''
+
+
+class JsonPath:
+    '''
+    한 번 컴파일해서 여러 응답에 재사용하는 JSON 경로 접근자.
+
+    지원 문법)
+      data.results.0.title            단일 값
+      data.results.*.title            와일드카드 (dict 값 / list 원소 전체)
+      data.results[:10].title         슬라이스 / 인덱스 ([0], [-1], [2:5])
+      data.results[:10].{title,id,score}
+                                      히트마다 여러 필드 투영 (필드도 하위 경로 가능)
+
+    와일드카드나 슬라이스가 있으면 extract() 는 리스트를, 없으면 단일 값을 반환합니다.
+    경로 중간에 값이 없으면 해당 히트는 건너뜁니다 (단일 값 경로는 None).
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        self.steps, self.projection = _compile(path)
+        self.fanout = any(kind in (_SLICE, _WILD) for kind, _ in self.steps)
+
+    def extract(self, data: Any) -> Any:
+        '''경로 적용 (fan-out 경로는 리스트, 아니면 단일 값/None)'''
+        hits = self._walk(data)
+        if self.fanout:
+            return hits
+        return hits[0] if hits else None
+
+    def extract_list(self, data: Any) -> List[Any]:
+        '''경로 적용 결과를 항상 리스트로 반환 (랭킹 비교용)'''
+        hits = self._walk(data)
+        if not self.fanout and hits and isinstance(hits[0], list):
+            return hits[0]
+        return hits
+
+    def _walk(self, data: Any) -> List[Any]:
+        values = [data]
+        for kind, arg in self.steps:
+            nxt = []
+            for value in values:
+                if kind == _KEY:
+                    if isinstance(value, dict):
+                        if arg in value:
+                            nxt.append(value[arg])
+                    elif isinstance(value, list) and _is_int(arg):
+                        _append_index(nxt, value, int(arg))
+                elif kind == _INDEX:
+                    if isinstance(value, list):
+                        _append_index(nxt, value, arg)
+                    elif isinstance(value, dict) and str(arg) in value:
+                        nxt.append(value[str(arg)])
+                elif kind == _SLICE:
+                    if isinstance(value, list):
+                        nxt.extend(value[arg])
+                else:  # _WILD
+                    if isinstance(value, dict):
+                        nxt.extend(value.values())
+                    elif isinstance(value, list):
+                        nxt.extend(value)
+            values = nxt
+            if not values:
+                return []
+
+        if self.projection:
+            return [
+                {name: accessor.extract(value) for name, accessor in self.projection}
+                for value in values
+            ]
+        return values
+
+    def __repr__(self):
+        return f"JsonPath({self.path!r})"
+
+
+def _is_int(text: str) -> bool:
+    return _INT.fullmatch(text) is not None
+
+
+def _append_index(out: List[Any], value: list, index: int) -> None:
+    if -len(value) <= index < len(value):
+        out.append(value[index])
+
+
+def _bracket(spec: str, path: str) -> Tuple[str, Any]:
+    '''[...] 내부 해석'''
+    spec = spec.strip()
+    if spec == "*":
+        return _WILD, None
+    if ":" in spec:
+        parts = spec.split(":")
+        if len(parts) > 3 or any(p.strip() and not _is_int(p.strip()) for p in parts):
+            raise JsonPathError(f"잘못된 슬라이스 '[{spec}]': {path}")
+        if len(parts) == 3 and parts[2].strip() and int(parts[2]) == 0:
+            raise JsonPathError(f"슬라이스 step 은 0 일 수 없습니다 '[{spec}]': {path}")
+        return _SLICE, slice(*(int(p) if p.strip() else None for p in parts))
+    if _is_int(spec):
+        return _INDEX, int(spec)
+    raise JsonPathError(f"잘못된 인덱스 '[{spec}]': {path}")
+
+
+def _compile(path: str):
+    path = path.strip()
+    if not path:
+        raise JsonPathError("빈 경로입니다.")
+
+    steps = []
+    projection: Optional[Tuple[Tuple[str, "JsonPath"], ...]] = None
+    i, n = 0, len(path)
+    while i < n:
+        c = path[i]
+        if c == ".":
+            i += 1
+        elif c == "[":
+            j = path.find("]", i)
+            if j < 0:
+                raise JsonPathError(f"닫히지 않은 '[': {path}")
+            steps.append(_bracket(path[i + 1:j], path))
+            i = j + 1
+        elif c == "{":
+            j = path.find("}", i)
+            if j != n - 1:
+                raise JsonPathError(f"필드 투영 '{{...}}' 은 경로 마지막에만 올 수 있습니다: {path}")
+            fields = [f.strip() for f in path[i + 1:j].split(",") if f.strip()]
+            if not fields:
+                raise JsonPathError(f"투영할 필드가 없습니다: {path}")
+            projection = tuple((f, compile_json_path(f)) for f in fields)
+            i = n
+        else:
+            j = i
+            while j < n and path[j] not in ".[{":
+                j += 1
+            name = path[i:j].strip()
+            if name == "*":
+                steps.append((_WILD, None))
+            elif _is_int(name):
+                steps.append((_INDEX, int(name)))
+            else:
+                steps.append((_KEY, name))
+            i = j
+
+    return tuple(steps), projection
+
+
+@lru_cache(maxsize=256)
+def compile_json_path(path: str) -> JsonPath:
+    '''경로 문자열을 컴파일 (동일 경로는 캐시된 접근자 재사용)'''
+    return JsonPath(path)
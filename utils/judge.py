@@ -0,0 +1,467 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import requests
+
+from utils.profiling import current_tracer
+from utils.response_cache import DEFAULT_CACHE_PATH, ResponseCache
+from utils.retrieval_metrics import DEFAULT_K, DEFAULT_RBO_P, IdInterner, as_result_list, compute_metrics
+
+PROMPT_VERSION = "v1"
+JUDGE_MODES = ("pairwise", "pointwise")
+MAX_RESULT_CHARS = 4000
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_JUDGE_WORKERS = 4
+DEFAULT_JUDGE_RETRIES = 3
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+# =====================================================
+# Prompt
+# =====================================================
+def _render_result(result: Any) -> str:
+    text = json.dumps(result, ensure_ascii=False, indent=1)
+    if len(text) > MAX_RESULT_CHARS:
+        text = text[:MAX_RESULT_CHARS] + "\n... (생략)"
+    return text
+
+
+def build_pairwise_prompt(keyword: str, result_a: Any, result_b: Any) -> str:
+    '''A/B 검색 결과 비교 프롬프트'''
+    return (
+        "당신은 검색 품질 평가자입니다. 사용자의 검색어에 대해 두 검색 시스템의 결과를 비교하세요.\n"
+        "관련성, 상위 결과의 정확도, 다양성을 기준으로 더 나은 쪽을 고르고,\n"
+        "차이가 없으면 tie 로 답하세요.\n\n"
+        f"[검색어]\n{keyword}\n\n"
+        f"[시스템 A 결과]\n{_render_result(result_a)}\n\n"
+        f"[시스템 B 결과]\n{_render_result(result_b)}\n\n"
+        '다음 JSON 형식으로만 답하세요: {"winner": "A" | "B" | "tie", "reason": "한 문장 근거"}'
+    )
+
+
+def build_pointwise_prompt(keyword: str, result: Any) -> str:
+    '''단일 검색 결과 점수 프롬프트'''
+    return (
+        "당신은 검색 품질 평가자입니다. 사용자의 검색어에 대한 검색 결과의 품질을 1~5점으로 평가하세요.\n"
+        "5점은 상위 결과가 모두 검색 의도에 정확히 부합하는 경우입니다.\n\n"
+        f"[검색어]\n{keyword}\n\n"
+        f"[검색 결과]\n{_render_result(result)}\n\n"
+        '다음 JSON 형식으로만 답하세요: {"score": 1~5 정수, "reason": "한 문장 근거"}'
+    )
+
+
+def parse_judge_output(text: str) -> Optional[Dict[str, Any]]:
+    '''모델 응답에서 첫 JSON 객체 추출 (없거나 깨졌으면 None)'''
+    match = _JSON_OBJECT.search(text or "")
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+
+def normalize_winner(value: Any) -> Optional[str]:
+    '''쌍 비교 응답의 winner 정규화 ("a" / " B " / "TIE" 등 → "A" / "B" / "tie", 그 외 None)'''
+    winner = str(value if value is not None else "").strip().upper()
+    if winner in ("A", "B"):
+        return winner
+    return "tie" if winner == "TIE" else None
+
+
+# =====================================================
+# Backend
+# =====================================================
+class JudgeBackend:
+    '''
+    판정 모델 백엔드 인터페이스.
+    complete() 는 프롬프트 묶음을 받아 같은 순서의 응답 텍스트 리스트를 반환합니다.
+    프롬프트 일부만 실패하면 그 자리에 예외 객체를 넣어 반환하고(성공한 응답은 다시 호출하지 않도록),
+    묶음 전체가 실패하면 예외를 던집니다.
+    '''
+
+    name = "base"
+    kind = "base"
+
+    def complete(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        raise NotImplementedError
+
+
+class StubJudgeBackend(JudgeBackend):
+    '''
+    오프라인 테스트용 로컬 스텁 모델.
+    프롬프트 해시로 결정적인 판정을 만들어 네트워크 없이 파이프라인을 검증합니다.
+    '''
+
+    name = "stub"
+    kind = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def complete(self, prompts: List[str]) -> List[str]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        outputs = []
+        for prompt in prompts:
+            h = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+            if "[시스템 A 결과]" in prompt:
+                winner = ("A", "B", "tie")[h % 3]
+                outputs.append(json.dumps({"winner": winner, "reason": "stub"}))
+            else:
+                outputs.append(json.dumps({"score": h % 5 + 1, "reason": "stub"}))
+        return outputs
+
+
+class OpenAICompatibleBackend(JudgeBackend):
+    '''OpenAI 호환 Chat Completions API 백엔드 (vLLM, Ollama 등 포함)'''
+
+    name = "openai"
+    kind = "openai"
+
+    def __init__(
+            self,
+            base_url: str,
+            model: str,
+            api_key: Optional[str] = None,
+            temperature: float = 0.0,
+            timeout: float = 60
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.url = self.base_url + "/chat/completions"
+        self.model = model
+        self.temperature = temperature
+        self.timeout = timeout
+        self.name = f"openai:{model}"
+        self._session = requests.Session()
+        if api_key:
+            self._session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def complete(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        '''프롬프트마다 요청 1회. 실패한 프롬프트는 예외 객체로 반환 (나머지는 계속 호출)'''
+        outputs: List[Union[str, Exception]] = []
+        for prompt in prompts:
+            try:
+                response = self._session.post(
+                    self.url,
+                    json={
+                        "model": self.model,
+                        "temperature": self.temperature,
+                        "messages": [{"role": "user", "content": prompt}],
+                    },
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                outputs.append(response.json()["choices"][0]["message"]["content"])
+            except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+                outputs.append(e)
+        return outputs
+
+
+def judge_fingerprint(kind: str, mode: str, base_url: str = "", model: str = "") -> str:
+    '''
+    판정 설정 식별자 (프롬프트 버전 + 판정 방식 + 백엔드 + 모델 + 엔드포인트).
+    같은 실행이라도 이 값이 다르면 판정 작업과 판정 결과를 따로 둡니다 (다른 설정의 판정을 섞지 않음).
+    '''
+    if kind == "stub":
+        base_url, model = "", ""
+    key = json.dumps([PROMPT_VERSION, mode, kind, (base_url or "").rstrip("/"), model or ""], ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+def create_backend(kind: str, base_url: str = "", model: str = "", api_key: Optional[str] = None) -> JudgeBackend:
+    '''판정 설정으로 백엔드 생성 (kind: "stub" | "openai")'''
+    if kind == "stub":
+        return StubJudgeBackend()
+    if kind == "openai":
+        if not base_url or not model:
+            raise ValueError("OpenAI 호환 백엔드는 Base URL 과 모델명이 필요합니다.")
+        return OpenAICompatibleBackend(base_url, model, api_key or None)
+    raise ValueError(f"지원하지 않는 판정 백엔드: {kind}")
+
+
+# =====================================================
+# Pre-judge
+# =====================================================
+def fingerprint(value: Any) -> str:
+    '''판정 입력(파싱 결과) 지문. 키 순서와 무관하게 같은 값이면 같은 지문'''
+    text = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _auto_tie(item: Dict[str, Any], reason: str) -> Dict[str, Any]:
+    verdict = {"keyword": item["keyword"], "winner": "tie", "reason": reason, "score_a": None, "score_b": None,
+               "cached": False, "auto": True}
+    if "idx" in item:
+        verdict["idx"] = item["idx"]
+    return verdict
+
+
+def prejudge(
+        items: List[Dict[str, Any]],
+        similarity_threshold: Optional[float] = None,
+        k: int = DEFAULT_K,
+        p: float = DEFAULT_RBO_P
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    '''
+    판정 전 단계. A/B 판정 입력이 같으면(지문 일치) LLM 을 부르지 않고 무승부로 확정합니다.
+    similarity_threshold 를 주면 상위 k 개 순위의 RBO 가 임계값 이상인 쌍도 무승부로 확정합니다.
+    반환: (판정이 필요한 항목, 자동 판정 결과)
+    '''
+    exact = [fingerprint(item["a"]) == fingerprint(item["b"]) for item in items]
+    similarity = None
+    if similarity_threshold is not None and not all(exact):
+        interner = IdInterner()
+        a = interner.pack([as_result_list(item["a"]) for item in items], k)
+        b = interner.pack([as_result_list(item["b"]) for item in items], k)
+        similarity = compute_metrics(a, b, p)["rbo"]
+
+    divergent, verdicts = [], []
+    for n, item in enumerate(items):
+        if exact[n]:
+            verdicts.append(_auto_tie(item, "A/B 결과 동일 (자동 무승부)"))
+        elif similarity is not None and similarity[n] >= similarity_threshold:
+            verdicts.append(_auto_tie(item, f"A/B 결과 유사 (RBO {similarity[n]:.3f}, 자동 무승부)"))
+        else:
+            divergent.append(item)
+    return divergent, verdicts
+
+
+# =====================================================
+# Engine
+# =====================================================
+class JudgeEngine:
+    '''
+    A/B 결과 쌍 판정 엔진.
+
+    - pairwise: 키워드당 프롬프트 1개로 A/B 중 승자 판정
+    - pointwise: A, B 결과를 각각 1~5점으로 평가해 점수로 승자 결정
+    프롬프트는 batch_size 개씩 묶어 max_workers 개 스레드에서 동시에 백엔드로 보내고,
+    실패한 묶음은 지수 백오프로 max_retries 번 재시도합니다.
+    (키워드, 결과, 프롬프트 버전, 백엔드)가 같은 판정은 캐시에서 재사용하며 다시 호출하지 않습니다.
+    '''
+
+    def __init__(
+            self,
+            backend: JudgeBackend,
+            mode: str = "pairwise",
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            max_workers: int = DEFAULT_JUDGE_WORKERS,
+            max_retries: int = DEFAULT_JUDGE_RETRIES,
+            cache: Optional[ResponseCache] = None
+    ):
+        if mode not in JUDGE_MODES:
+            raise ValueError(f"지원하지 않는 판정 방식: {mode}")
+        self.backend = backend
+        self.mode = mode
+        self.batch_size = max(1, int(batch_size))
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max_retries
+        self.cache = cache
+        self.backend_calls = 0
+        self._calls_lock = threading.Lock()
+        self.cache_hits = 0
+        self.deduped = 0
+
+    @property
+    def fingerprint(self) -> str:
+        '''판정 설정 식별자 (judge_fingerprint). 결과 저장소의 판정 범위와 판정 작업 key 에 씁니다.'''
+        return judge_fingerprint(
+            self.backend.kind, self.mode, getattr(self.backend, "base_url", ""), getattr(self.backend, "model", "")
+        )
+
+    def _task_key(self, *parts: Any) -> str:
+        return ResponseCache.make_key(PROMPT_VERSION, self.mode, self.backend.name, *parts)
+
+    def judge(
+            self,
+            items: List[Dict[str, Any]],
+            on_progress: Optional[Callable[[int, int], None]] = None,
+            cancel_event: Optional[threading.Event] = None
+    ) -> List[Dict[str, Any]]:
+        '''
+        items: [{"keyword": ..., "a": A 결과, "b": B 결과}, ...]
+        반환: 같은 순서의 [{"keyword", "winner", "reason", "score_a", "score_b", "cached"}, ...]
+        cancel_event 가 set 되면 남은 묶음을 취소하고, 판정이 끝난 항목만 반환합니다.
+        '''
+        tracer = current_tracer()
+        prompt_started = time.perf_counter()
+
+        # 1) 판정 단위(task) 생성: 동일 key 는 한 번만
+        tasks: Dict[str, str] = {}
+        item_keys = []
+        for item in items:
+            if self.mode == "pairwise":
+                key = self._task_key(item["keyword"], item["a"], item["b"])
+                if key not in tasks:
+                    tasks[key] = build_pairwise_prompt(item["keyword"], item["a"], item["b"])
+                item_keys.append((key,))
+            else:
+                keys = []
+                for side in ("a", "b"):
+                    key = self._task_key(item["keyword"], item[side])
+                    if key not in tasks:
+                        tasks[key] = build_pointwise_prompt(item["keyword"], item[side])
+                    keys.append(key)
+                item_keys.append(tuple(keys))
+        self.deduped += sum(len(keys) for keys in item_keys) - len(tasks)
+        tracer.add_span("judge.prompt", prompt_started, time.perf_counter() - prompt_started)
+
+        # 2) 캐시 조회
+        outputs: Dict[str, Dict[str, Any]] = {}
+        cached_keys = set()
+        if self.cache is not None:
+            with tracer.span("judge.cache"):
+                for key in tasks:
+                    hit = self.cache.get(key)
+                    if hit is not None:
+                        outputs[key] = hit
+                        cached_keys.add(key)
+        self.cache_hits += len(cached_keys)
+
+        # 3) 남은 프롬프트를 묶음 단위로 병렬 호출
+        pending = [key for key in tasks if key not in outputs]
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        total, done = len(tasks), len(cached_keys)
+        if on_progress:
+            on_progress(done, total)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="judge")
+        try:
+            futures = {
+                executor.submit(tracer.call, "judge.llm", self._complete_batch, [tasks[key] for key in batch]): batch
+                for batch in batches
+            }
+            remaining = len(futures)
+            for future in as_completed(futures):
+                remaining -= 1
+                tracer.count("queue.judge", remaining)
+                batch = futures[future]
+                for key, parsed in zip(batch, future.result()):
+                    outputs[key] = parsed
+                    if self.cache is not None and "error" not in parsed:
+                        self.cache.set(key, parsed)
+                done += len(batch)
+                if on_progress:
+                    on_progress(done, total)
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        # 4) 키워드별 판정으로 조립 (취소로 결과가 없는 항목은 제외)
+        return [
+            self._verdict(item, [outputs[key] for key in keys], all(key in cached_keys for key in keys))
+            for item, keys in zip(items, item_keys)
+            if all(key in outputs for key in keys)
+        ]
+
+    def _complete_batch(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        '''
+        묶음 1개 호출 + 재시도. 재시도는 실패한 프롬프트만 다시 보내고(성공한 응답은 재호출하지 않음),
+        재시도 후에도 실패한 프롬프트만 error 항목으로 반환합니다.
+        '''
+        results: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+        errors: Dict[int, str] = {}
+        todo = list(range(len(prompts)))
+        for attempt in range(self.max_retries + 1):
+            # 판정 워커 스레드들이 함께 세므로 잠금
+            with self._calls_lock:
+                self.backend_calls += 1
+            try:
+                texts = self.backend.complete([prompts[i] for i in todo])
+                if len(texts) != len(todo):
+                    raise ValueError(f"판정 응답 수({len(texts)})가 프롬프트 수({len(todo)})와 다릅니다.")
+            except Exception as e:
+                texts = [e] * len(todo)
+            failed = []
+            for i, text in zip(todo, texts):
+                if isinstance(text, Exception):
+                    errors[i] = str(text)
+                    failed.append(i)
+                else:
+                    results[i] = self._parse_output(text)
+            todo = failed
+            if not todo:
+                break
+            if attempt < self.max_retries:
+                time.sleep(0.5 * (2 ** attempt))
+        for i in todo:
+            results[i] = {"error": errors[i]}
+        return results
+
+    def _parse_output(self, text: str) -> Dict[str, Any]:
+        parsed = parse_judge_output(text)
+        if parsed is None:
+            return {"error": f"판정 응답 파싱 실패: {text[:200]}"}
+        if self.mode == "pairwise" and normalize_winner(parsed.get("winner")) is None:
+            # 무승부로 세지 않고 오류로 기록 (캐시에도 남기지 않음)
+            return {"error": f"판정 winner 형식 오류: {str(parsed.get('winner'))[:50]!r}"}
+        return parsed
+
+    def _verdict(self, item: Dict[str, Any], outputs: List[Dict[str, Any]], cached: bool) -> Dict[str, Any]:
+        verdict = {"keyword": item["keyword"], "winner": None, "reason": "", "score_a": None, "score_b": None,
+                   "cached": cached}
+        if "idx" in item:
+            verdict["idx"] = item["idx"]
+        errors = [o["error"] for o in outputs if "error" in o]
+        if errors:
+            verdict["reason"] = errors[0]
+            return verdict
+
+        if self.mode == "pairwise":
+            winner = normalize_winner(outputs[0].get("winner"))
+            verdict["winner"] = winner
+            verdict["reason"] = outputs[0].get("reason", "") if winner else "판정 winner 형식 오류"
+            return verdict
+
+        score_a, score_b = outputs[0].get("score"), outputs[1].get("score")
+        verdict["score_a"], verdict["score_b"] = score_a, score_b
+        verdict["reason"] = f"A: {outputs[0].get('reason', '')} / B: {outputs[1].get('reason', '')}"
+        try:
+            diff = float(score_a) - float(score_b)
+        except (TypeError, ValueError):
+            verdict["reason"] = "점수 형식 오류"
+            return verdict
+        verdict["winner"] = "A" if diff > 0 else "B" if diff < 0 else "tie"
+        return verdict
+
+
+def build_judge_items(results_a: List[Dict[str, Any]], results_b: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    '''
+    시스템별 호출 결과를 키워드 단위 판정 입력으로 변환.
+    파싱 결과가 있으면 파싱 결과를, 없으면 전체 응답을 사용합니다. 호출 실패 키워드는 제외합니다.
+    '''
+    items = []
+    for a, b in zip(results_a, results_b):
+        if not (a and b and a.get("success") and b.get("success")):
+            continue
+        items.append(build_judge_item(a["keyword"], a, b))
+    return items
+
+
+def build_judge_item(keyword: str, a: Dict[str, Any], b: Dict[str, Any], idx: Optional[int] = None) -> Dict[str, Any]:
+    '''A/B 결과 1쌍을 판정 입력으로 변환 (idx 지정 시 판정 결과에 그대로 전달)'''
+    item = {
+        "keyword": keyword,
+        "a": a["parsed"] if "parsed" in a else a.get("data"),
+        "b": b["parsed"] if "parsed" in b else b.get("data"),
+    }
+    if idx is not None:
+        item["idx"] = idx
+    return item
+
+
+@lru_cache(maxsize=None)
+def get_judge_cache(path: str = DEFAULT_CACHE_PATH) -> ResponseCache:
+    '''프로세스 공용 판정 캐시 (만료 없음)'''
+    return ResponseCache(path, table="judge_verdicts", ttl_seconds=None)
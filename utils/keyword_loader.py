@@ -1,24 +1,432 @@
-import pandas as pd
-from typing import List
+import csv
+import hashlib
+import heapq
+import io
+import json
+import math
+import random
+import re
+import unicodedata
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+CHUNK_SIZE = 1 << 20  # 1MB
+SAMPLE_MODES = ("all", "first", "random", "stratified")
+COUNTED_SAMPLE_MODES = ("all", "first", "random", "weighted", "bands")
+# head / torso / tail 경계 (누적 검색량 비율)
+FREQUENCY_BANDS = (("head", 0.5), ("torso", 0.8), ("tail", 1.0))
+_WHITESPACE = re.compile(r'\s+')
+
+
+class KeywordRow(str):
+    '''
+    요청 템플릿 변수로 쓸 CSV 컬럼 값(fields)을 함께 들고 다니는 키워드.
+    str 이므로 중복 제거 / 샘플링 / 저장 등 기존 키워드 처리에 그대로 쓸 수 있습니다.
+    '''
+
+    __slots__ = ('fields',)
+
+    def __new__(cls, keyword: str, fields: Optional[Dict[str, str]] = None):
+        row = super().__new__(cls, keyword)
+        row.fields = fields or {}
+        return row
+
+
+def _with_fields(keyword: str, source: str) -> str:
+    '''source 의 템플릿 변수 값(fields)을 keyword 에 이어 붙이기'''
+    fields = getattr(source, 'fields', None)
+    return KeywordRow(keyword, fields) if fields else keyword
+
+
+def _normalize_delimiter(delimiter: str) -> str:
+    '''입력창에 쓴 "\\n" 을 실제 줄바꿈으로 변환'''
+    if delimiter in ('\\n', '\\\\n', ''):
+        return '\n'
+    return delimiter
+
+
+def _iter_split(chunks: Iterable[str], delimiter: str) -> Iterator[str]:
+    '''청크 단위 텍스트를 구분자로 나눠 키워드 스트림으로 변환'''
+    rest = ''
+    for chunk in chunks:
+        parts = (rest + chunk).split(delimiter)
+        rest = parts.pop()
+        for part in parts:
+            part = part.strip()
+            if part:
+                yield part
+    rest = rest.strip()
+    if rest:
+        yield rest
+
+
+def _text_stream(file) -> io.TextIOBase:
+    '''업로드 파일(바이너리)을 UTF-8 텍스트 스트림으로 감싸기'''
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    return io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+
+
+def iter_keywords_from_text(text: str, delimiter: str) -> Iterator[str]:
+    '''텍스트에서 키워드 스트림'''
+    return _iter_split([text], _normalize_delimiter(delimiter))
+
+
+def iter_keywords_from_file(file, delimiter: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    '''텍스트 파일을 청크 단위로 읽어 키워드 스트림 (전체를 메모리에 올리지 않음)'''
+    stream = _text_stream(file)
+    try:
+        yield from _iter_split(iter(lambda: stream.read(chunk_size), ''), _normalize_delimiter(delimiter))
+    finally:
+        stream.detach()
+
+
+def read_csv_header(file) -> List[str]:
+    '''CSV 첫 행(헤더)만 읽기'''
+    stream = _text_stream(file)
+    try:
+        return next(csv.reader(stream), [])
+    finally:
+        stream.detach()
+        file.seek(0)
+
+
+def iter_rows_from_csv(
+        file,
+        column: Union[int, str] = 0,
+        strata_column: Optional[Union[int, str]] = None,
+        field_columns: Iterable[Union[int, str]] = ()
+) -> Iterator[Tuple[str, Optional[str]]]:
+    '''
+    CSV 를 한 행씩 읽어 (키워드, 층화 값) 스트림. 첫 행은 헤더로 간주.
+    field_columns 를 주면 해당 컬럼 값을 {헤더: 값} 으로 담은 KeywordRow 를 돌려줍니다 (요청 템플릿 변수).
+    '''
+    stream = _text_stream(file)
+    try:
+        reader = csv.reader(stream)
+        header = next(reader, [])
+        col = header.index(column) if isinstance(column, str) else column
+        strata = header.index(strata_column) if isinstance(strata_column, str) else strata_column
+        fields = [
+            (name, header.index(name)) if isinstance(name, str) else (header[name], name)
+            for name in field_columns
+        ]
+        for row in reader:
+            if col >= len(row):
+                continue
+            keyword = row[col].strip()
+            if not keyword or keyword == 'nan':
+                continue
+            stratum = row[strata].strip() if strata is not None and strata < len(row) else None
+            if fields:
+                keyword = KeywordRow(keyword, {name: row[i].strip() if i < len(row) else '' for name, i in fields})
+            yield keyword, stratum
+    finally:
+        stream.detach()
+
+
+def iter_keywords_from_csv(file, column: Union[int, str] = 0) -> Iterator[str]:
+    '''CSV 파일에서 키워드 스트림 (기본: 첫 번째 컬럼)'''
+    for keyword, _ in iter_rows_from_csv(file, column):
+        yield keyword
+
 
 def parse_keywords_from_text(text: str, delimiter: str) -> List[str]:
     '''텍스트에서 키워드 파싱'''
-    if delimiter == '\\\\n':
-        delimiter = '\\n'
-    keywords = [k.strip() for k in text.split(delimiter) if k.strip()]
-    return keywords
+    return list(iter_keywords_from_text(text, delimiter))
+
 
 def parse_keywords_from_file(file, delimiter: str) -> List[str]:
     '''텍스트 파일에서 키워드 파싱'''
-    text_content = file.read().decode('utf-8')
-    return parse_keywords_from_text(text_content, delimiter)
+    return list(iter_keywords_from_file(file, delimiter))
+
 
 def parse_keywords_from_csv(file) -> List[str]:
     '''CSV 파일에서 키워드 파싱 (첫 번째 컬럼 사용)'''
-    df = pd.read_csv(file)
-    keywords = df.iloc[:, 0].astype(str).str.strip().tolist()
-    return [k for k in keywords if k and k != 'nan']
+    return list(iter_keywords_from_csv(file))
+
+
+# =====================================================
+# Dedup / Sampling
+# =====================================================
+class KeywordDeduper:
+    '''
+    키워드 중복 제거기.
+    키워드 문자열 대신 8바이트 해시(int)만 보관해 수백만 건에서도 메모리를 적게 씁니다.
+    '''
+
+    def __init__(self):
+        self._seen = set()
+
+    def add(self, keyword: str) -> bool:
+        '''처음 본 키워드면 True'''
+        digest = int.from_bytes(hashlib.blake2b(keyword.encode('utf-8'), digest_size=8).digest(), 'big')
+        if digest in self._seen:
+            return False
+        self._seen.add(digest)
+        return True
+
+    def __len__(self):
+        return len(self._seen)
+
+
+def dedupe_keywords(pairs: Iterable[Tuple[str, Optional[str]]]) -> Iterator[Tuple[str, Optional[str]]]:
+    '''(키워드, 층화 값) 스트림에서 중복 키워드 제거 (첫 등장 유지)'''
+    deduper = KeywordDeduper()
+    for keyword, stratum in pairs:
+        if deduper.add(keyword):
+            yield keyword, stratum
+
+
+def _length_stratum(keyword: str) -> str:
+    '''층화 컬럼이 없을 때 쓰는 기본 층: 키워드 길이 구간'''
+    n = len(keyword)
+    if n <= 2:
+        return '1-2'
+    if n <= 5:
+        return '3-5'
+    if n <= 10:
+        return '6-10'
+    return '11+'
+
+
+def sample_keywords(
+        pairs: Iterable[Tuple[str, Optional[str]]],
+        mode: str = "all",
+        n: int = 0,
+        seed: Optional[int] = None
+) -> Iterator[str]:
+    '''
+    (키워드, 층화 값) 스트림 샘플링.
+
+    - all: 전체
+    - first: 앞에서부터 n개
+    - random: 무작위 n개 (reservoir sampling, 메모리 O(n))
+    - stratified: 층별 비율을 유지한 무작위 n개 (층화 값이 없으면 키워드 길이 구간)
+    '''
+    if mode not in SAMPLE_MODES:
+        raise ValueError(f"지원하지 않는 샘플링 방식: {mode}")
+
+    if mode == "all" or n <= 0:
+        return (keyword for keyword, _ in pairs)
+    if mode == "first":
+        return (keyword for keyword, _ in islice(pairs, n))
+
+    rng = random.Random(seed)
+    if mode == "random":
+        return iter(_reservoir((keyword for keyword, _ in pairs), n, rng))
+    return iter(_stratified(pairs, n, rng))
+
+
+def _reservoir(keywords: Iterable[str], n: int, rng: random.Random) -> List[str]:
+    sample = []
+    for i, keyword in enumerate(keywords):
+        if i < n:
+            sample.append(keyword)
+        else:
+            j = rng.randint(0, i)
+            if j < n:
+                sample[j] = keyword
+    return sample
+
+
+def _stratified(pairs: Iterable[Tuple[str, Optional[str]]], n: int, rng: random.Random) -> List[str]:
+    '''층별 reservoir(각 n개) 유지 후 층 크기 비율로 배분 (최대 나머지 방식)'''
+    reservoirs, counts = {}, {}
+    for keyword, stratum in pairs:
+        stratum = stratum if stratum is not None else _length_stratum(keyword)
+        seen = counts.get(stratum, 0)
+        bucket = reservoirs.setdefault(stratum, [])
+        if seen < n:
+            bucket.append(keyword)
+        else:
+            j = rng.randint(0, seen)
+            if j < n:
+                bucket[j] = keyword
+        counts[stratum] = seen + 1
+
+    total = sum(counts.values())
+    if total <= n:
+        return [kw for bucket in reservoirs.values() for kw in bucket]
+
+    quotas = {s: n * c / total for s, c in counts.items()}
+    alloc = {s: int(q) for s, q in quotas.items()}
+    leftover = n - sum(alloc.values())
+    for s in sorted(quotas, key=lambda s: quotas[s] - alloc[s], reverse=True)[:leftover]:
+        alloc[s] += 1
+
+    sample = []
+    for s, bucket in reservoirs.items():
+        sample.extend(bucket[:alloc[s]])
+    rng.shuffle(sample)
+    return sample
+
+
+# =====================================================
+# Normalize / Frequency
+# =====================================================
+def normalize_keyword(keyword: str) -> str:
+    '''키워드 정규화: 유니코드 NFC(한글 자모 결합) + 소문자 + 공백 정리'''
+    keyword = unicodedata.normalize('NFC', keyword)
+    return _WHITESPACE.sub(' ', keyword).strip().casefold()
+
+
+def normalize_pairs(pairs: Iterable[Tuple[str, Optional[str]]]) -> Iterator[Tuple[str, Optional[str]]]:
+    '''(키워드, 층화 값) 스트림 정규화'''
+    for keyword, stratum in pairs:
+        normalized = normalize_keyword(keyword)
+        if normalized:
+            yield _with_fields(normalized, keyword), stratum
+
+
+def count_keywords(pairs: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, int]:
+    '''중복 키워드를 (키워드 → 등장 횟수)로 집계 (첫 등장 순서 유지)'''
+    counts: Dict[str, int] = {}
+    for keyword, _ in pairs:
+        counts[keyword] = counts.get(keyword, 0) + 1
+    return counts
+
+
+def frequency_bands(counts: Dict[str, int]) -> Dict[str, List[str]]:
+    '''
+    빈도 내림차순 누적 검색량 기준으로 head / torso / tail 구간 분리.
+    (기본: 누적 50%까지 head, 80%까지 torso, 나머지 tail)
+    '''
+    total = sum(counts.values())
+    bands = {name: [] for name, _ in FREQUENCY_BANDS}
+    cumulative = 0
+    band_idx = 0
+    for keyword, count in sorted(counts.items(), key=lambda kv: kv[1], reverse=True):
+        while band_idx < len(FREQUENCY_BANDS) - 1 and cumulative >= FREQUENCY_BANDS[band_idx][1] * total:
+            band_idx += 1
+        bands[FREQUENCY_BANDS[band_idx][0]].append(keyword)
+        cumulative += count
+    return bands
+
+
+def sample_counted_keywords(
+        counts: Dict[str, int],
+        mode: str = "all",
+        n: int = 0,
+        seed: Optional[int] = None
+) -> List[Tuple[str, int]]:
+    '''
+    빈도 집계된 키워드 샘플링. (키워드, 등장 횟수) 리스트 반환.
+
+    - all: 전체 (고유 키워드)
+    - first: 빈도 상위 n개
+    - random: 고유 키워드 중 균등 무작위 n개
+    - weighted: 빈도에 비례한 비복원 무작위 n개 (Efraimidis-Spirakis)
+    - bands: head / torso / tail 에서 같은 수씩 무작위 n개
+    '''
+    if mode not in COUNTED_SAMPLE_MODES:
+        raise ValueError(f"지원하지 않는 샘플링 방식: {mode}")
+
+    if mode == "all" or n <= 0 or n >= len(counts):
+        return list(counts.items())
+    if mode == "first":
+        return heapq.nlargest(n, counts.items(), key=lambda kv: kv[1])
+
+    rng = random.Random(seed)
+    if mode == "random":
+        return [(kw, counts[kw]) for kw in rng.sample(list(counts), n)]
+    if mode == "weighted":
+        # key = log(u) / w 가 큰 n개 = 가중치 w 에 비례한 비복원 추출
+        return heapq.nlargest(
+            n, counts.items(), key=lambda kv: math.log(1.0 - rng.random()) / kv[1]
+        )
+
+    bands = [band for band in frequency_bands(counts).values() if band]
+    sample = []
+    remaining = n
+    for i, band in enumerate(sorted(bands, key=len)):
+        quota = min(len(band), remaining // (len(bands) - i))
+        sample.extend(rng.sample(band, quota))
+        remaining -= quota
+    return [(kw, counts[kw]) for kw in sample]
+
+
+# =====================================================
+# Spool (디스크 저장)
+# =====================================================
+def spool_keywords(
+        keywords: Iterable[Union[str, Tuple[str, int]]],
+        path: str,
+        preview_size: int = 10
+) -> dict:
+    '''
+    키워드 스트림을 JSONL 파일로 저장하고 요약(경로/개수/미리보기)만 반환합니다.
+    세션에는 이 요약만 보관하므로 키워드 목록 전체가 메모리에 올라가지 않습니다.
+    (키워드, 등장 횟수) 튜플이면 빈도도, KeywordRow 면 템플릿 변수 값(fields)도 함께 저장합니다.
+    '''
+    count = 0
+    volume = 0
+    preview = []
+    with open(path, 'w', encoding='utf-8') as f:
+        for item in keywords:
+            keyword, freq = item if isinstance(item, tuple) else (item, 1)
+            record = {"keyword": keyword, "count": freq}
+            if getattr(keyword, 'fields', None):
+                record["fields"] = keyword.fields
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write('\n')
+            if count < preview_size:
+                preview.append(keyword)
+            count += 1
+            volume += freq
+    return {"path": path, "count": count, "volume": volume, "preview": preview}
+
+
+def iter_spooled_keywords(path: str, offset: int = 0) -> Iterator[str]:
+    '''스풀 파일에서 키워드 스트림 (offset: 시작 바이트 위치, spool_offsets 참고)'''
+    with open(path, encoding='utf-8') as f:
+        if offset:
+            f.seek(offset)
+        for line in f:
+            record = json.loads(line)
+            yield KeywordRow(record["keyword"], record["fields"]) if "fields" in record else record["keyword"]
+
+
+def spool_offsets(path: str, every: int) -> List[int]:
+    '''스풀 파일의 0, every, 2×every, ... 번째 줄 시작 바이트 위치 (샤드별로 중간부터 읽기용)'''
+    offsets = []
+    position = 0
+    with open(path, 'rb') as f:
+        for i, line in enumerate(f):
+            if i % every == 0:
+                offsets.append(position)
+            position += len(line)
+    return offsets
+
+
+def shuffle_spool(source: str, path: str, seed: int) -> None:
+    '''
+    스풀 파일을 줄 단위로 무작위 섞어 path 에 저장. 줄 내용 대신 줄 시작 위치(8바이트)만
+    메모리에 두고 섞은 순서대로 읽어 쓰므로 키워드 수백만 건에서도 메모리를 적게 씁니다.
+    '''
+    offsets = array('q')
+    position = 0
+    with open(source, 'rb') as f:
+        for line in f:
+            offsets.append(position)
+            position += len(line)
+    random.Random(seed).shuffle(offsets)
+    with open(source, 'rb') as src, open(path, 'wb') as dst:
+        for offset in offsets:
+            src.seek(offset)
+            dst.write(src.readline())
+
+
+def iter_spooled_counts(path: str) -> Iterator[Tuple[str, int]]:
+    '''스풀 파일에서 (키워드, 등장 횟수) 스트림'''
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            keyword = KeywordRow(record["keyword"], record["fields"]) if "fields" in record else record["keyword"]
+            yield keyword, record.get("count", 1)
+
 
 def get_keyword_preview(keywords: List[str], limit: int = 10) -> List[str]:
     '''키워드 미리보기'''
-    return keywords[:limit]
\ No newline at end of file
+    return keywords[:limit]
@@ -0,0 +1,125 @@
+import math
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_PRECISION = 0.01
+MIN_RESOLUTION_MS = 0.001  # 이보다 작은 값은 같은 버킷 (1µs)
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    '''
+    스트리밍 지연시간 히스토그램 (HDR 방식의 로그 버킷).
+
+    값을 상대 오차 precision(기본 1%) 이내의 로그 버킷에 세기만 하므로
+    호출 수와 무관하게 메모리가 버킷 수(수백 개)로 고정되고, 합치기(merge)도 버킷 합으로 끝납니다.
+    percentile() 은 해당 버킷의 대표값을 반환하므로 오차는 precision 이내입니다.
+    '''
+
+    def __init__(self, precision: float = DEFAULT_PRECISION):
+        self.precision = precision
+        self._log_base = math.log1p(2 * precision)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        scaled = value / MIN_RESOLUTION_MS
+        return int(math.log(scaled) / self._log_base) if scaled > 1.0 else 0
+
+    def _value(self, index: int) -> float:
+        # 버킷 [base^i, base^(i+1)) 의 중앙값
+        return math.exp((index + 0.5) * self._log_base) * MIN_RESOLUTION_MS if index else MIN_RESOLUTION_MS
+
+    def record(self, value: Optional[float]) -> None:
+        if value is None or value < 0:
+            return
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def record_many(self, values: Iterable[Optional[float]]) -> None:
+        for value in values:
+            self.record(value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        '''다른 히스토그램 누적 (precision 이 같아야 함)'''
+        if other.precision != self.precision:
+            raise ValueError("precision 이 다른 히스토그램은 합칠 수 없습니다.")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        '''q 백분위 값 (0~100). 기록이 없으면 None'''
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self, percentiles: Iterable[int] = PERCENTILES) -> Dict[str, Any]:
+        '''{"count", "mean", "min", "max", "p50", "p90", "p99"}'''
+        stats = {"count": self.count, "mean": self.mean, "min": self.min, "max": self.max}
+        for q in percentiles:
+            stats[f"p{q}"] = self.percentile(q)
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision, "buckets": self.buckets, "count": self.count,
+            "total": self.total, "min": self.min, "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(state["precision"])
+        histogram.buckets = {int(index): count for index, count in state["buckets"].items()}
+        histogram.count = state["count"]
+        histogram.total = state["total"]
+        histogram.min = state["min"]
+        histogram.max = state["max"]
+        return histogram
+
+
+def build_latency_report(store, run_id: str, systems: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    '''
+    실행(run) 결과 저장소에서 시스템별 지연시간 리포트 생성.
+
+    캐시 응답을 제외한 성공 호출을 스트리밍 히스토그램에 넣어 전체/TTFB 백분위를 계산하고,
+    오류율과 처리량(네트워크 호출 / 첫 기록 ~ 마지막 기록 구간)을 함께 반환합니다.
+    '''
+    report = {}
+    for system in systems:
+        stats = store.system_stats(run_id, system)
+        latency, ttfb = LatencyHistogram(), LatencyHistogram()
+        latency.record_many(store.iter_latencies(run_id, system, "latency_ms"))
+        ttfb.record_many(store.iter_latencies(run_id, system, "ttfb_ms"))
+
+        network_calls = stats["done"] - stats["cached"]
+        span = (stats["last_at"] or 0) - (stats["first_at"] or 0)
+        report[system] = {
+            **stats,
+            "latency": latency.summary(),
+            "ttfb": ttfb.summary(),
+            "error_rate": (stats["done"] - stats["success"]) / stats["done"] if stats["done"] else None,
+            "throughput": network_calls / span if span > 0 else None,
+        }
+    return report
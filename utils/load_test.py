@@ -0,0 +1,432 @@
+import json
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.api_handler import ApiSession, DEFAULT_TIMEOUT
+from utils.keyword_loader import iter_spooled_keywords
+from utils.latency_stats import LatencyHistogram
+
+ARRIVAL_MODES = ("constant", "poisson")
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_IN_FLIGHT = 64
+MIN_QPS = 0.1
+STARTUP_DELAY_S = 3.0  # 워커 프로세스 기동 대기 (인터프리터 시작 + 모듈 import)
+REPORT_INTERVAL_S = 0.5
+
+# 포화 판정 기준 (연속 SATURATION_WINDOW 구간 이상 유지될 때)
+SATURATION_DROP_RATE = 0.01
+SATURATION_ERROR_RATE = 0.01
+SATURATION_P99_FACTOR = 3.0
+SATURATION_WINDOW = 2
+
+
+# =====================================================
+# Load Profile
+# =====================================================
+def make_profile(
+        target_qps: float,
+        hold_s: float,
+        start_qps: float = 0.0,
+        ramp_up_s: float = 0.0,
+        arrival: str = "constant",
+        seed: int = 42
+) -> Dict[str, Any]:
+    '''
+    부하 프로파일. start_qps → target_qps 로 ramp_up_s 동안 선형 증가한 뒤 hold_s 동안 유지합니다.
+    arrival: "constant" (고정 간격) / "poisson" (지수 분포 간격)
+    '''
+    if arrival not in ARRIVAL_MODES:
+        raise ValueError(f"지원하지 않는 도착 방식: {arrival}")
+    if target_qps <= 0 or hold_s + ramp_up_s <= 0:
+        raise ValueError("목표 QPS 와 실행 시간은 0보다 커야 합니다.")
+    return {
+        "start_qps": float(start_qps), "target_qps": float(target_qps),
+        "ramp_up_s": float(ramp_up_s), "hold_s": float(hold_s),
+        "arrival": arrival, "seed": seed,
+    }
+
+
+def profile_duration(profile: Dict[str, Any]) -> float:
+    return profile["ramp_up_s"] + profile["hold_s"]
+
+
+def offered_qps(profile: Dict[str, Any], t: float) -> float:
+    '''t 초 시점의 목표 도착률'''
+    if t < profile["ramp_up_s"]:
+        ratio = t / profile["ramp_up_s"]
+        return profile["start_qps"] + (profile["target_qps"] - profile["start_qps"]) * ratio
+    return profile["target_qps"]
+
+
+def iter_arrivals(profile: Dict[str, Any]) -> Iterator[float]:
+    '''
+    요청 도착 시각(시작 기준 초) 스트림.
+    open-loop: 응답 완료와 무관하게 프로파일의 도착률로만 결정됩니다.
+    '''
+    rng = random.Random(profile["seed"])
+    duration = profile_duration(profile)
+    t = 0.0
+    while True:
+        rate = max(offered_qps(profile, t), MIN_QPS)
+        t += rng.expovariate(rate) if profile["arrival"] == "poisson" else 1.0 / rate
+        if t >= duration:
+            return
+        yield t
+
+
+def _cycle_keywords(path: str) -> Iterator[str]:
+    '''키워드 스풀을 끝까지 읽으면 처음부터 반복'''
+    while True:
+        count = 0
+        for keyword in iter_spooled_keywords(path):
+            count += 1
+            yield keyword
+        if not count:
+            return
+
+
+# =====================================================
+# Worker Process
+# =====================================================
+class _Bucket:
+    '''워커 내부 1초 구간 집계 (도착 예정 시각 기준)'''
+
+    def __init__(self):
+        self.sent = 0
+        self.ok = 0
+        self.errors = 0
+        self.dropped = 0
+        self.latency = LatencyHistogram()
+        self.service = LatencyHistogram()
+
+    def to_message(self, system: str, second: int) -> Dict[str, Any]:
+        return {
+            "system": system, "second": second, "sent": self.sent, "ok": self.ok,
+            "errors": self.errors, "dropped": self.dropped,
+            "latency": self.latency.to_dict(), "service": self.service.to_dict(),
+        }
+
+
+def _worker_main(
+        worker: int,
+        n_workers: int,
+        configs: Dict[str, Dict[str, Any]],
+        keyword_path: str,
+        profile: Dict[str, Any],
+        max_in_flight: int,
+        timeout: float,
+        start_at: float,
+        out_queue,
+        stop_event
+) -> None:
+    '''
+    부하 생성 워커 (별도 프로세스). 전체 도착 스트림 중 worker 번째 몫(i % n_workers)만 보냅니다.
+
+    지연시간은 실제 전송 시각이 아니라 도착 예정 시각부터 측정합니다. 클라이언트가 밀려
+    전송이 늦어진 시간도 포함되므로 coordinated omission 으로 꼬리 지연이 가려지지 않습니다.
+    동시 요청이 max_in_flight 를 넘으면 기다리지 않고 dropped 로 셉니다. (open-loop 유지)
+    '''
+    sessions = {
+        system: ApiSession(
+            config["url"], config["method"], config["keyword_param"], config.get("headers"),
+            config.get("body_params"), pool_size=max_in_flight, max_retries=0,
+            http2=config.get("http2", False), timeout=timeout, query_params=config.get("query_params")
+        )
+        for system, config in configs.items()
+    }
+    executors = {
+        system: ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix=f"load-{system}")
+        for system in configs
+    }
+    slots = {system: threading.BoundedSemaphore(max_in_flight) for system in configs}
+    buckets: Dict[tuple, _Bucket] = {}
+    lock = threading.Lock()
+
+    def bucket(system: str, second: int) -> _Bucket:
+        key = (system, second)
+        if key not in buckets:
+            buckets[key] = _Bucket()
+        return buckets[key]
+
+    def call(system: str, keyword: str, due: float, second: int) -> None:
+        try:
+            result = sessions[system].call(keyword)
+            latency_ms = (time.time() - due) * 1000
+            with lock:
+                b = bucket(system, second)
+                if result["success"]:
+                    b.ok += 1
+                    b.latency.record(latency_ms)
+                    b.service.record(result.get("latency_ms"))
+                else:
+                    b.errors += 1
+        finally:
+            slots[system].release()
+
+    def report() -> None:
+        with lock:
+            messages = [b.to_message(system, second) for (system, second), b in buckets.items()]
+            buckets.clear()
+        for message in messages:
+            out_queue.put(("bucket", message))
+
+    keywords = _cycle_keywords(keyword_path)
+    last_report = time.monotonic()
+    try:
+        for i, offset in enumerate(iter_arrivals(profile)):
+            keyword = next(keywords, None)
+            if keyword is None or stop_event.is_set():
+                break
+            if i % n_workers != worker:
+                continue
+
+            due = start_at + offset
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            second = int(offset)
+            for system in configs:
+                if slots[system].acquire(blocking=False):
+                    with lock:
+                        bucket(system, second).sent += 1
+                    executors[system].submit(call, system, keyword, due, second)
+                else:
+                    with lock:
+                        bucket(system, second).dropped += 1
+
+            if time.monotonic() - last_report >= REPORT_INTERVAL_S:
+                report()
+                last_report = time.monotonic()
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=stop_event.is_set())
+        for session in sessions.values():
+            session.close()
+        report()
+        out_queue.put(("done", worker))
+
+
+class _LineWriter:
+    '''워커 → 부모 보고 채널 (stdout 에 JSON 한 줄씩)'''
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def put(self, item) -> None:
+        line = json.dumps(item, ensure_ascii=False)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+def _worker_entry() -> None:
+    '''
+    `python -m utils.load_test` 진입점. 첫 줄로 워커 설정(JSON)을 받고,
+    다음 줄(중지 요청) 또는 EOF(부모 종료)를 받으면 중지합니다.
+    '''
+    spec = json.loads(sys.stdin.readline())
+    stop_event = threading.Event()
+
+    def watch_stdin():
+        sys.stdin.readline()
+        stop_event.set()
+
+    threading.Thread(target=watch_stdin, daemon=True).start()
+    _worker_main(**spec, out_queue=_LineWriter(sys.stdout), stop_event=stop_event)
+
+
+# =====================================================
+# Aggregation
+# =====================================================
+class LoadTimeline:
+    '''워커 집계를 시스템 × 초 단위로 합친 시계열'''
+
+    def __init__(self, profile: Dict[str, Any]):
+        self.profile = profile
+        self._buckets: Dict[tuple, Dict[str, Any]] = {}
+
+    def merge(self, message: Dict[str, Any]) -> None:
+        key = (message["system"], message["second"])
+        if key not in self._buckets:
+            self._buckets[key] = {
+                "sent": 0, "ok": 0, "errors": 0, "dropped": 0,
+                "latency": LatencyHistogram(), "service": LatencyHistogram(),
+            }
+        b = self._buckets[key]
+        for field in ("sent", "ok", "errors", "dropped"):
+            b[field] += message[field]
+        b["latency"].merge(LatencyHistogram.from_dict(message["latency"]))
+        b["service"].merge(LatencyHistogram.from_dict(message["service"]))
+
+    def rows(self) -> List[Dict[str, Any]]:
+        '''[{"system", "second", "offered_qps", "throughput", "error_rate", "drop_rate", "p50", "p90", "p99", ...}]'''
+        rows = []
+        for (system, second), b in sorted(self._buckets.items()):
+            attempted = b["sent"] + b["dropped"]
+            completed = b["ok"] + b["errors"]
+            rows.append({
+                "system": system,
+                "second": second,
+                "offered_qps": offered_qps(self.profile, second + 0.5),
+                "sent": b["sent"],
+                "dropped": b["dropped"],
+                "throughput": b["ok"],
+                "error_rate": b["errors"] / completed if completed else None,
+                "drop_rate": b["dropped"] / attempted if attempted else None,
+                "p50": b["latency"].percentile(50),
+                "p90": b["latency"].percentile(90),
+                "p99": b["latency"].percentile(99),
+                "service_p50": b["service"].percentile(50),
+            })
+        return rows
+
+    def summary(self, system: str) -> Dict[str, Any]:
+        '''시스템 전체 구간 합계'''
+        latency = LatencyHistogram()
+        totals = {"sent": 0, "ok": 0, "errors": 0, "dropped": 0}
+        for (s, _), b in self._buckets.items():
+            if s != system:
+                continue
+            latency.merge(b["latency"])
+            for field in totals:
+                totals[field] += b[field]
+        return {**totals, "latency": latency.summary()}
+
+
+def find_saturation(rows: List[Dict[str, Any]], system: str) -> Optional[Dict[str, Any]]:
+    '''
+    포화 지점 탐지. 아래 중 하나가 SATURATION_WINDOW 구간 연속으로 유지되는 첫 구간을 반환합니다.
+    - 클라이언트 동시 요청 한도 초과로 버려진 비율 > SATURATION_DROP_RATE
+    - 오류율 > SATURATION_ERROR_RATE
+    - p99 > 초기 구간 p99 의 SATURATION_P99_FACTOR 배
+    포화가 없으면 None.
+    '''
+    series = [r for r in rows if r["system"] == system and r["p99"] is not None]
+    if not series:
+        return None
+    baseline = sorted(r["p99"] for r in series[:3])[len(series[:3]) // 2]
+
+    streak = []
+    for r in series:
+        reasons = []
+        if (r["drop_rate"] or 0) > SATURATION_DROP_RATE:
+            reasons.append("동시 요청 한도 초과")
+        if (r["error_rate"] or 0) > SATURATION_ERROR_RATE:
+            reasons.append("오류율 증가")
+        if r["p99"] > baseline * SATURATION_P99_FACTOR:
+            reasons.append(f"p99 {SATURATION_P99_FACTOR:g}배 이상 증가")
+        streak = streak + [(r, reasons)] if reasons else []
+        if len(streak) >= SATURATION_WINDOW:
+            first, first_reasons = streak[0]
+            return {
+                "second": first["second"],
+                "offered_qps": first["offered_qps"],
+                "throughput": first["throughput"],
+                "p99": first["p99"],
+                "baseline_p99": baseline,
+                "reasons": first_reasons,
+            }
+    return None
+
+
+# =====================================================
+# Runner
+# =====================================================
+def run_load_test(
+        configs: Dict[str, Dict[str, Any]],
+        keyword_path: str,
+        profile: Dict[str, Any],
+        workers: int = DEFAULT_WORKERS,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        timeout: float = DEFAULT_TIMEOUT,
+        on_update=None,
+        cancel_event: Optional[threading.Event] = None
+) -> LoadTimeline:
+    '''
+    여러 워커 프로세스로 부하 테스트 실행. 파이썬 클라이언트(GIL)가 병목이 되지 않도록
+    도착 스트림을 워커 수만큼 나눠 각 프로세스가 독립적으로 보냅니다.
+
+    워커는 multiprocessing 이 아니라 `python -m utils.load_test` 하위 프로세스로 띄웁니다.
+    Streamlit 은 페이지 스크립트를 __main__ 으로 등록하므로 spawn 방식이면
+    워커마다 앱 스크립트가 다시 실행되기 때문입니다.
+
+    - configs: 부하를 줄 시스템별 API 설정 (각 시스템이 같은 도착률을 받음)
+    - on_update(timeline, elapsed_s): 워커 보고를 합친 뒤 REPORT_INTERVAL_S 간격으로 호출
+    - cancel_event: set 되면 워커에 중지를 알리고 진행 중인 요청만 마친 뒤 반환
+    '''
+    start_at = time.time() + STARTUP_DELAY_S
+    timeline = LoadTimeline(profile)
+    messages: "queue.Queue" = queue.Queue()
+    root = Path(__file__).resolve().parent.parent
+
+    def read_output(worker: int, process: subprocess.Popen) -> None:
+        for line in process.stdout:
+            messages.put(json.loads(line))
+        messages.put(["exit", worker])
+
+    processes = []
+    for w in range(workers):
+        process = subprocess.Popen(
+            [sys.executable, "-m", "utils.load_test"],
+            cwd=root, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8"
+        )
+        spec = {
+            "worker": w, "n_workers": workers, "configs": configs, "keyword_path": str(Path(keyword_path).resolve()),
+            "profile": profile, "max_in_flight": max_in_flight, "timeout": timeout, "start_at": start_at,
+        }
+        process.stdin.write(json.dumps(spec, ensure_ascii=False) + "\n")
+        process.stdin.flush()
+        threading.Thread(target=read_output, args=(w, process), daemon=True).start()
+        processes.append(process)
+
+    def stop_workers() -> None:
+        for process in processes:
+            try:
+                process.stdin.write("stop\n")
+                process.stdin.close()
+            except (BrokenPipeError, OSError, ValueError):
+                pass
+
+    remaining = workers
+    last_update = 0.0
+    stopped = False
+    try:
+        while remaining:
+            if not stopped and cancel_event is not None and cancel_event.is_set():
+                stop_workers()
+                stopped = True
+            try:
+                kind, payload = messages.get(timeout=REPORT_INTERVAL_S)
+            except queue.Empty:
+                continue
+            if kind == "exit":
+                remaining -= 1
+            elif kind == "bucket":
+                timeline.merge(payload)
+            if on_update and time.monotonic() - last_update >= REPORT_INTERVAL_S:
+                on_update(timeline, max(0.0, time.time() - start_at))
+                last_update = time.monotonic()
+    finally:
+        if not stopped:
+            stop_workers()
+        for process in processes:
+            try:
+                process.wait(timeout=max(timeout, 1.0) + 5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    if on_update:
+        on_update(timeline, max(0.0, time.time() - start_at))
+    return timeline
+
+
+if __name__ == "__main__":
+    _worker_entry()
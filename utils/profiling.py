@@ -0,0 +1,381 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+TRACE_DIR = ".cache/traces"
+MAX_TRACE_EVENTS = 200_000  # 넘으면 이후 span 은 집계에만 반영 (trace 파일 크기 제한)
+COUNTER_INTERVAL = 0.1  # 카운터(큐 깊이) 이벤트 최소 간격 (초, 이름별)
+SAMPLE_INTERVAL = 0.01  # 샘플링 프로파일러 간격 (초)
+PROFILE_TOP = 20
+
+PROFILE_CPROFILE = "cprofile"
+PROFILE_SAMPLING = "sampling"
+PROFILE_MODES = (PROFILE_CPROFILE, PROFILE_SAMPLING)
+
+_local = threading.local()
+# cProfile 은 프로세스에 하나만 켤 수 있으므로 (Python 3.12+ 는 sys.monitoring 기반) 사용 중 여부를 잠금으로 관리
+_cprofile_lock = threading.Lock()
+
+
+# =====================================================
+# Tracer
+# =====================================================
+class Tracer:
+    '''
+    실행 1건의 단계별 span / 카운터 수집기 (스레드 안전).
+
+    span 은 단계 이름별로 횟수·합계·최대 시간을 항상 집계하고, 이벤트는 MAX_TRACE_EVENTS 건까지만
+    보관합니다. 카운터는 단계 사이 큐 깊이 같은 순간값으로, 이름별 COUNTER_INTERVAL 마다 이벤트를 남깁니다.
+    export() 는 Chrome trace 형식(chrome://tracing, Perfetto 에서 열림) JSON 파일을 씁니다.
+
+        with tracer.span("parse.A"):
+            parsed = parser.extract(data)
+        tracer.count("queue.http.A", len(pending))
+    '''
+
+    def __init__(self, name: str, max_events: int = MAX_TRACE_EVENTS):
+        self.name = name
+        self.max_events = max_events
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.dropped = 0
+        self.profile: Optional[Dict[str, Any]] = None
+        self._origin = time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._stages: Dict[str, List[float]] = {}  # 이름 → [횟수, 합계, 최대]
+        self._counters: Dict[str, List[float]] = {}  # 이름 → [마지막 값, 최대, 합계, 횟수, 마지막 이벤트 시각]
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _ts(self, perf: float) -> float:
+        return round((perf - self._origin) * 1e6, 1)
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter() - start, args)
+
+    def add_span(self, name: str, start: float, duration: float, args: Optional[Dict[str, Any]] = None) -> None:
+        '''start: time.perf_counter() 기준 시작 시각, duration: 초'''
+        thread = threading.current_thread()
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                self._stages[name] = [1, duration, duration]
+            else:
+                stage[0] += 1
+                stage[1] += duration
+                stage[2] = max(stage[2], duration)
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._threads.setdefault(thread.ident, thread.name)
+            event = {
+                "name": name, "cat": name.split(".", 1)[0], "ph": "X",
+                "ts": self._ts(start), "dur": round(duration * 1e6, 1), "pid": os.getpid(), "tid": thread.ident,
+            }
+            if args:
+                event["args"] = args
+            self._events.append(event)
+
+    def call(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        '''fn(*args) 를 span 으로 감싸 실행 (스레드 풀 submit 용)'''
+        with self.span(name):
+            return fn(*args)
+
+    def iterate(self, name: str, iterable: Iterable[Any]) -> Iterator[Any]:
+        '''항목마다 다음 항목을 꺼내는 시간을 span 으로 기록하는 이터레이터 (키워드 읽기 등)'''
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.add_span(name, start, time.perf_counter() - start)
+            yield item
+
+    def count(self, name: str, value: float) -> None:
+        '''카운터 순간값 기록 (큐 깊이 등)'''
+        now = time.perf_counter()
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = [value, value, 0.0, 0, -COUNTER_INTERVAL]
+            counter[0] = value
+            counter[1] = max(counter[1], value)
+            counter[2] += value
+            counter[3] += 1
+            if now - counter[4] < COUNTER_INTERVAL or len(self._events) >= self.max_events:
+                return
+            counter[4] = now
+            self._events.append({
+                "name": name, "ph": "C", "ts": self._ts(now), "pid": os.getpid(), "args": {"value": value},
+            })
+
+    def finish(self) -> None:
+        self.finished_at = time.time()
+
+    def summary(self) -> Dict[str, Any]:
+        '''
+        {"name", "wall_s", "stages": [...], "counters": [...], "events", "dropped", "profile"}
+        stages 는 합계 시간 순이며, concurrency 는 합계 / 실행 시간 (그 단계가 평균 몇 개 동시에 돌았는지)입니다.
+        '''
+        wall = (self.finished_at or time.time()) - self.started_at
+        with self._lock:
+            stages = [
+                {
+                    "stage": name, "count": int(count), "total_s": total, "mean_ms": total / count * 1000,
+                    "max_ms": longest * 1000, "concurrency": total / wall if wall > 0 else None,
+                }
+                for name, (count, total, longest) in self._stages.items()
+            ]
+            counters = [
+                {"counter": name, "last": last, "max": peak, "mean": total / n if n else None}
+                for name, (last, peak, total, n, _) in self._counters.items()
+            ]
+            events = len(self._events)
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "wall_s": wall,
+            "stages": sorted(stages, key=lambda stage: stage["total_s"], reverse=True),
+            "counters": sorted(counters, key=lambda counter: counter["counter"]),
+            "events": events,
+            "dropped": self.dropped,
+            "profile": self.profile,
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.name}}] + [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms", "otherData": self.summary()}
+
+    def export(self, directory: str = TRACE_DIR) -> str:
+        '''Chrome trace JSON 파일로 저장. 반환: 파일 경로'''
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        path = trace_path(self.name, directory)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+        return path
+
+
+class NullTracer:
+    '''추적 중이 아닐 때 쓰는 아무것도 기록하지 않는 Tracer'''
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        yield
+
+    def add_span(self, name: str, start: float, duration: float, args: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+    def call(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        return fn(*args)
+
+    def iterate(self, name: str, iterable: Iterable[Any]) -> Iterable[Any]:
+        return iterable
+
+    def count(self, name: str, value: float) -> None:
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+def current_tracer():
+    '''이 스레드에서 활성화된 Tracer (없으면 NULL_TRACER). 스레드 풀 작업에는 인자로 넘겨야 함'''
+    return getattr(_local, "tracer", None) or NULL_TRACER
+
+
+def trace_path(name: str, directory: str = TRACE_DIR) -> str:
+    return str(Path(directory) / f"{name}.trace.json")
+
+
+def list_traces(prefix: str, directory: str = TRACE_DIR) -> List[str]:
+    '''prefix 로 시작하는 저장된 trace 이름 목록 (이름순, 숫자는 크기순: shard-200 < shard-1000)'''
+    suffix = ".trace.json"
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        (name[:-len(suffix)] for name in os.listdir(directory) if name.startswith(prefix) and name.endswith(suffix)),
+        key=lambda name: [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name[len(prefix):])]
+    )
+
+
+def load_trace_summary(name: str, directory: str = TRACE_DIR) -> Optional[Dict[str, Any]]:
+    '''저장된 trace 파일의 요약 (otherData). 파일이 없으면 None'''
+    path = trace_path(name, directory)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("otherData")
+
+
+# =====================================================
+# Profilers
+# =====================================================
+class SamplingProfiler:
+    '''
+    모든 스레드의 호출 스택을 SAMPLE_INTERVAL 마다 샘플링하는 프로파일러.
+    여러 작업이 동시에 켜도 되고 (cProfile 은 프로세스에 하나), 호출마다 훅을 걸지 않아 오버헤드가 작습니다.
+    결과는 flamegraph.pl / speedscope 에서 여는 collapsed stack 텍스트와 상위 함수 목록입니다.
+    '''
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Dict[str, int] = {}
+        self._leaves: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                # 스레드 풀 스레드는 이름 뒤 번호를 떼어 하나로 합침 (batch-A_0, batch-A_1 → batch-A)
+                thread = names.get(ident, str(ident)).rsplit("_", 1)[0]
+                key = ";".join([thread] + stack[::-1])
+                self._stacks[key] = self._stacks.get(key, 0) + 1
+                self._leaves[stack[0]] = self._leaves.get(stack[0], 0) + 1
+                self.samples += 1
+
+    def stop(self, path: str) -> Dict[str, Any]:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        with open(path, "w", encoding="utf-8") as f:
+            for key, count in self._stacks.items():
+                f.write(f"{key} {count}\n")
+        top = sorted(self._leaves.items(), key=lambda item: item[1], reverse=True)[:PROFILE_TOP]
+        return {
+            "mode": PROFILE_SAMPLING, "path": path, "samples": self.samples,
+            "top": [{"function": name, "samples": count, "share": count / self.samples} for name, count in top],
+        }
+
+
+class ProfilerBusy(RuntimeError):
+    '''이 프로세스에서 이미 다른 cProfile(또는 프로파일링 도구)이 켜져 있음'''
+
+
+class CProfileProfiler:
+    '''
+    cProfile. 결과는 pstats 파일 (snakeviz 등) + 누적 시간 상위 함수 목록.
+
+    Python 3.12 이상에서 cProfile 은 sys.monitoring 기반이라 켠 스레드만이 아니라 프로세스 전체를 측정합니다
+    (다른 작업, Streamlit 렌더링 스레드 포함). 프로세스에 하나만 켤 수 있어 이미 켜져 있으면 start() 가
+    ProfilerBusy 를 냅니다.
+    '''
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self) -> "CProfileProfiler":
+        if not _cprofile_lock.acquire(blocking=False):
+            raise ProfilerBusy("다른 작업이 cProfile 을 사용 중입니다.")
+        try:
+            self._profile.enable()
+        except ValueError as e:  # 외부 프로파일러 / 디버거가 이미 켜져 있음
+            _cprofile_lock.release()
+            raise ProfilerBusy(str(e)) from e
+        return self
+
+    def stop(self, path: str) -> Dict[str, Any]:
+        try:
+            self._profile.disable()
+        finally:
+            _cprofile_lock.release()
+        self._profile.dump_stats(path)
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+        return {
+            "mode": PROFILE_CPROFILE, "path": path,
+            "top": [
+                {
+                    "function": f"{name} ({os.path.basename(filename)}:{line})",
+                    "calls": calls, "total_s": total_time, "cumulative_s": cumulative,
+                }
+                for (filename, line, name), (_, calls, total_time, cumulative, _) in rows
+            ],
+        }
+
+
+def _profile_path(name: str, mode: str, directory: str) -> str:
+    suffix = "prof" if mode == PROFILE_CPROFILE else "collapsed.txt"
+    return str(Path(directory) / f"{name}.{suffix}")
+
+
+def _start_profiler(profile: str):
+    '''
+    프로파일러 시작. 반환: (프로파일러, 실제 모드, 메모 또는 None).
+    cProfile 이 이미 사용 중이면 실패시키지 않고 샘플링 프로파일러로 대신합니다.
+    '''
+    if profile == PROFILE_CPROFILE:
+        try:
+            return CProfileProfiler().start(), PROFILE_CPROFILE, None
+        except ProfilerBusy as e:
+            return SamplingProfiler().start(), PROFILE_SAMPLING, f"cProfile 사용 불가 ({e}) → 샘플링으로 대체"
+    return SamplingProfiler().start(), PROFILE_SAMPLING, None
+
+
+# =====================================================
+# Traced Section
+# =====================================================
+@contextmanager
+def traced(name: str, profile: Optional[str] = None, directory: str = TRACE_DIR) -> Iterator[Tracer]:
+    '''
+    이 스레드에서 Tracer 를 활성화하고 (current_tracer), 끝나면 trace 파일을 저장합니다.
+    profile 이 "cprofile" | "sampling" 이면 구간 동안 프로파일러도 켜고 결과를 같은 폴더에 저장합니다.
+    cProfile 은 프로세스에 하나뿐이라, 동시에 요청한 다른 구간은 샘플링으로 대체하고 그 사실을 profile["note"] 에 남깁니다.
+    '''
+    if profile is not None and profile not in PROFILE_MODES:
+        raise ValueError(f"지원하지 않는 프로파일러: {profile}")
+    tracer = Tracer(name)
+    previous = getattr(_local, "tracer", None)
+    _local.tracer = tracer
+    profiler, mode, note = _start_profiler(profile) if profile else (None, None, None)
+    try:
+        yield tracer
+    finally:
+        _local.tracer = previous
+        tracer.finish()
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        if profiler:
+            tracer.profile = profiler.stop(_profile_path(name, mode, directory))
+            if note:
+                tracer.profile["note"] = note
+        tracer.export(directory)
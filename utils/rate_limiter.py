@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    '''
+    토큰 버킷 QPS 제한기.
+
+    rate(초당 토큰)만큼 토큰이 채워지고 burst 개까지 누적됩니다.
+    burst 기본값은 1로, 어느 1초 구간에서도 QPS 예산을 넘지 않습니다.
+    rate <= 0 이면 제한하지 않습니다.
+    '''
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = float(rate)
+        self.capacity = float(burst or 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        '''토큰 1개 획득 (부족하면 대기). 대기했으면 True 반환'''
+        if self.rate <= 0:
+            return False
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+            return True
+        return False
+
+
+class AimdController:
+    '''
+    AIMD(Additive Increase / Multiplicative Decrease) 동시성 제어기.
+
+    정상 응답마다 한도를 1/limit 씩 늘리고(한 윈도우당 +increase),
+    429 응답 또는 최근 p95 지연이 target_p95_ms 를 넘으면 한도를 decrease 배로 줄입니다.
+    감소는 현재 한도만큼의 응답이 더 완료된 뒤에만 다시 일어납니다.
+    '''
+
+    def __init__(
+            self,
+            max_limit: int,
+            min_limit: int = 1,
+            target_p95_ms: Optional[float] = None,
+            increase: float = 1.0,
+            decrease: float = 0.5,
+            window: int = 100
+    ):
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.target_p95_ms = target_p95_ms or None
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._latencies = deque(maxlen=window)
+        self._since_decrease = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        '''동시 요청 슬롯 획득 (한도 초과 시 대기)'''
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency_ms: float, status: Optional[int]) -> None:
+        '''슬롯 반환 + 응답 결과로 한도 조정'''
+        with self._cond:
+            self.in_flight -= 1
+            self._latencies.append(latency_ms)
+            self._since_decrease += 1
+
+            overloaded = status == 429
+            if not overloaded and self.target_p95_ms and len(self._latencies) >= 20:
+                overloaded = self.p95() > self.target_p95_ms
+
+            if overloaded:
+                if self._since_decrease >= int(self.limit):
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._since_decrease = 0
+            else:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+
+            self._cond.notify_all()
+
+    def p95(self) -> float:
+        '''최근 윈도우의 p95 지연 (ms)'''
+        with self._cond:
+            if not self._latencies:
+                return 0.0
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class EndpointLimiter:
+    '''엔드포인트 단위 QPS 제한 + 동시성 제어 + 실행 통계'''
+
+    def __init__(
+            self,
+            max_concurrency: int,
+            max_qps: float = 0,
+            target_p95_ms: Optional[float] = None
+    ):
+        self.bucket = TokenBucket(max_qps)
+        self.controller = AimdController(max_concurrency, target_p95_ms=target_p95_ms)
+        self.completed = 0
+        self.throttled = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        '''
+        요청 1건 실행 구간. 사용 예)
+          with limiter.slot() as s:
+              result = session.call(keyword)
+              s["status"] = result["status"]
+        '''
+        self.controller.acquire()
+        waited = self.bucket.acquire()
+        info = {"status": None}
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.controller.release(latency_ms, info["status"])
+            with self._lock:
+                self.completed += 1
+                if waited:
+                    self.throttled += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        '''실행 중 통계 (달성 QPS, 제한 대기 건수, in-flight, 현재 동시성 한도)'''
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        return {
+            "qps": self.completed / elapsed,
+            "throttled": self.throttled,
+            "in_flight": self.controller.in_flight,
+            "limit": int(self.controller.limit),
+            "p95_ms": self.controller.p95(),
+        }
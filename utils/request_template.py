@@ -0,0 +1,179 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Set, Union
+from urllib.parse import quote_plus
+
+KEYWORD_VARIABLE = "kw"
+_PLACEHOLDER = re.compile(r"\{\{\s*([^{}\s]+)\s*\}\}")
+_JSON_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+_MARKER = "\x1eTPL\x1e"  # 직렬화 중 변수 자리 표시 (템플릿 문자열에 나오면 오류)
+_MARKER_SLOT = re.compile(re.escape(json.dumps(_MARKER)[1:-1]) + r"(\d+)" + re.escape(json.dumps(_MARKER)[1:-1]))
+
+
+class TemplateError(ValueError):
+    '''잘못된 요청 템플릿'''
+
+
+# =====================================================
+# Placeholder 탐색
+# =====================================================
+def template_variables(value: Any) -> Set[str]:
+    '''중첩 dict / list 의 문자열 값에 있는 {{변수}} 이름 (키는 템플릿 대상이 아님)'''
+    if isinstance(value, str):
+        return set(_PLACEHOLDER.findall(value))
+    if isinstance(value, Mapping):
+        return set().union(*(template_variables(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(template_variables(v) for v in value)) if value else set()
+    return set()
+
+
+def has_placeholders(value: Any) -> bool:
+    return bool(template_variables(value))
+
+
+def keyword_values(keyword: str) -> Dict[str, str]:
+    '''키워드 1건의 템플릿 변수 값: {"kw": 키워드, CSV 컬럼: 값, ...}'''
+    fields = getattr(keyword, "fields", None)
+    return {**fields, KEYWORD_VARIABLE: keyword} if fields else {KEYWORD_VARIABLE: keyword}
+
+
+def _json_fragment(value: Any) -> bytes:
+    '''JSON 문자열 리터럴 안에 들어갈 값 (따옴표 제외). 이스케이프가 필요 없는 값은 그대로 인코딩'''
+    text = value if isinstance(value, str) else str(value)
+    if _JSON_ESCAPE.search(text):
+        text = json.dumps(text, ensure_ascii=False)[1:-1]
+    return text.encode("utf-8")
+
+
+# =====================================================
+# JSON Body
+# =====================================================
+class JsonBodyTemplate:
+    '''
+    JSON Body 템플릿. 컴파일 시 한 번 직렬화해 [정적 바이트, 변수, 정적 바이트, ...] 조각으로 나눠두고,
+    호출마다 변수 자리만 채워 이어 붙입니다 (dict 복사 / json.dumps 없음).
+
+    변수는 문자열 값 안에서만 쓸 수 있고 항상 문자열로 들어갑니다.
+        {"query": {"match": {"title": "{{kw}}"}}, "filter": {"term": {"category": "{{category}}"}}}
+    '''
+
+    def __init__(self, body: Any):
+        self.variables: List[str] = []
+        marked = self._mark(body)
+        text = json.dumps(marked, ensure_ascii=False, separators=(",", ":"))
+        pieces = _MARKER_SLOT.split(text)
+        self._static = [piece.encode("utf-8") for piece in pieces[0::2]]
+        self._slots = [self.variables[int(index)] for index in pieces[1::2]]
+
+    def _mark(self, value: Any) -> Any:
+        if isinstance(value, str):
+            if _MARKER in value:
+                raise TemplateError("템플릿에 사용할 수 없는 문자가 있습니다.")
+            return _PLACEHOLDER.sub(self._slot, value)
+        if isinstance(value, Mapping):
+            return {key: self._mark(v) for key, v in value.items()}
+        if isinstance(value, list):
+            return [self._mark(v) for v in value]
+        return value
+
+    def _slot(self, match) -> str:
+        self.variables.append(match.group(1))
+        return f"{_MARKER}{len(self.variables) - 1}{_MARKER}"
+
+    def render(self, values: Mapping[str, Any]) -> bytes:
+        if not self._slots:
+            return self._static[0]
+        parts = [self._static[0]]
+        for name, static in zip(self._slots, self._static[1:]):
+            parts.append(_json_fragment(values.get(name, "")))
+            parts.append(static)
+        return b"".join(parts)
+
+
+# =====================================================
+# URL Query
+# =====================================================
+class QueryTemplate:
+    '''URL 쿼리 템플릿. 정적 부분은 컴파일 시 URL 인코딩해두고 변수 값만 호출마다 인코딩합니다.'''
+
+    def __init__(self, params: Mapping[str, Any]):
+        self._parts: List[Union[str, tuple]] = []
+        for i, (name, value) in enumerate(params.items()):
+            prefix = ("&" if i else "") + quote_plus(str(name)) + "="
+            text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+            pieces = _PLACEHOLDER.split(text)
+            self._parts.append(prefix + quote_plus(pieces[0]))
+            for variable, static in zip(pieces[1::2], pieces[2::2]):
+                self._parts.append((variable,))
+                self._parts.append(quote_plus(static))
+        self.variables = [part[0] for part in self._parts if isinstance(part, tuple)]
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        return "".join(
+            quote_plus(str(values.get(part[0], ""))) if isinstance(part, tuple) else part
+            for part in self._parts
+        )
+
+
+# =====================================================
+# Request
+# =====================================================
+class RequestTemplate:
+    '''
+    시스템 1개의 요청 템플릿 (URL 쿼리 + POST JSON Body). 시스템마다 한 번 컴파일합니다.
+
+    쿼리 파라미터나 Body 에 {{변수}} 가 하나라도 있으면 템플릿 그대로 보내고,
+    없으면 기존처럼 keyword_param 에 키워드를 넣습니다 (GET: 쿼리, POST: Body 최상위 필드).
+    '''
+
+    def __init__(
+            self,
+            url: str,
+            method: str,
+            keyword_param: str,
+            query_params: Optional[Mapping[str, Any]] = None,
+            body_params: Optional[Mapping[str, Any]] = None
+    ):
+        query = dict(query_params or {})
+        body = dict(body_params or {}) if method == "POST" else None
+        if not has_placeholders(query) and not has_placeholders(body):
+            target = query if method == "GET" else body
+            target[keyword_param] = "{{" + KEYWORD_VARIABLE + "}}"
+
+        self.url = url
+        self._separator = "&" if "?" in url else "?"
+        self.query = QueryTemplate(query) if query else None
+        self.body = JsonBodyTemplate(body) if body is not None else None
+        self.variables = set(self.query.variables if self.query else ()) | set(self.body.variables if self.body else ())
+
+    def render_url(self, values: Mapping[str, Any]) -> str:
+        return self.url + self._separator + self.query.render(values) if self.query else self.url
+
+    def render_body(self, values: Mapping[str, Any]) -> Optional[bytes]:
+        return self.body.render(values) if self.body else None
+
+
+def compile_request_template(
+        url: str,
+        method: str,
+        keyword_param: str,
+        query_params: Optional[Mapping[str, Any]] = None,
+        body_params: Optional[Mapping[str, Any]] = None
+) -> RequestTemplate:
+    '''같은 설정은 한 번만 컴파일 (세션 없이 호출하는 API 테스트용)'''
+    return _compile_cached(
+        url, method, keyword_param,
+        json.dumps(query_params, ensure_ascii=False) if query_params else None,
+        json.dumps(body_params, ensure_ascii=False) if body_params else None
+    )
+
+
+@lru_cache(maxsize=64)
+def _compile_cached(url, method, keyword_param, query_json, body_json) -> RequestTemplate:
+    return RequestTemplate(
+        url, method, keyword_param,
+        json.loads(query_json) if query_json else None,
+        json.loads(body_json) if body_json else None
+    )
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.result_store import sqlite_journal_mode
+
+DEFAULT_CACHE_PATH = ".cache/responses.sqlite3"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 200_000
+EVICT_EVERY = 1000
+
+
+class ResponseCache:
+    '''
+    SQLite 기반 응답 캐시 (TTL + 크기 제한 LRU).
+
+    키는 요청 내용(Endpoint, Method, 헤더, Body, 키워드)의 해시이고,
+    값은 JSON 직렬화 가능한 dict 입니다. 하나의 커넥션을 락으로 공유하므로
+    배치 실행의 여러 스레드에서 동시에 사용해도 됩니다.
+    저널은 결과 저장소와 같이 sqlite_journal_mode 로 정합니다 (네트워크 파일시스템이면 WAL 을 쓰지 않음).
+    '''
+
+    def __init__(
+            self,
+            path: str = DEFAULT_CACHE_PATH,
+            table: str = "responses",
+            ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+            max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.journal_mode = sqlite_journal_mode(path)
+        self._conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.journal_mode == "WAL":
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table}(accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        '''요청 구성요소로 콘텐츠 주소 키 생성'''
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        '''캐시 조회 (만료된 항목은 삭제 후 None)'''
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        '''캐시 저장 (EVICT_EVERY 건마다 LRU 정리)'''
+        now = time.time()
+        raw = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, raw, now, now)
+            )
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        '''만료 항목 삭제 + max_entries 초과분을 오래 사용되지 않은 순으로 삭제'''
+        if self.ttl_seconds:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+
+    def clear(self) -> None:
+        '''전체 캐시 삭제'''
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        '''캐시 항목 수 / 적중 / 미적중'''
+        with self._lock:
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {"entries": count, "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache(maxsize=None)
+def get_response_cache(path: str = DEFAULT_CACHE_PATH) -> ResponseCache:
+    '''프로세스 공용 응답 캐시 (Streamlit 세션 간 공유)'''
+    return ResponseCache(path)
@@ -0,0 +1,714 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from utils.keyword_loader import shuffle_spool
+from utils.profiling import current_tracer
+
+DEFAULT_STORE_PATH = ".cache/results.sqlite3"
+RUN_KEYWORD_DIR = ".cache/runs"
+FLUSH_EVERY = 500
+FLUSH_INTERVAL = 2.0
+# WAL 은 같은 호스트의 공유 메모리(-shm)로 동기화하므로 이 파일시스템에서는 롤백 저널(DELETE)을 씀
+NETWORK_FILESYSTEMS = {
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "9p", "afs", "ceph", "glusterfs", "lustre", "gpfs", "fuse.sshfs",
+}
+
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_CANCELLED = "cancelled"
+
+# 이전 버전 저장소에 없는 컬럼 (열 때 추가)
+_ADDED_COLUMNS = {
+    "records": {
+        "connect_ms": "REAL", "ttfb_ms": "REAL", "bytes": "INTEGER", "retries": "INTEGER", "finished_at": "REAL",
+        "payload": "BLOB",
+    },
+    "verdicts": {"auto": "INTEGER NOT NULL DEFAULT 0"},
+    "runs": {"fingerprint": "TEXT"},
+}
+# 판정 설정(judge_fingerprint)별로 나눠 보관하는 테이블. 이전 버전 저장소의 판정은 judge = '' 로 옮겨짐
+_JUDGE_SCOPED_TABLES = ("verdicts", "matches", "pairings")
+LATENCY_PAGE_SIZE = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    keyword_path TEXT NOT NULL,
+    config TEXT NOT NULL,
+    fingerprint TEXT
+);
+CREATE TABLE IF NOT EXISTS records (
+    run_id TEXT NOT NULL,
+    system TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    status INTEGER,
+    latency_ms REAL,
+    cached INTEGER NOT NULL DEFAULT 0,
+    parsed TEXT,
+    data TEXT,
+    error TEXT,
+    connect_ms REAL,
+    ttfb_ms REAL,
+    bytes INTEGER,
+    retries INTEGER,
+    finished_at REAL,
+    payload BLOB,
+    PRIMARY KEY (run_id, system, idx)
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    run_id TEXT NOT NULL,
+    judge TEXT NOT NULL DEFAULT '',
+    idx INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    winner TEXT,
+    score_a REAL,
+    score_b REAL,
+    reason TEXT,
+    cached INTEGER NOT NULL DEFAULT 0,
+    auto INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, judge, idx)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    run_id TEXT NOT NULL,
+    judge TEXT NOT NULL DEFAULT '',
+    system_a TEXT NOT NULL,
+    system_b TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    winner TEXT,
+    score_a REAL,
+    score_b REAL,
+    reason TEXT,
+    cached INTEGER NOT NULL DEFAULT 0,
+    auto INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, judge, system_a, system_b, idx)
+);
+CREATE TABLE IF NOT EXISTS pairings (
+    run_id TEXT NOT NULL,
+    judge TEXT NOT NULL DEFAULT '',
+    round INTEGER NOT NULL,
+    system_a TEXT NOT NULL,
+    system_b TEXT NOT NULL,
+    PRIMARY KEY (run_id, judge, round, system_a, system_b)
+);
+CREATE INDEX IF NOT EXISTS records_keyword ON records (run_id, system, keyword);
+"""
+
+
+def sqlite_journal_mode(path: str) -> str:
+    '''
+    SQLite 파일 path 에 맞는 journal_mode. 네트워크 파일시스템(NETWORK_FILESYSTEMS)이면 "DELETE", 아니면 "WAL".
+    파일시스템은 /proc/mounts 에서 가장 긴 마운트 지점으로 찾으며, 알 수 없으면(비 Linux 등) "WAL" 입니다.
+    '''
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return "WAL"
+    target = os.path.realpath(path)
+    fs_type, longest = None, -1
+    for mount_point, kind in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (target == mount_point or target.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > longest:
+            fs_type, longest = kind, len(mount_point)
+    return "DELETE" if fs_type in NETWORK_FILESYSTEMS else "WAL"
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def _loads(text: Optional[str]) -> Any:
+    return None if text is None else json.loads(text)
+
+
+class ResultStore:
+    '''
+    실행(run) 결과 저장소 (SQLite, append-only 로 기록).
+
+    키워드별 호출 결과(records)와 판정 결과(verdicts)를 (run_id, system, idx) 키로 저장합니다.
+    시스템이 3개 이상인 실행의 토너먼트 판정은 쌍별로 matches 에, 라운드별 대진은 pairings 에 저장합니다.
+    matches 의 winner 는 verdicts 와 같이 쌍 안의 위치("A" = system_a, "B" = system_b) 기준입니다.
+    판정(verdicts / matches / pairings)은 판정 설정 식별자 judge 별로 따로 보관하므로, 공유된 실행을
+    다른 판정 백엔드 / 모델 / 방식으로 판정해도 서로의 결과를 덮거나 건너뛰지 않습니다.
+    같은 키 재기록은 덮어쓰므로 재시도/재개 시에도 중복이 생기지 않습니다.
+    결과 페이지는 필요한 범위만 조회하므로 대규모 실행도 서버 메모리에 올라가지 않습니다.
+
+    저널은 sqlite_journal_mode 로 정합니다 (로컬 디스크 WAL, 네트워크 파일시스템 DELETE).
+    분산 워커가 여러 머신에서 기록하려면 저장소가 파일 잠금을 지원하는 공유 파일시스템에 있어야 합니다.
+    '''
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.journal_mode = sqlite_journal_mode(path)
+        self._conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.journal_mode == "WAL":
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            for column, kind in columns.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+        self._scope_by_judge()
+        # 추가 컬럼 인덱스는 마이그레이션 후에 생성
+        self._conn.execute("CREATE INDEX IF NOT EXISTS runs_fingerprint ON runs (fingerprint, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS verdicts_judge_winner ON verdicts (run_id, judge, winner)")
+        self._conn.commit()
+
+    def _scope_by_judge(self) -> None:
+        '''judge 컬럼이 없는 이전 버전 판정 테이블을 (judge 포함) 기본 키로 다시 만듦. 기존 판정은 judge = '''''
+        for table in _JUDGE_SCOPED_TABLES:
+            columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+            if "judge" in columns:
+                continue
+            self._conn.execute(f"ALTER TABLE {table} RENAME TO {table}_unscoped")
+            self._conn.executescript(_SCHEMA)
+            names = ", ".join(columns)
+            self._conn.execute(f"INSERT INTO {table} ({names}) SELECT {names} FROM {table}_unscoped")
+            self._conn.execute(f"DROP TABLE {table}_unscoped")
+        self._conn.executescript(_SCHEMA)
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _execute(self, sql: str, params: Tuple = ()) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    # ----------------------------- runs
+    def create_run(
+            self,
+            run_id: str,
+            keyword_path: str,
+            total: int,
+            config: Dict[str, Any],
+            fingerprint: Optional[str] = None,
+            shuffle_seed: Optional[int] = None
+    ) -> None:
+        '''
+        실행 등록. 키워드 스풀은 실행 전용 사본으로 보관 (재개용).
+        사본 경로는 절대 경로로 기록하므로 작업 디렉터리가 다른 워커도 같은 파일을 읽습니다 (공유 시 같은 경로에 마운트).
+        fingerprint 는 같은 키워드 × 설정 실행을 찾기 위한 키입니다 (find_run).
+        shuffle_seed 를 주면 사본의 키워드 순서를 섞어 idx 순서가 무작위가 됩니다 (순차 검정 조기 종료용).
+        '''
+        Path(RUN_KEYWORD_DIR).mkdir(parents=True, exist_ok=True)
+        run_keyword_path = str(Path(RUN_KEYWORD_DIR).resolve() / f"{run_id}.keywords.jsonl")
+        if shuffle_seed is None:
+            shutil.copyfile(keyword_path, run_keyword_path)
+        else:
+            shuffle_spool(keyword_path, run_keyword_path, shuffle_seed)
+        self._execute(
+            "INSERT OR REPLACE INTO runs (run_id, created_at, status, total, keyword_path, config, fingerprint) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (run_id, time.time(), RUN_RUNNING, total, run_keyword_path, _dumps(config), fingerprint)
+        )
+
+    def find_run(self, fingerprint: str, status: str = RUN_COMPLETED, since: float = 0.0) -> Optional[Dict[str, Any]]:
+        '''fingerprint 가 같은 가장 최근 실행 (since 이후 생성, 상태 일치)'''
+        rows = self._query(
+            "SELECT run_id FROM runs WHERE fingerprint = ? AND status = ? AND created_at >= ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (fingerprint, status, since)
+        )
+        return self.get_run(rows[0][0]) if rows else None
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT run_id, created_at, status, total, keyword_path, config, fingerprint FROM runs WHERE run_id = ?",
+            (run_id,)
+        )
+        if not rows:
+            return None
+        run_id, created_at, status, total, keyword_path, config, fingerprint = rows[0]
+        return {
+            "run_id": run_id, "created_at": created_at, "status": status,
+            "total": total, "keyword_path": keyword_path, "config": _loads(config), "fingerprint": fingerprint,
+        }
+
+    def set_run_status(self, run_id: str, status: str) -> None:
+        self._execute("UPDATE runs SET status = ? WHERE run_id = ?", (status, run_id))
+
+    # ----------------------------- records
+    def writer(self, run_id: str) -> "RecordWriter":
+        return RecordWriter(self, run_id)
+
+    def write_records(self, rows: List[Tuple]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records "
+                "(run_id, system, idx, keyword, success, status, latency_ms, cached, parsed, data, error, "
+                "connect_ms, ttfb_ms, bytes, retries, finished_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def done_indices(self, run_id: str, system: str, start: int = 0, stop: Optional[int] = None) -> Set[int]:
+        '''이미 기록된 키워드 인덱스 (재개 시 건너뜀). start / stop 으로 샤드 범위만 조회'''
+        if stop is None:
+            rows = self._query(
+                "SELECT idx FROM records WHERE run_id = ? AND system = ? AND idx >= ?", (run_id, system, start)
+            )
+        else:
+            rows = self._query(
+                "SELECT idx FROM records WHERE run_id = ? AND system = ? AND idx >= ? AND idx < ?",
+                (run_id, system, start, stop)
+            )
+        return {row[0] for row in rows}
+
+    def summary(self, run_id: str) -> Dict[str, Dict[str, int]]:
+        '''시스템별 완료/성공/캐시 적중 건수'''
+        rows = self._query(
+            "SELECT system, COUNT(*), SUM(success), SUM(cached) FROM records WHERE run_id = ? GROUP BY system",
+            (run_id,)
+        )
+        return {
+            system: {"done": done, "success": success or 0, "cached": cached or 0}
+            for system, done, success, cached in rows
+        }
+
+    def system_stats(self, run_id: str, system: str) -> Dict[str, Any]:
+        '''
+        시스템별 집계: 완료/성공/캐시 적중/재시도 건수, 평균 응답 크기·커넥션 수립 시간,
+        첫 기록 ~ 마지막 기록 시각 (캐시 응답 제외)
+        '''
+        row = self._query(
+            "SELECT COUNT(*), SUM(success), SUM(cached), SUM(retries), AVG(bytes), AVG(connect_ms), "
+            "MIN(CASE WHEN cached = 0 THEN finished_at END), MAX(CASE WHEN cached = 0 THEN finished_at END) "
+            "FROM records WHERE run_id = ? AND system = ?",
+            (run_id, system)
+        )[0]
+        return {
+            "done": row[0], "success": row[1] or 0, "cached": row[2] or 0, "retries": row[3] or 0,
+            "mean_bytes": row[4], "mean_connect_ms": row[5], "first_at": row[6], "last_at": row[7],
+        }
+
+    def iter_latencies(self, run_id: str, system: str, field: str = "latency_ms") -> Iterator[float]:
+        '''
+        캐시 응답을 제외한 성공 호출의 시간 값 스트림 (field: latency_ms / ttfb_ms / connect_ms).
+        LATENCY_PAGE_SIZE 건씩 idx 순으로 끊어 읽으므로 대규모 실행도 메모리에 올리지 않습니다.
+        '''
+        if field not in ("latency_ms", "ttfb_ms", "connect_ms"):
+            raise ValueError(f"지원하지 않는 필드: {field}")
+        last_idx = -1
+        while True:
+            rows = self._query(
+                f"SELECT idx, {field} FROM records WHERE run_id = ? AND system = ? AND idx > ? "
+                f"AND success = 1 AND cached = 0 ORDER BY idx LIMIT ?",
+                (run_id, system, last_idx, LATENCY_PAGE_SIZE)
+            )
+            if not rows:
+                return
+            for _, value in rows:
+                if value is not None:
+                    yield value
+            last_idx = rows[-1][0]
+
+    def latency_diffs(
+            self,
+            run_id: str,
+            systems: Tuple[str, str] = ("A", "B"),
+            limit: int = 100,
+            order: str = "abs"
+    ) -> List[Dict[str, Any]]:
+        '''
+        키워드별 A/B 지연시간 차이 (B - A, ms). 두 시스템 모두 네트워크 호출에 성공한 키워드만.
+        order: "abs" (차이 큰 순) / "slower_b" (B 가 느린 순) / "slower_a" (A 가 느린 순)
+        '''
+        order_by = {"abs": "ABS(diff) DESC", "slower_b": "diff DESC", "slower_a": "diff ASC"}[order]
+        rows = self._query(
+            "SELECT a.idx, a.keyword, a.latency_ms, b.latency_ms, b.latency_ms - a.latency_ms AS diff, "
+            "a.ttfb_ms, b.ttfb_ms "
+            "FROM records a JOIN records b ON b.run_id = a.run_id AND b.idx = a.idx AND b.system = ? "
+            "WHERE a.run_id = ? AND a.system = ? AND a.success = 1 AND b.success = 1 "
+            "AND a.cached = 0 AND b.cached = 0 "
+            f"ORDER BY {order_by} LIMIT ?",
+            (systems[1], run_id, systems[0], limit)
+        )
+        return [
+            {"idx": idx, "keyword": keyword, "latency_a": la, "latency_b": lb, "diff": diff,
+             "ttfb_a": ta, "ttfb_b": tb}
+            for idx, keyword, la, lb, diff, ta, tb in rows
+        ]
+
+    def iter_pairs(
+            self,
+            run_id: str,
+            systems: Tuple[str, str] = ("A", "B"),
+            offset: int = 0,
+            limit: int = -1,
+            unjudged_only: bool = False,
+            start_idx: int = 0,
+            with_data: bool = False,
+            matches: bool = False,
+            judge: str = ""
+    ) -> Iterator[Dict[str, Any]]:
+        '''
+        idx 순으로 A/B 결과 쌍 조회 (두 시스템 모두 기록된 키워드만).
+        전체 응답(data)은 무거우므로 with_data=True 일 때만 포함합니다. (개별 조회는 load_record)
+        unjudged_only=True 면 A/B 모두 호출 성공했고 판정 설정 judge 의 판정이 아직 없거나 판정 오류(winner 없음)인
+        쌍만 조회합니다. 오류 판정은 다시 판정해 덮어쓰므로, 일시적인 백엔드 장애는 재개하면 복구됩니다.
+        matches=True 면 verdicts 대신 토너먼트 판정(matches)의 해당 쌍 결과를 붙입니다.
+        '''
+        where, params = "AND a.idx >= ? ", [start_idx]
+        if unjudged_only:
+            where += _JUDGE_PENDING
+        yield from self._select_pairs(
+            run_id, systems, where, params, "a.idx", limit, offset, with_data, matches, judge
+        )
+
+    def count_pairs(
+            self,
+            run_id: str,
+            pair_filter: str = "all",
+            search: str = "",
+            systems: Tuple[str, str] = ("A", "B"),
+            matches: bool = False,
+            judge: str = ""
+    ) -> int:
+        '''필터/검색 조건에 맞는 결과 쌍 수 (판정 필터는 판정 설정 judge 기준)'''
+        where, params = _pair_where(pair_filter, search)
+        return self._query(
+            "SELECT COUNT(*) " + _pair_from(matches) + where,
+            (systems[1], judge, run_id, systems[0], *params)
+        )[0][0]
+
+    def pending_judge_count(
+            self,
+            run_id: str,
+            systems: Tuple[str, str] = ("A", "B"),
+            matches: bool = False,
+            judge: str = ""
+    ) -> int:
+        '''판정할 쌍 수 (iter_pairs(unjudged_only=True) 대상: 미판정 + 판정 오류)'''
+        return self._query(
+            "SELECT COUNT(*) " + _pair_from(matches) + _JUDGE_PENDING,
+            (systems[1], judge, run_id, systems[0])
+        )[0][0]
+
+    def query_pairs(
+            self,
+            run_id: str,
+            pair_filter: str = "all",
+            search: str = "",
+            sort: str = "idx",
+            descending: bool = False,
+            offset: int = 0,
+            limit: int = 50,
+            systems: Tuple[str, str] = ("A", "B"),
+            matches: bool = False,
+            judge: str = ""
+    ) -> List[Dict[str, Any]]:
+        '''
+        결과 뷰어용 페이지 조회. 응답 전체(data)는 포함하지 않습니다.
+        - pair_filter: PAIR_FILTERS 중 하나 ("A" / "B" 승, "tie", "error" = 호출 실패·판정 오류, "unjudged")
+        - search: 키워드 부분 일치
+        - sort: PAIR_SORTS 중 하나
+        - judge: 붙일 판정의 판정 설정 식별자
+        '''
+        where, params = _pair_where(pair_filter, search)
+        order = f"{PAIR_SORTS[sort]} {'DESC' if descending else 'ASC'}, a.idx"
+        return list(self._select_pairs(
+            run_id, systems, where, params, order, limit, offset, matches=matches, judge=judge
+        ))
+
+    def _select_pairs(
+            self,
+            run_id: str,
+            systems: Tuple[str, str],
+            where: str,
+            params: List[Any],
+            order: str,
+            limit: int,
+            offset: int,
+            with_data: bool = False,
+            matches: bool = False,
+            judge: str = ""
+    ) -> Iterator[Dict[str, Any]]:
+        data_columns = "a.data, b.data " if with_data else "NULL, NULL "
+        sql = (
+            "SELECT a.idx, a.keyword, a.success, a.status, a.latency_ms, a.cached, a.parsed, a.error, "
+            "b.success, b.status, b.latency_ms, b.cached, b.parsed, b.error, "
+            "v.winner, v.reason, " + data_columns + _pair_from(matches) + where +
+            f"ORDER BY {order} LIMIT ? OFFSET ?"
+        )
+        for row in self._query(sql, (systems[1], judge, run_id, systems[0], *params, limit, offset)):
+            a, b = _record(row[1], *row[2:8]), _record(row[1], *row[8:14])
+            if with_data:
+                a["data"], b["data"] = _loads(row[16]), _loads(row[17])
+            yield {"idx": row[0], "keyword": row[1], "a": a, "b": b, "winner": row[14], "reason": row[15]}
+
+    def load_record(self, run_id: str, system: str, idx: int) -> Optional[Dict[str, Any]]:
+        '''
+        키워드 1건의 전체 응답 포함 결과 조회.
+        스트리밍 모드 결과는 샘플로 보관된 압축 원문(payload)이 있을 때만 data 가 채워집니다.
+        '''
+        rows = self._query(
+            "SELECT keyword, success, status, latency_ms, cached, parsed, error, data, payload "
+            "FROM records WHERE run_id = ? AND system = ? AND idx = ?",
+            (run_id, system, idx)
+        )
+        if not rows:
+            return None
+        record = _record(*rows[0][:7])
+        data, payload = rows[0][7], rows[0][8]
+        record["data"] = _loads(data if payload is None else zlib.decompress(payload).decode("utf-8"))
+        record["payload_stored"] = data is not None or payload is not None
+        return record
+
+    def iter_records(self, run_id: str, system: str, with_data: bool = False) -> Iterator[Dict[str, Any]]:
+        '''시스템 1개의 전체 결과를 idx 순으로 LATENCY_PAGE_SIZE 건씩 끊어 읽는 스트림 (내보내기용)'''
+        data_column = "data" if with_data else "NULL"
+        last_idx = -1
+        while True:
+            rows = self._query(
+                "SELECT idx, keyword, success, status, latency_ms, cached, parsed, error, "
+                f"connect_ms, ttfb_ms, bytes, retries, {data_column} "
+                "FROM records WHERE run_id = ? AND system = ? AND idx > ? ORDER BY idx LIMIT ?",
+                (run_id, system, last_idx, LATENCY_PAGE_SIZE)
+            )
+            if not rows:
+                return
+            for row in rows:
+                record = {"idx": row[0], **_record(*row[1:8])}
+                record.update(zip(("connect_ms", "ttfb_ms", "bytes", "retries"), row[8:12]))
+                if with_data:
+                    record["data"] = _loads(row[12])
+                yield record
+            last_idx = rows[-1][0]
+
+    # ----------------------------- verdicts
+    def write_verdicts(self, run_id: str, verdicts: List[Dict[str, Any]], judge: str = "") -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO verdicts "
+                "(run_id, judge, idx, keyword, winner, score_a, score_b, reason, cached, auto) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, judge, v["idx"], v["keyword"], v["winner"], v.get("score_a"), v.get("score_b"),
+                     v.get("reason"), int(bool(v.get("cached"))), int(bool(v.get("auto"))))
+                    for v in verdicts
+                ]
+            )
+            self._conn.commit()
+
+    def verdict_counts(self, run_id: str, judge: str = "") -> Dict[str, int]:
+        '''판정 설정 judge 의 승자별 판정 건수 ("A" / "B" / "tie" / "error")'''
+        rows = self._query(
+            "SELECT COALESCE(winner, 'error'), COUNT(*) FROM verdicts WHERE run_id = ? AND judge = ? GROUP BY 1",
+            (run_id, judge)
+        )
+        return dict(rows)
+
+    def iter_verdicts(self, run_id: str, matches: bool = False, judge: str = "") -> Iterator[Dict[str, Any]]:
+        '''판정 설정 judge 의 판정 결과 전체 (matches=True 면 토너먼트 쌍별 판정, system_a / system_b / round 포함)'''
+        if matches:
+            sql = ("SELECT idx, keyword, winner, score_a, score_b, reason, cached, auto, system_a, system_b, round "
+                   "FROM matches WHERE run_id = ? AND judge = ? ORDER BY round, system_a, system_b, idx")
+        else:
+            sql = ("SELECT idx, keyword, winner, score_a, score_b, reason, cached, auto "
+                   "FROM verdicts WHERE run_id = ? AND judge = ? ORDER BY idx")
+        for row in self._query(sql, (run_id, judge)):
+            verdict = dict(zip(("idx", "keyword", "winner", "score_a", "score_b", "reason"), row[:6]))
+            verdict["cached"], verdict["auto"] = bool(row[6]), bool(row[7])
+            if matches:
+                verdict.update(zip(("system_a", "system_b", "round"), row[8:]))
+            yield verdict
+
+    def judge_savings(self, run_id: str, matches: bool = False, judge: str = "") -> Dict[str, int]:
+        '''판정 건수 중 LLM 호출 없이 확정된 건수 (auto: 판정 전 단계 자동 무승부, cached: 판정 캐시)'''
+        table = "matches" if matches else "verdicts"
+        total, auto, cached = self._query(
+            f"SELECT COUNT(*), SUM(auto), SUM(cached) FROM {table} WHERE run_id = ? AND judge = ?", (run_id, judge)
+        )[0]
+        return {"total": total, "auto": auto or 0, "cached": cached or 0}
+
+    def judgeable_count(self, run_id: str, systems: Tuple[str, str] = ("A", "B")) -> int:
+        '''A/B 모두 호출 성공한 키워드 수 (판정 대상)'''
+        return self._query(
+            "SELECT COUNT(*) FROM records a JOIN records b "
+            "ON b.run_id = a.run_id AND b.idx = a.idx AND b.system = ? "
+            "WHERE a.run_id = ? AND a.system = ? AND a.success = 1 AND b.success = 1",
+            (systems[1], run_id, systems[0])
+        )[0][0]
+
+    # ----------------------------- tournament
+    def write_matches(
+            self,
+            run_id: str,
+            systems: Tuple[str, str],
+            round_no: int,
+            verdicts: List[Dict[str, Any]],
+            judge: str = ""
+    ) -> None:
+        '''토너먼트 쌍(systems) 판정 기록. winner 는 쌍 안의 위치 기준 ("A" / "B" / "tie" / None)'''
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO matches "
+                "(run_id, judge, system_a, system_b, idx, round, keyword, winner, score_a, score_b, reason, "
+                "cached, auto) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, judge, systems[0], systems[1], v["idx"], round_no, v["keyword"], v["winner"],
+                     v.get("score_a"), v.get("score_b"), v.get("reason"),
+                     int(bool(v.get("cached"))), int(bool(v.get("auto"))))
+                    for v in verdicts
+                ]
+            )
+            self._conn.commit()
+
+    def match_summary(self, run_id: str, judge: str = "") -> List[Dict[str, Any]]:
+        '''판정 설정 judge 의 쌍별 판정 집계 [{"system_a", "system_b", "a", "b", "tie", "error"}, ...]'''
+        rows = self._query(
+            "SELECT system_a, system_b, SUM(winner = 'A'), SUM(winner = 'B'), SUM(winner = 'tie'), "
+            "SUM(winner IS NULL) FROM matches WHERE run_id = ? AND judge = ? GROUP BY system_a, system_b",
+            (run_id, judge)
+        )
+        return [
+            {"system_a": x, "system_b": y, "a": a or 0, "b": b or 0, "tie": tie or 0, "error": error or 0}
+            for x, y, a, b, tie, error in rows
+        ]
+
+    def get_pairings(self, run_id: str, judge: str = "") -> Dict[int, List[Tuple[str, str]]]:
+        '''판정 설정 judge 의 라운드별 대진 {라운드: [(system_a, system_b), ...]}'''
+        pairings: Dict[int, List[Tuple[str, str]]] = {}
+        for round_no, x, y in self._query(
+                "SELECT round, system_a, system_b FROM pairings WHERE run_id = ? AND judge = ? ORDER BY round, rowid",
+                (run_id, judge)
+        ):
+            pairings.setdefault(round_no, []).append((x, y))
+        return pairings
+
+    def set_pairings(self, run_id: str, round_no: int, pairs: List[Tuple[str, str]], judge: str = "") -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO pairings (run_id, judge, round, system_a, system_b) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, judge, round_no, x, y) for x, y in pairs]
+            )
+            self._conn.commit()
+
+
+_PAIR_FROM = (
+    "FROM records a JOIN records b ON b.run_id = a.run_id AND b.idx = a.idx AND b.system = ? "
+    "LEFT JOIN verdicts v ON v.run_id = a.run_id AND v.judge = ? AND v.idx = a.idx "
+    "WHERE a.run_id = ? AND a.system = ? "
+)
+_MATCH_PAIR_FROM = (
+    "FROM records a JOIN records b ON b.run_id = a.run_id AND b.idx = a.idx AND b.system = ? "
+    "LEFT JOIN matches v ON v.run_id = a.run_id AND v.judge = ? AND v.system_a = a.system AND v.system_b = b.system "
+    "AND v.idx = a.idx "
+    "WHERE a.run_id = ? AND a.system = ? "
+)
+
+
+def _pair_from(matches: bool) -> str:
+    return _MATCH_PAIR_FROM if matches else _PAIR_FROM
+
+_PAIR_FILTERS = {
+    "all": "",
+    "A": "AND v.winner = 'A' ",
+    "B": "AND v.winner = 'B' ",
+    "tie": "AND v.winner = 'tie' ",
+    "error": "AND (a.success = 0 OR b.success = 0 OR (v.idx IS NOT NULL AND v.winner IS NULL)) ",
+    "unjudged": "AND a.success = 1 AND b.success = 1 AND v.idx IS NULL ",
+}
+PAIR_FILTERS = tuple(_PAIR_FILTERS)
+# 판정 작업이 판정할 쌍: 미판정 + 판정 오류 (재판정 결과로 덮어씀)
+_JUDGE_PENDING = "AND a.success = 1 AND b.success = 1 AND (v.idx IS NULL OR v.winner IS NULL) "
+PAIR_SORTS = {
+    "idx": "a.idx",
+    "keyword": "a.keyword",
+    "latency_a": "a.latency_ms",
+    "latency_b": "b.latency_ms",
+    "latency_diff": "(b.latency_ms - a.latency_ms)",
+}
+
+
+def _pair_where(pair_filter: str, search: str) -> Tuple[str, List[Any]]:
+    if pair_filter not in _PAIR_FILTERS:
+        raise ValueError(f"지원하지 않는 필터: {pair_filter}")
+    where, params = _PAIR_FILTERS[pair_filter], []
+    if search:
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        where += "AND a.keyword LIKE ? ESCAPE '\\' "
+        params.append(f"%{escaped}%")
+    return where, params
+
+
+def _record(keyword, success, status, latency_ms, cached, parsed, error) -> Dict[str, Any]:
+    record = {
+        "keyword": keyword,
+        "success": bool(success),
+        "status": status,
+        "latency_ms": latency_ms,
+        "cached": bool(cached),
+    }
+    if parsed is not None:
+        record["parsed"] = _loads(parsed)
+    if error is not None:
+        record["error"] = error
+    return record
+
+
+class RecordWriter:
+    '''
+    결과 배치 기록기. add() 로 쌓아두었다가 FLUSH_EVERY 건 또는 FLUSH_INTERVAL 초마다
+    한 트랜잭션으로 기록합니다. with 블록을 벗어나면 남은 결과를 모두 기록합니다.
+    '''
+
+    def __init__(self, store: ResultStore, run_id: str):
+        self.store = store
+        self.run_id = run_id
+        self._buffer: List[Tuple] = []
+        self._last_flush = time.monotonic()
+
+    def add(self, system: str, idx: int, record: Dict[str, Any]) -> None:
+        self._buffer.append((
+            self.run_id, system, idx, record["keyword"], int(bool(record["success"])),
+            record.get("status"), record.get("latency_ms"), int(bool(record.get("cached"))),
+            _dumps(record.get("parsed")), _dumps(record.get("data")), record.get("error"),
+            record.get("connect_ms"), record.get("ttfb_ms"), record.get("bytes"), record.get("retries"),
+            time.time(), record.get("payload")
+        ))
+        current_tracer().count("queue.store", len(self._buffer))
+        if len(self._buffer) >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            with current_tracer().span("store.write", rows=len(self._buffer)):
+                self.store.write_records(self._buffer)
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+@lru_cache(maxsize=None)
+def get_result_store(path: str = DEFAULT_STORE_PATH) -> ResultStore:
+    '''프로세스 공용 결과 저장소'''
+    return ResultStore(path)
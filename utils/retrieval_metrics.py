@@ -0,0 +1,240 @@
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_K = 10
+DEFAULT_RBO_P = 0.9
+ID_FIELDS = ("id", "doc_id", "_id", "url", "link")
+PAD = -1
+MAX_CELLS_PER_CHUNK = 1 << 24  # (행 × k × k) 비교 행렬 크기 상한
+METRICS_PAGE_SIZE = 10000
+
+
+# =====================================================
+# Interning / Packing
+# =====================================================
+def item_key(item: Any) -> str:
+    '''
+    결과 항목 1개의 식별 문자열.
+    dict 이면 ID_FIELDS 중 첫 번째로 있는 필드, 없으면 정렬된 JSON 전체를 사용합니다.
+    '''
+    if isinstance(item, dict):
+        for field in ID_FIELDS:
+            if item.get(field) is not None:
+                return str(item[field])
+        return json.dumps(item, sort_keys=True, ensure_ascii=False)
+    if isinstance(item, (list, tuple)):
+        return json.dumps(item, sort_keys=True, ensure_ascii=False)
+    return str(item)
+
+
+def as_result_list(parsed: Any) -> List[Any]:
+    '''파싱 결과를 순위 목록으로 변환 (단일 값은 1개짜리 목록, None 은 빈 목록)'''
+    if parsed is None:
+        return []
+    if isinstance(parsed, list):
+        return parsed
+    return [parsed]
+
+
+class IdInterner:
+    '''결과 항목 식별 문자열 → 정수 id (실행 전체에서 공유)'''
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def intern(self, key: str) -> int:
+        item_id = self._ids.get(key)
+        if item_id is None:
+            item_id = self._ids[key] = len(self._ids)
+        return item_id
+
+    def pack(self, lists: Sequence[Sequence[Any]], k: int) -> np.ndarray:
+        '''
+        순위 목록들을 (n, k) int64 배열로 변환. 항목은 정수 id 로 바뀌고,
+        같은 목록 안의 중복 항목은 첫 순위만 남기며, 빈 칸은 PAD(-1) 입니다.
+        '''
+        packed = np.full((len(lists), k), PAD, dtype=np.int64)
+        for row, items in enumerate(lists):
+            seen = set()
+            col = 0
+            for item in items:
+                if col >= k:
+                    break
+                item_id = self.intern(item_key(item))
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                packed[row, col] = item_id
+                col += 1
+        return packed
+
+
+# =====================================================
+# Batch Metrics
+# =====================================================
+def _match(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    '''(n, k, k) 일치 행렬: m[r, i, j] = a[r, i] 와 b[r, j] 가 같은 항목'''
+    return (a[:, :, None] == b[:, None, :]) & (a[:, :, None] != PAD)
+
+
+def _chunk_rows(k: int) -> int:
+    return max(1, MAX_CELLS_PER_CHUNK // (k * k))
+
+
+def _metrics_chunk(a: np.ndarray, b: np.ndarray, p: float) -> Dict[str, np.ndarray]:
+    n, k = a.shape
+    match = _match(a, b)
+    len_a = (a != PAD).sum(axis=1)
+    len_b = (b != PAD).sum(axis=1)
+    inter = match.any(axis=2).sum(axis=1)
+
+    # overlap@k, Jaccard
+    overlap = inter / k
+    union = len_a + len_b - inter
+    jaccard = np.divide(inter, union, out=np.ones(n), where=union > 0)
+
+    # RBO (extrapolated, Webber et al. 2010): 깊이 d 까지의 교집합 크기 X_d 를 목록 길이 l 까지 사용.
+    # 길이가 다르면 짧은 목록의 빈 칸을 불일치로 봅니다.
+    depth = np.arange(1, k + 1)
+    agreement_size = match.cumsum(axis=1).cumsum(axis=2)[:, depth - 1, depth - 1]
+    agreement = agreement_size / depth
+    length = np.maximum(np.maximum(len_a, len_b), 1)
+    weights = np.where(depth[None, :] <= length[:, None], p ** depth, 0.0)
+    tail = agreement_size[np.arange(n), length - 1] / length * p ** length
+    rbo = tail + (1 - p) / p * (agreement * weights).sum(axis=1)
+    rbo[(len_a == 0) & (len_b == 0)] = 1.0
+
+    # Kendall tau: 공통 항목들의 상대 순서 일치도 (공통 항목 2개 미만이면 nan)
+    pos_b = np.where(match.any(axis=2), match.argmax(axis=2), -1)
+    common = pos_b >= 0
+    upper = np.triu(np.ones((k, k), dtype=bool), 1)
+    pair = common[:, :, None] & common[:, None, :] & upper
+    concordant = (pair & (pos_b[:, :, None] < pos_b[:, None, :])).sum(axis=(1, 2))
+    discordant = (pair & (pos_b[:, :, None] > pos_b[:, None, :])).sum(axis=(1, 2))
+    pairs = concordant + discordant
+    kendall = np.divide(concordant - discordant, pairs, out=np.full(n, np.nan), where=pairs > 0)
+
+    identical = (a == b).all(axis=1)
+    return {
+        "overlap": overlap,
+        "jaccard": jaccard,
+        "rbo": rbo,
+        "kendall_tau": kendall,
+        "identical": identical,
+        "ndcg_b_vs_a": ndcg(b, a),
+        "ndcg_a_vs_b": ndcg(a, b),
+    }
+
+
+def ndcg(ranked: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    '''
+    reference 순위를 정답 등급으로 본 ranked 의 nDCG@k.
+    reference 의 i 번째 항목 등급은 (k - i) / k, 없는 항목은 0 입니다. reference 가 비면 nan.
+    '''
+    n, k = ranked.shape
+    match = _match(ranked, reference)
+    found = match.any(axis=2)
+    gain = np.where(found, (k - match.argmax(axis=2)) / k, 0.0)
+    discount = 1.0 / np.log2(np.arange(2, k + 2))
+    dcg = (gain * discount).sum(axis=1)
+
+    len_ref = (reference != PAD).sum(axis=1)
+    ideal_gain = (k - np.arange(k)) / k * discount
+    idcg = np.where(np.arange(k)[None, :] < len_ref[:, None], ideal_gain[None, :], 0.0).sum(axis=1)
+    return np.divide(dcg, idcg, out=np.full(n, np.nan), where=idcg > 0)
+
+
+def compute_metrics(a: np.ndarray, b: np.ndarray, p: float = DEFAULT_RBO_P) -> Dict[str, np.ndarray]:
+    '''
+    (n, k) 로 패킹된 A/B 순위 배열에 대해 키워드별 지표를 한 번에 계산.
+    반환: {"overlap", "jaccard", "rbo", "kendall_tau", "identical", "ndcg_b_vs_a", "ndcg_a_vs_b"} → (n,) 배열.
+    비교 행렬이 (n × k × k) 이므로 행을 MAX_CELLS_PER_CHUNK 기준으로 나눠 계산합니다.
+    '''
+    n, k = a.shape
+    if n == 0:
+        return {name: np.empty(0) for name in
+                ("overlap", "jaccard", "rbo", "kendall_tau", "identical", "ndcg_b_vs_a", "ndcg_a_vs_b")}
+    step = _chunk_rows(k)
+    chunks = [_metrics_chunk(a[i:i + step], b[i:i + step], p) for i in range(0, n, step)]
+    return {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]}
+
+
+def judge_ndcg(metrics: Dict[str, np.ndarray], winners: Sequence[Optional[str]]) -> np.ndarray:
+    '''
+    판정 결과를 정답으로 본 nDCG: 판정에서 진 시스템의 순위를 이긴 시스템의 순위에 대해 평가합니다.
+    (A 승 → B vs A, B 승 → A vs B, 무승부 → 1, 판정 없음 → nan)
+    '''
+    winners = np.asarray([w or "" for w in winners])
+    return np.select(
+        [winners == "A", winners == "B", winners == "tie"],
+        [metrics["ndcg_b_vs_a"], metrics["ndcg_a_vs_b"], np.ones(len(winners))],
+        default=np.nan
+    )
+
+
+def summarize(metrics: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    '''지표별 평균 (nan 제외) + 동일 결과 키워드 수'''
+    summary = {"count": int(len(metrics["identical"])), "identical": int(metrics["identical"].sum())}
+    for name, values in metrics.items():
+        if name == "identical":
+            continue
+        valid = values[~np.isnan(values)]
+        summary[name] = float(valid.mean()) if len(valid) else None
+    return summary
+
+
+# =====================================================
+# Run Metrics
+# =====================================================
+def compute_run_metrics(
+        store,
+        run_id: str,
+        k: int = DEFAULT_K,
+        p: float = DEFAULT_RBO_P,
+        systems=("A", "B"),
+        matches: bool = False,
+        judge: str = ""
+) -> Dict[str, Any]:
+    '''
+    실행(run) 결과의 파싱 목록 전체에 대한 지표 계산.
+    두 시스템 모두 호출에 성공하고 파싱 결과가 있는 키워드만 대상이며,
+    METRICS_PAGE_SIZE 건씩 읽어 패킹합니다. 반환: {"idx", "keyword", "winner", <지표들>, "judge_ndcg"}
+    matches=True 면 판정 결과(winner)를 토너먼트 판정(matches)의 해당 쌍에서 가져옵니다.
+    judge 는 판정 결과를 가져올 판정 설정 식별자 (JudgeEngine.fingerprint) 입니다.
+    '''
+    interner = IdInterner()
+    idx, keywords, winners, chunks = [], [], [], []
+    start_idx = 0
+    while True:
+        pairs = list(store.iter_pairs(
+            run_id, systems, limit=METRICS_PAGE_SIZE, start_idx=start_idx, matches=matches,
+            judge=judge
+        ))
+        if not pairs:
+            break
+        start_idx = pairs[-1]["idx"] + 1
+        pairs = [
+            pair for pair in pairs
+            if pair["a"]["success"] and pair["b"]["success"] and "parsed" in pair["a"] and "parsed" in pair["b"]
+        ]
+        if not pairs:
+            continue
+        a = interner.pack([as_result_list(pair["a"]["parsed"]) for pair in pairs], k)
+        b = interner.pack([as_result_list(pair["b"]["parsed"]) for pair in pairs], k)
+        chunks.append(compute_metrics(a, b, p))
+        idx.extend(pair["idx"] for pair in pairs)
+        keywords.extend(pair["keyword"] for pair in pairs)
+        winners.extend(pair["winner"] for pair in pairs)
+
+    if chunks:
+        metrics = {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]}
+    else:
+        metrics = compute_metrics(np.empty((0, k), dtype=np.int64), np.empty((0, k), dtype=np.int64), p)
+    metrics["judge_ndcg"] = judge_ndcg(metrics, winners)
+    return {"idx": np.asarray(idx, dtype=np.int64), "keyword": keywords, "winner": winners, **metrics}
+
@@ -0,0 +1,286 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from utils.api_handler import (
+    DEFAULT_MAX_RESPONSE_KB, DEFAULT_MAX_RETRIES, DEFAULT_PAYLOAD_SAMPLE_RATE, DEFAULT_POOL_SIZE
+)
+from utils.profiling import PROFILE_MODES
+from utils.significance import DEFAULT_ALPHA, DEFAULT_BETA, DEFAULT_DELTA
+from utils.work_queue import DEFAULT_LOCAL_WORKERS, DEFAULT_QUEUE_URL, DEFAULT_SHARD_SIZE
+from utils.keyword_loader import (
+    KeywordRow, count_keywords, dedupe_keywords, iter_keywords_from_file, iter_rows_from_csv, iter_spooled_counts,
+    normalize_pairs, sample_counted_keywords, sample_keywords
+)
+
+RUN_CONFIG_VERSION = 1
+KEYWORD_FORMATS = ("text", "csv", "jsonl")
+JUDGE_BACKENDS = ("openai", "stub")
+JUDGE_MODES = ("pairwise", "pointwise")
+DEFAULT_API_KEY_ENV = "OPENAI_API_KEY"
+
+# 시스템별 API 설정 필드 → 기본값 (session_manager.get_api_config 와 같은 형태)
+API_FIELDS = {
+    "url": "",
+    "method": "GET",
+    "keyword_param": "query",
+    "headers": None,
+    "query_params": None,
+    "body_params": None,
+    "parse_path": "",
+    "pool_size": DEFAULT_POOL_SIZE,
+    "max_retries": DEFAULT_MAX_RETRIES,
+    "http2": False,
+    "max_qps": 0.0,
+    "target_p95_ms": 0,
+    "stream_response": False,
+    "max_response_kb": DEFAULT_MAX_RESPONSE_KB,
+    "payload_sample_rate": DEFAULT_PAYLOAD_SAMPLE_RATE,
+}
+# 분산 실행 (작업 큐) 필드 → 기본값
+DISTRIBUTED_FIELDS = {
+    "queue": DEFAULT_QUEUE_URL,
+    "shard_size": DEFAULT_SHARD_SIZE,
+    "local_workers": DEFAULT_LOCAL_WORKERS,
+}
+# 판정 조기 종료 (순차 검정) 필드 → 기본값
+EARLY_STOP_FIELDS = {
+    "alpha": DEFAULT_ALPHA,
+    "beta": DEFAULT_BETA,
+    "delta": DEFAULT_DELTA,
+}
+JUDGE_FIELDS = {
+    "backend": "openai",
+    "base_url": "https://api.openai.com/v1",
+    "model": "gpt-4o-mini",
+    "api_key_env": DEFAULT_API_KEY_ENV,
+    "mode": "pairwise",
+    "batch_size": 8,
+    "workers": 4,
+    "skip_identical": True,
+    "similarity_threshold": None,
+    "rounds": None,
+    "early_stop": None,
+}
+
+
+# =====================================================
+# Build / Validate
+# =====================================================
+def build_run_config(
+        keyword_path: Optional[str],
+        configs: Dict[str, Dict[str, Any]],
+        concurrency: Optional[Dict[str, int]] = None,
+        use_cache: bool = True,
+        judge: Optional[Dict[str, Any]] = None,
+        distributed: Optional[Dict[str, Any]] = None,
+        shuffle_seed: Optional[int] = None,
+        profile: Optional[str] = None
+) -> Dict[str, Any]:
+    '''
+    실행 설정 문서 생성 (UI 내보내기용). 키워드는 스풀 파일 내용을 items 로 포함하고,
+    빈도 집계 키워드는 [키워드, 횟수], 템플릿 변수 값이 있는 키워드는 {"keyword", "count", "fields"} 로 저장합니다.
+    API Key 는 값 대신 환경변수 이름만 저장합니다.
+    '''
+    items = []
+    if keyword_path and os.path.exists(keyword_path):
+        items = [_keyword_item(keyword, count) for keyword, count in iter_spooled_counts(keyword_path)]
+    config = {
+        "version": RUN_CONFIG_VERSION,
+        "keywords": {"items": items},
+        "systems": {system: {field: api.get(field, default) for field, default in API_FIELDS.items()}
+                    for system, api in configs.items()},
+        "concurrency": dict(concurrency or {}),
+        "use_cache": use_cache,
+        "shuffle_seed": shuffle_seed,
+        "profile": profile,
+        "distributed": None,
+        "judge": None,
+    }
+    if distributed is not None:
+        config["distributed"] = {field: distributed.get(field, default) for field, default in DISTRIBUTED_FIELDS.items()}
+    if judge is not None:
+        config["judge"] = {field: judge.get(field, default) for field, default in JUDGE_FIELDS.items()}
+    return config
+
+
+def _keyword_item(keyword: str, count: int) -> Any:
+    fields = getattr(keyword, "fields", None)
+    if fields:
+        return {"keyword": str(keyword), "count": count, "fields": fields}
+    return str(keyword) if count == 1 else [str(keyword), count]
+
+
+def _parse_keyword_item(item: Any) -> Union[str, Tuple[str, int]]:
+    if isinstance(item, dict):
+        keyword = KeywordRow(item["keyword"], item.get("fields"))
+        count = int(item.get("count", 1))
+        return keyword if count == 1 else (keyword, count)
+    return tuple(item) if isinstance(item, list) else item
+
+
+def validate_run_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    실행 설정 검사 + 기본값 채우기. 잘못된 설정이면 ValueError.
+    keywords 는 {"items": [...]} 또는 {"path": 파일, "format": "text" | "csv" | "jsonl", ...} 입니다.
+    csv 형식은 "field_columns" 로 요청 템플릿 변수({{컬럼}})로 쓸 컬럼을 지정할 수 있습니다.
+    '''
+    if not isinstance(config, dict):
+        raise ValueError("실행 설정은 JSON 객체여야 합니다.")
+    version = config.get("version", RUN_CONFIG_VERSION)
+    if not isinstance(version, int) or isinstance(version, bool) or version > RUN_CONFIG_VERSION:
+        raise ValueError(f"지원하지 않는 설정 버전: {version!r}")
+
+    keywords = config.get("keywords") or {}
+    if "items" not in keywords and "path" not in keywords:
+        raise ValueError("keywords 에 items 또는 path 가 필요합니다.")
+    if "path" in keywords and keywords.get("format", "text") not in KEYWORD_FORMATS:
+        raise ValueError(f"지원하지 않는 키워드 형식: {keywords['format']}")
+
+    systems = config.get("systems") or {}
+    if len(systems) < 2:
+        raise ValueError("비교할 시스템이 2개 이상 필요합니다.")
+    normalized = {}
+    for system, api in systems.items():
+        unknown = set(api) - set(API_FIELDS)
+        if unknown:
+            raise ValueError(f"시스템 {system}: 알 수 없는 설정 {', '.join(sorted(unknown))}")
+        api = {**API_FIELDS, **api}
+        if not str(api["url"]).strip():
+            raise ValueError(f"시스템 {system}: url 이 필요합니다.")
+        if api["method"] not in ("GET", "POST"):
+            raise ValueError(f"시스템 {system}: 지원하지 않는 method {api['method']}")
+        normalized[system] = api
+
+    distributed = config.get("distributed")
+    if distributed is not None:
+        unknown = set(distributed) - set(DISTRIBUTED_FIELDS)
+        if unknown:
+            raise ValueError(f"distributed: 알 수 없는 설정 {', '.join(sorted(unknown))}")
+        distributed = {**DISTRIBUTED_FIELDS, **distributed}
+        if int(distributed["shard_size"]) < 1:
+            raise ValueError("distributed.shard_size 는 1 이상이어야 합니다.")
+
+    judge = config.get("judge")
+    if judge is not None:
+        unknown = set(judge) - set(JUDGE_FIELDS)
+        if unknown:
+            raise ValueError(f"judge: 알 수 없는 설정 {', '.join(sorted(unknown))}")
+        judge = {**JUDGE_FIELDS, **judge}
+        if judge["backend"] not in JUDGE_BACKENDS:
+            raise ValueError(f"지원하지 않는 판정 백엔드: {judge['backend']}")
+        if judge["backend"] == "openai" and not (str(judge["base_url"] or "").strip() and str(judge["model"] or "").strip()):
+            raise ValueError("judge: OpenAI 호환 백엔드는 base_url 과 model 이 필요합니다.")
+        if judge["mode"] not in JUDGE_MODES:
+            raise ValueError(f"지원하지 않는 판정 방식: {judge['mode']} ({', '.join(JUDGE_MODES)})")
+        for field in ("batch_size", "workers"):
+            if not isinstance(judge[field], int) or isinstance(judge[field], bool) or judge[field] < 1:
+                raise ValueError(f"judge.{field} 는 1 이상의 정수여야 합니다.")
+        if judge["early_stop"] is not None:
+            judge["early_stop"] = _validate_early_stop(judge["early_stop"])
+
+    shuffle_seed = config.get("shuffle_seed")
+    if shuffle_seed is not None and not isinstance(shuffle_seed, int):
+        raise ValueError("shuffle_seed 는 정수여야 합니다.")
+    profile = config.get("profile")
+    if profile is not None and profile not in PROFILE_MODES:
+        raise ValueError(f"지원하지 않는 프로파일러: {profile} ({', '.join(PROFILE_MODES)})")
+
+    return {
+        "version": RUN_CONFIG_VERSION,
+        "keywords": keywords,
+        "systems": normalized,
+        "concurrency": {system: int(n) for system, n in (config.get("concurrency") or {}).items()},
+        "use_cache": bool(config.get("use_cache", True)),
+        "shuffle_seed": shuffle_seed,
+        "profile": profile,
+        "distributed": distributed,
+        "judge": judge,
+    }
+
+
+def _validate_early_stop(early_stop: Dict[str, Any]) -> Dict[str, float]:
+    unknown = set(early_stop) - set(EARLY_STOP_FIELDS)
+    if unknown:
+        raise ValueError(f"judge.early_stop: 알 수 없는 설정 {', '.join(sorted(unknown))}")
+    early_stop = {field: float(value) for field, value in {**EARLY_STOP_FIELDS, **early_stop}.items()}
+    if not 0 < early_stop["alpha"] < 1 or not 0 < early_stop["beta"] < 1:
+        raise ValueError("judge.early_stop: alpha / beta 는 0 과 1 사이여야 합니다.")
+    if not 0 < early_stop["delta"] < 0.5:
+        raise ValueError("judge.early_stop: delta 는 0 과 0.5 사이여야 합니다.")
+    return early_stop
+
+
+def load_run_config(source: Union[str, Path]) -> Dict[str, Any]:
+    '''실행 설정 파일(JSON) 읽기 + 검사. 키워드 path 가 상대 경로면 설정 파일 기준으로 바꿉니다.'''
+    path = Path(source)
+    config = validate_run_config(json.loads(path.read_text(encoding="utf-8")))
+    keywords = config["keywords"]
+    if "path" in keywords and not os.path.isabs(keywords["path"]):
+        keywords["path"] = str(path.parent / keywords["path"])
+    return config
+
+
+def dump_run_config(config: Dict[str, Any]) -> str:
+    return json.dumps(config, ensure_ascii=False, indent=2)
+
+
+# =====================================================
+# Keywords
+# =====================================================
+def iter_config_keywords(config: Dict[str, Any]) -> Iterator[Union[str, Tuple[str, int]]]:
+    '''
+    설정의 키워드 스트림 (spool_keywords 입력 형태: 키워드 또는 (키워드, 횟수), 키워드는 KeywordRow 일 수 있음).
+    path 형식이면 위저드와 같은 로더로 읽고, dedupe / normalize / sample 옵션을 적용합니다.
+    '''
+    keywords = config["keywords"]
+    if "items" in keywords:
+        for item in keywords["items"]:
+            yield _parse_keyword_item(item)
+        return
+
+    with open(keywords["path"], "rb") as f:
+        kind = keywords.get("format", "text")
+        if kind == "jsonl":
+            # 내보낸 스풀({"keyword", "count", "fields"})도 그대로 읽음: count 는 반복, fields 는 템플릿 변수
+            rows = _iter_jsonl_rows(f)
+        elif kind == "csv":
+            rows = iter_rows_from_csv(
+                f, keywords.get("column", 0), keywords.get("strata_column"), keywords.get("field_columns") or ()
+            )
+        else:
+            rows = ((kw, None) for kw in iter_keywords_from_file(f, keywords.get("delimiter", "\n")))
+
+        if keywords.get("normalize"):
+            rows = normalize_pairs(rows)
+        sample = keywords.get("sample") or {}
+        mode, n, seed = sample.get("mode", "all"), int(sample.get("n", 0)), int(sample.get("seed", 42))
+        if keywords.get("count"):
+            yield from sample_counted_keywords(count_keywords(rows), mode, n, seed)
+            return
+        if keywords.get("dedupe", True):
+            rows = dedupe_keywords(rows)
+        yield from sample_keywords(rows, mode, n, seed)
+
+
+def _iter_jsonl_rows(f) -> Iterator[Tuple[Any, None]]:
+    for line in f:
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        keyword = KeywordRow(item["keyword"], item["fields"]) if item.get("fields") else item["keyword"]
+        for _ in range(int(item.get("count", 1))):
+            yield keyword, None
+
+
+# =====================================================
+# Judge
+# =====================================================
+def create_judge_engine(judge: Dict[str, Any]):
+    '''설정의 judge 항목으로 판정 엔진 생성 (API Key 는 api_key_env 환경변수에서 읽음)'''
+    from utils.judge import JudgeEngine, create_backend, get_judge_cache
+
+    api_key = os.environ.get(judge.get("api_key_env") or DEFAULT_API_KEY_ENV)
+    backend = create_backend(judge["backend"], judge["base_url"], judge["model"], api_key)
+    return JudgeEngine(backend, judge["mode"], judge["batch_size"], judge["workers"], cache=get_judge_cache())
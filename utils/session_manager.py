@@ -1,30 +1,129 @@
+import json
+import os
+import uuid
+from pathlib import Path
 import streamlit as st
+from utils.api_handler import (
+    parse_json_string, DEFAULT_POOL_SIZE, DEFAULT_MAX_RETRIES, DEFAULT_MAX_RESPONSE_KB, DEFAULT_PAYLOAD_SAMPLE_RATE
+)
+from utils.batch_runner import DEFAULT_CONCURRENCY
+from utils.keyword_loader import spool_keywords
+from utils.run_config import DISTRIBUTED_FIELDS, EARLY_STOP_FIELDS, JUDGE_FIELDS, build_run_config, iter_config_keywords
+
+KEYWORD_SPOOL_DIR = ".cache/keywords"
+DEFAULT_SYSTEMS = ("A", "B")
+SYSTEM_NAMES = "ABCDEFGH"
+MAX_SYSTEMS = 6
+
+# 위저드 위젯 키 (시스템별 API 설정 + 실행/판정 설정). 위젯이 화면에 없으면 Streamlit 이 상태를 지우므로
+# 매 실행마다 다시 대입해 다른 페이지에서도 설정을 읽고 내보낼 수 있게 합니다.
+PERSISTED_KEY_PREFIXES = (
+    'method_', 'url_', 'param_', 'headers_', 'qparams_', 'body_', 'parse_',
+    'pool_', 'retries_', 'http2_', 'qps_', 'p95_', 'stream_', 'maxkb_', 'sample_rate_',
+    'concurrency_', 'use_cache', 'share_runs', 'shuffle_', 'profile_mode', 'dist_', 'judge_', 'tournament_rounds_',
+)
+
+
+def persist_widget_state():
+    '''위저드 위젯 값을 페이지 이동 후에도 유지'''
+    for key in list(st.session_state.keys()):
+        if key.startswith(PERSISTED_KEY_PREFIXES):
+            st.session_state[key] = st.session_state[key]
+
+
+def init_api_defaults(system):
+    '''시스템별 API 설정 위젯 기본값 (위젯에 value 를 주지 않고 상태로 초기화)'''
+    defaults = {
+        f'param_{system}': 'query',
+        f'pool_{system}': DEFAULT_POOL_SIZE,
+        f'retries_{system}': DEFAULT_MAX_RETRIES,
+        f'qps_{system}': 0.0,
+        f'p95_{system}': 0,
+        f'maxkb_{system}': DEFAULT_MAX_RESPONSE_KB,
+        f'sample_rate_{system}': DEFAULT_PAYLOAD_SAMPLE_RATE,
+    }
+    for key, value in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+
+def init_run_defaults():
+    '''실행/판정 설정 위젯 기본값 (설정 가져오기로 덮어쓸 수 있도록 위젯 value 대신 상태로 초기화)'''
+    defaults = {
+        'use_cache': True,
+        'share_runs': True,
+        'shuffle_keywords': False,
+        'shuffle_seed': 0,
+        'profile_mode': 'off',
+        'dist_enabled': False,
+        'dist_queue': DISTRIBUTED_FIELDS['queue'],
+        'dist_shard_size': DISTRIBUTED_FIELDS['shard_size'],
+        'dist_local_workers': DISTRIBUTED_FIELDS['local_workers'],
+        'judge_backend': JUDGE_FIELDS['backend'],
+        'judge_mode': JUDGE_FIELDS['mode'],
+        'judge_base_url': JUDGE_FIELDS['base_url'],
+        'judge_model': JUDGE_FIELDS['model'],
+        'judge_api_key': os.environ.get(JUDGE_FIELDS['api_key_env'], ''),
+        'judge_batch_size': JUDGE_FIELDS['batch_size'],
+        'judge_workers': JUDGE_FIELDS['workers'],
+        'judge_skip_identical': JUDGE_FIELDS['skip_identical'],
+        'judge_similarity_threshold': 1.0,
+        'judge_early_stop': False,
+        'judge_alpha': EARLY_STOP_FIELDS['alpha'],
+        'judge_beta': EARLY_STOP_FIELDS['beta'],
+        'judge_delta': EARLY_STOP_FIELDS['delta'],
+    }
+    defaults.update({f'concurrency_{system}': DEFAULT_CONCURRENCY for system in get_systems()})
+    for key, value in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
 
 def init_session_state():
     '''세션 상태 초기화'''
+    persist_widget_state()
     if 'page' not in st.session_state:
         st.session_state['page'] = "description"
-    if 'keywords' not in st.session_state:
-        st.session_state.keywords = []
-    if 'test_results_a' not in st.session_state:
-        st.session_state.test_results_a = []
-    if 'test_results_b' not in st.session_state:
-        st.session_state.test_results_b = []
+    if 'keyword_source' not in st.session_state:
+        st.session_state.keyword_source = None
+    if 'run_id' not in st.session_state:
+        st.session_state.run_id = st.query_params.get('run')
+    if 'systems' not in st.session_state:
+        st.session_state.systems = list(DEFAULT_SYSTEMS)
+    init_run_defaults()
     if 'step_1_completed' not in st.session_state:
         st.session_state.step_1_completed = False
-    if 'step_2a_completed' not in st.session_state:
-        st.session_state.step_2a_completed = False
-    if 'step_2b_completed' not in st.session_state:
-        st.session_state.step_2b_completed = False
 
-def get_keywords():
-    '''저장된 키워드 반환'''
-    return st.session_state.get('keywords', [])
+def get_keyword_path():
+    '''저장된 키워드 스풀 파일 경로'''
+    source = st.session_state.get('keyword_source')
+    return source['path'] if source else None
+
+def get_keyword_count():
+    '''저장된 키워드 수'''
+    source = st.session_state.get('keyword_source')
+    return source['count'] if source else 0
+
+def get_keyword_volume():
+    '''저장된 키워드의 검색량 합계 (빈도 집계 시 중복 포함 원본 건수)'''
+    source = st.session_state.get('keyword_source')
+    return source.get('volume', source['count']) if source else 0
+
+def get_keyword_head(limit=10):
+    '''저장된 키워드 앞부분 (세션에 보관된 미리보기)'''
+    source = st.session_state.get('keyword_source')
+    return source['preview'][:limit] if source else []
 
 def set_keywords(keywords):
-    '''키워드 저장'''
-    st.session_state.keywords = keywords
-    st.session_state.step_1_completed = len(keywords) > 0
+    '''키워드 저장 (디스크에 스풀하고 세션에는 경로/개수/미리보기만 보관)'''
+    Path(KEYWORD_SPOOL_DIR).mkdir(parents=True, exist_ok=True)
+    previous = st.session_state.get('keyword_source')
+    source = spool_keywords(keywords, os.path.join(KEYWORD_SPOOL_DIR, f"{uuid.uuid4().hex}.jsonl"))
+    if previous and os.path.exists(previous['path']):
+        os.remove(previous['path'])
+    st.session_state.keyword_source = source
+    st.session_state.step_1_completed = source['count'] > 0
+    return source
 
 def is_step_completed(step):
     '''단계 완료 여부 확인'''
@@ -34,12 +133,179 @@ def set_step_completed(step, completed=True):
     '''단계 완료 상태 설정'''
     st.session_state[f'step_{step}_completed'] = completed
 
-def get_test_results(system):
-    '''테스트 결과 반환'''
-    key = f'test_results_{system.lower()}'
-    return st.session_state.get(key, [])
+def get_current_run_id():
+    '''현재 세션이 보고 있는 실행(run) id (결과는 ResultStore 에 저장)'''
+    return st.session_state.get('run_id')
+
+def set_current_run_id(run_id):
+    '''현재 실행 id 저장 (URL 의 ?run= 에도 기록해 새로고침/재접속 후에도 이어서 볼 수 있게 함)'''
+    st.session_state.run_id = run_id
+    if run_id:
+        st.query_params['run'] = run_id
+    elif 'run' in st.query_params:
+        del st.query_params['run']
+
+def get_systems():
+    '''비교 대상 시스템 이름 목록 (기본 A, B)'''
+    return list(st.session_state.get('systems', DEFAULT_SYSTEMS))
+
+def add_system():
+    '''비교 시스템 추가 (사용하지 않은 다음 이름). 최대 MAX_SYSTEMS 개'''
+    systems = get_systems()
+    if len(systems) >= MAX_SYSTEMS:
+        return None
+    system = next(name for name in SYSTEM_NAMES if name not in systems)
+    st.session_state.systems = systems + [system]
+    init_api_defaults(system)
+    init_run_defaults()
+    return system
+
+def remove_system(system):
+    '''비교 시스템 삭제 (최소 2개 유지) + 해당 시스템 위젯/테스트 상태 정리'''
+    systems = get_systems()
+    if system not in systems or len(systems) <= 2:
+        return
+    st.session_state.systems = [name for name in systems if name != system]
+    _clear_system_state(system)
+
+def _clear_system_state(system):
+    '''시스템별 위젯/테스트 상태 삭제'''
+    for key in list(st.session_state.keys()):
+        if key.startswith(PERSISTED_KEY_PREFIXES) and key.endswith(f'_{system}'):
+            del st.session_state[key]
+    st.session_state.pop(f'api_tested_{system}', None)
+    st.session_state.pop(f'step_api_{system}_completed', None)
+
+def export_run_config():
+    '''현재 세션 설정(키워드 + 시스템별 API + 실행/판정 설정)을 CLI 와 같은 실행 설정 문서로 변환'''
+    systems = get_systems()
+    threshold = st.session_state.get('judge_similarity_threshold', 1.0)
+    judge = {
+        'backend': st.session_state.get('judge_backend', JUDGE_FIELDS['backend']),
+        'base_url': st.session_state.get('judge_base_url', JUDGE_FIELDS['base_url']),
+        'model': st.session_state.get('judge_model', JUDGE_FIELDS['model']),
+        'mode': st.session_state.get('judge_mode', JUDGE_FIELDS['mode']),
+        'batch_size': st.session_state.get('judge_batch_size', JUDGE_FIELDS['batch_size']),
+        'workers': st.session_state.get('judge_workers', JUDGE_FIELDS['workers']),
+        'skip_identical': st.session_state.get('judge_skip_identical', JUDGE_FIELDS['skip_identical']),
+        'similarity_threshold': threshold if threshold < 1.0 else None,
+        'rounds': st.session_state.get(f'tournament_rounds_{len(systems)}'),
+        'early_stop': get_early_stop_options(),
+    }
+    concurrency = {system: st.session_state.get(f'concurrency_{system}', DEFAULT_CONCURRENCY) for system in systems}
+    return build_run_config(
+        get_keyword_path(), get_api_configs(), concurrency, st.session_state.get('use_cache', True), judge,
+        get_distributed_options(), get_shuffle_seed(), get_profile_mode()
+    )
+
+def get_distributed_options():
+    '''분산 실행 설정 (사용하지 않으면 None)'''
+    if not st.session_state.get('dist_enabled'):
+        return None
+    return {field: st.session_state.get(f'dist_{field}', default) for field, default in DISTRIBUTED_FIELDS.items()}
+
+def get_shuffle_seed():
+    '''키워드 순서 무작위화 seed (사용하지 않으면 None)'''
+    if not st.session_state.get('shuffle_keywords'):
+        return None
+    return int(st.session_state.get('shuffle_seed', 0))
+
+def get_profile_mode():
+    '''실행 프로파일러 ("cprofile" | "sampling", 사용하지 않으면 None)'''
+    mode = st.session_state.get('profile_mode', 'off')
+    return None if mode == 'off' else mode
+
+def get_early_stop_options():
+    '''판정 조기 종료(순차 검정) 설정 (사용하지 않으면 None)'''
+    if not st.session_state.get('judge_early_stop'):
+        return None
+    return {field: st.session_state.get(f'judge_{field}', default) for field, default in EARLY_STOP_FIELDS.items()}
+
+def import_run_config(config):
+    '''
+    실행 설정 문서(validate_run_config 통과한 것)를 세션에 적용: 키워드를 다시 스풀하고
+    시스템 목록과 위젯 상태를 설정값으로 바꿉니다. API 연결 테스트 상태는 초기화됩니다.
+    '''
+    systems = list(config['systems'])
+    if len(systems) > MAX_SYSTEMS:
+        raise ValueError(f"시스템은 최대 {MAX_SYSTEMS}개까지 설정할 수 있습니다.")
+    source = set_keywords(iter_config_keywords(config))
+
+    for system in get_systems():
+        if system not in systems:
+            _clear_system_state(system)
+    st.session_state.systems = systems
+
+    for system, api in config['systems'].items():
+        st.session_state[f'method_{system}'] = api['method']
+        st.session_state[f'url_{system}'] = api['url']
+        st.session_state[f'param_{system}'] = api['keyword_param']
+        st.session_state[f'headers_{system}'] = json.dumps(api['headers'], ensure_ascii=False) if api['headers'] else ''
+        st.session_state[f'qparams_{system}'] = (
+            json.dumps(api['query_params'], ensure_ascii=False) if api['query_params'] else ''
+        )
+        st.session_state[f'body_{system}'] = (
+            json.dumps(api['body_params'], ensure_ascii=False) if api['body_params'] else ''
+        )
+        st.session_state[f'parse_{system}'] = api['parse_path']
+        st.session_state[f'pool_{system}'] = api['pool_size']
+        st.session_state[f'retries_{system}'] = api['max_retries']
+        st.session_state[f'http2_{system}'] = api['http2']
+        st.session_state[f'qps_{system}'] = float(api['max_qps'])
+        st.session_state[f'p95_{system}'] = api['target_p95_ms']
+        st.session_state[f'stream_{system}'] = api['stream_response']
+        st.session_state[f'maxkb_{system}'] = api['max_response_kb']
+        st.session_state[f'sample_rate_{system}'] = float(api['payload_sample_rate'])
+        st.session_state[f'concurrency_{system}'] = config['concurrency'].get(system, DEFAULT_CONCURRENCY)
+        st.session_state[f'api_tested_{system}'] = False
+        st.session_state[f'step_api_{system}_completed'] = False
+    st.session_state.use_cache = config['use_cache']
+    st.session_state.shuffle_keywords = config.get('shuffle_seed') is not None
+    st.session_state.shuffle_seed = config.get('shuffle_seed') or 0
+    st.session_state.profile_mode = config.get('profile') or 'off'
+    distributed = config.get('distributed')
+    st.session_state.dist_enabled = distributed is not None
+    for field, value in (distributed or {}).items():
+        st.session_state[f'dist_{field}'] = value
+
+    judge = config.get('judge')
+    if judge:
+        for field in ('backend', 'base_url', 'model', 'mode', 'batch_size', 'workers', 'skip_identical'):
+            st.session_state[f'judge_{field}'] = judge[field]
+        st.session_state.judge_similarity_threshold = judge['similarity_threshold'] or 1.0
+        if judge.get('api_key_env') and os.environ.get(judge['api_key_env']):
+            st.session_state.judge_api_key = os.environ[judge['api_key_env']]
+        st.session_state.judge_early_stop = judge.get('early_stop') is not None
+        for field, value in (judge.get('early_stop') or {}).items():
+            st.session_state[f'judge_{field}'] = value
+        if judge.get('rounds'):
+            st.session_state[f'tournament_rounds_{len(systems)}'] = judge['rounds']
+    return source
+
+def get_api_configs():
+    '''전체 시스템의 API 설정 ({시스템: 설정})'''
+    return {system: get_api_config(system) for system in get_systems()}
 
-def set_test_results(system, results):
-    '''테스트 결과 저장'''
-    key = f'test_results_{system.lower()}'
-    st.session_state[key] = results
\ No newline at end of file
+def get_api_config(system):
+    '''시스템별 API 설정 반환 (위저드 입력값 기준)'''
+    method = st.session_state.get(f'method_{system}', 'GET')
+    headers = st.session_state.get(f'headers_{system}', '')
+    body = st.session_state.get(f'body_{system}', '') if method == 'POST' else ''
+    query = st.session_state.get(f'qparams_{system}', '')
+    return {
+        'url': st.session_state.get(f'url_{system}', '').strip(),
+        'method': method,
+        'keyword_param': st.session_state.get(f'param_{system}', 'query'),
+        'headers': parse_json_string(headers) if headers else None,
+        'query_params': parse_json_string(query) if query else None,
+        'body_params': parse_json_string(body) if body else None,
+        'parse_path': st.session_state.get(f'parse_{system}', ''),
+        'pool_size': st.session_state.get(f'pool_{system}', DEFAULT_POOL_SIZE),
+        'max_retries': st.session_state.get(f'retries_{system}', DEFAULT_MAX_RETRIES),
+        'http2': st.session_state.get(f'http2_{system}', False),
+        'max_qps': st.session_state.get(f'qps_{system}', 0.0),
+        'target_p95_ms': st.session_state.get(f'p95_{system}', 0),
+        'stream_response': st.session_state.get(f'stream_{system}', False),
+        'max_response_kb': st.session_state.get(f'maxkb_{system}', DEFAULT_MAX_RESPONSE_KB),
+        'payload_sample_rate': st.session_state.get(f'sample_rate_{system}', DEFAULT_PAYLOAD_SAMPLE_RATE),
+    }
@@ -0,0 +1,127 @@
+import math
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_ALPHA = 0.05
+DEFAULT_BETA = 0.2
+DEFAULT_DELTA = 0.1  # 최소 효과: 승패가 갈린 키워드에서 한쪽 승률 0.5 + delta
+BOOTSTRAP_SAMPLES = 2000
+MIN_SEQUENTIAL_SAMPLES = 20  # 이보다 적은 판정으로는 조기 종료하지 않음 (초반 요동 방지)
+SEQUENTIAL_CHUNK_SIZE = 50  # 조기 종료 사용 시 검정 간격 (판정 건수)
+
+SPRT_B = "B"
+SPRT_A = "A"
+SPRT_EQUAL = "equal"
+
+
+# =====================================================
+# Confidence Intervals
+# =====================================================
+def _z(alpha: float) -> float:
+    return NormalDist().inv_cdf(1 - alpha / 2)
+
+
+def wilson_interval(successes: int, n: int, alpha: float = DEFAULT_ALPHA) -> Tuple[float, float]:
+    '''이항 비율의 Wilson 신뢰구간 (n 이 작거나 비율이 0/1 에 가까워도 구간이 [0, 1] 안에 있음)'''
+    if n <= 0:
+        return 0.0, 1.0
+    z = _z(alpha)
+    p = successes / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def bootstrap_interval(
+        wins_a: int,
+        wins_b: int,
+        ties: int,
+        alpha: float = DEFAULT_ALPHA,
+        samples: int = BOOTSTRAP_SAMPLES,
+        seed: int = 0
+) -> Tuple[float, float]:
+    '''
+    B 선호 점수(B 승 = 1, 무승부 = 0.5, A 승 = 0 의 평균)의 bootstrap 백분위 신뢰구간.
+    판정 결과는 세 범주뿐이라 재표본은 다항분포 한 번으로 뽑습니다.
+    '''
+    n = wins_a + wins_b + ties
+    if n <= 0:
+        return 0.0, 1.0
+    rng = np.random.default_rng(seed)
+    draws = rng.multinomial(n, [wins_a / n, wins_b / n, ties / n], size=samples)
+    scores = (draws[:, 1] + 0.5 * draws[:, 2]) / n
+    low, high = np.quantile(scores, [alpha / 2, 1 - alpha / 2])
+    return float(low), float(high)
+
+
+# =====================================================
+# Sequential Test
+# =====================================================
+def sprt(
+        wins_a: int,
+        wins_b: int,
+        alpha: float = DEFAULT_ALPHA,
+        beta: float = DEFAULT_BETA,
+        delta: float = DEFAULT_DELTA
+) -> Dict[str, Any]:
+    '''
+    승패가 갈린 판정에 대한 양측 SPRT (Wald). 무승부는 정보가 없으므로 제외합니다.
+
+    "B 가 낫다"(B 승률 0.5 + delta) 와 "A 가 낫다" 를 각각 H0: 0.5 에 대해 유의수준 alpha/2 로 검정하고,
+    둘 다 H0 쪽 경계를 넘으면 "차이가 delta 보다 작다"(equal) 로 판정합니다.
+    반환: {"decision": "A" | "B" | "equal" | None, "llr_a", "llr_b", "upper", "lower"}
+    '''
+    p1 = 0.5 + delta
+    win, loss = math.log(p1 / 0.5), math.log((1 - p1) / 0.5)
+    upper = math.log((1 - beta) / (alpha / 2))
+    lower = math.log(beta / (1 - alpha / 2))
+    llr_b = wins_b * win + wins_a * loss
+    llr_a = wins_a * win + wins_b * loss
+
+    decision = None
+    if llr_b >= upper:
+        decision = SPRT_B
+    elif llr_a >= upper:
+        decision = SPRT_A
+    elif llr_b <= lower and llr_a <= lower:
+        decision = SPRT_EQUAL
+    return {"decision": decision, "llr_a": llr_a, "llr_b": llr_b, "upper": upper, "lower": lower}
+
+
+def early_stop_decision(counts: Dict[str, int], options: Dict[str, float]) -> Optional[str]:
+    '''판정 집계로 본 조기 종료 결정 (계속해야 하면 None). options: {"alpha", "beta", "delta"}'''
+    wins_a, wins_b = counts.get("A", 0), counts.get("B", 0)
+    if wins_a + wins_b + counts.get("tie", 0) < MIN_SEQUENTIAL_SAMPLES:
+        return None
+    return sprt(
+        wins_a, wins_b,
+        options.get("alpha", DEFAULT_ALPHA), options.get("beta", DEFAULT_BETA), options.get("delta", DEFAULT_DELTA)
+    )["decision"]
+
+
+def significance_summary(
+        counts: Dict[str, int],
+        alpha: float = DEFAULT_ALPHA,
+        beta: float = DEFAULT_BETA,
+        delta: float = DEFAULT_DELTA
+) -> Dict[str, Any]:
+    '''
+    A/B 판정 집계 {"A", "B", "tie", ...} 의 유의성 요약.
+    - b_win_rate / wilson: 승패가 갈린 키워드 중 B 승률과 Wilson 구간
+    - score / bootstrap: B 선호 점수(무승부 0.5)와 bootstrap 구간
+    - sprt: 순차 검정 결과
+    '''
+    wins_a, wins_b, ties = counts.get("A", 0), counts.get("B", 0), counts.get("tie", 0)
+    decisive = wins_a + wins_b
+    n = decisive + ties
+    return {
+        "n": n,
+        "decisive": decisive,
+        "b_win_rate": wins_b / decisive if decisive else None,
+        "wilson": wilson_interval(wins_b, decisive, alpha),
+        "score": (wins_b + 0.5 * ties) / n if n else None,
+        "bootstrap": bootstrap_interval(wins_a, wins_b, ties, alpha),
+        "sprt": sprt(wins_a, wins_b, alpha, beta, delta),
+    }
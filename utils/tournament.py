@@ -0,0 +1,122 @@
+import math
+import random
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+BT_ITERATIONS = 200
+BT_TOLERANCE = 1e-9
+PRIOR_GAMES = 1.0  # 시스템마다 기준 상대(강도 1)와 무승부 1경기를 가정 (전승/전패·비연결 그래프 안정화)
+
+
+# =====================================================
+# Swiss Pairing
+# =====================================================
+def default_rounds(n_systems: int) -> int:
+    '''
+    Swiss 라운드 수 기본값: ceil(log2 N).
+    라운드마다 N/2 쌍만 비교하므로 키워드당 판정 수는 N·log2(N)/2 (전체 쌍 N(N-1)/2 대비).
+    '''
+    return max(1, math.ceil(math.log2(max(2, n_systems))))
+
+
+def all_pairs(systems: Sequence[str]) -> List[Tuple[str, str]]:
+    return list(combinations(systems, 2))
+
+
+def ordered_pair(systems: Sequence[str], x: str, y: str) -> Tuple[str, str]:
+    '''시스템 목록 순서로 정렬한 쌍 (저장/조회 키를 하나로 맞춤)'''
+    return (x, y) if systems.index(x) < systems.index(y) else (y, x)
+
+
+def swiss_pairings(
+        systems: Sequence[str],
+        scores: Dict[str, float],
+        played: Set[Tuple[str, str]],
+        rng: Optional[random.Random] = None
+) -> List[Tuple[str, str]]:
+    '''
+    Swiss 방식 대진: 현재 점수 순으로 정렬한 뒤, 위에서부터 아직 붙지 않은 가장 가까운 상대와 짝짓습니다.
+    모든 상대와 이미 붙었으면 가장 가까운 상대와 다시 붙습니다. 홀수면 마지막 1개는 부전승(대진 없음).
+    점수가 같으면 rng 순서 (첫 라운드는 무작위 대진).
+    '''
+    rng = rng or random.Random(0)
+    tiebreak = {system: rng.random() for system in systems}
+    remaining = sorted(systems, key=lambda s: (-scores.get(s, 0.0), tiebreak[s]))
+    pairs = []
+    while len(remaining) >= 2:
+        x = remaining.pop(0)
+        opponent = next(
+            (y for y in remaining if ordered_pair(systems, x, y) not in played),
+            remaining[0]
+        )
+        remaining.remove(opponent)
+        pairs.append(ordered_pair(systems, x, opponent))
+    return pairs
+
+
+# =====================================================
+# Bradley–Terry
+# =====================================================
+def bradley_terry(
+        results: Iterable[Tuple[str, str, float, float]],
+        systems: Sequence[str],
+        iterations: int = BT_ITERATIONS
+) -> Dict[str, float]:
+    '''
+    쌍별 승수 [(x, y, x 승, y 승), ...] 로 Bradley–Terry 강도를 추정 (MM 알고리즘, Hunter 2004).
+    무승부는 호출하는 쪽에서 양쪽에 0.5 승씩 넣어 전달합니다.
+    반환: {시스템: log 강도}. 두 시스템의 점수 차 d 는 승률 1 / (1 + e^-d) 에 해당합니다.
+    '''
+    wins = {system: PRIOR_GAMES / 2 for system in systems}
+    games: Dict[Tuple[str, str], float] = {}
+    for x, y, wins_x, wins_y in results:
+        wins[x] += wins_x
+        wins[y] += wins_y
+        key = ordered_pair(systems, x, y)
+        games[key] = games.get(key, 0.0) + wins_x + wins_y
+
+    strength = {system: 1.0 for system in systems}
+    for _ in range(iterations):
+        denominator = {system: PRIOR_GAMES / (strength[system] + 1.0) for system in systems}
+        for (x, y), n in games.items():
+            share = n / (strength[x] + strength[y])
+            denominator[x] += share
+            denominator[y] += share
+        updated = {system: wins[system] / denominator[system] for system in systems}
+        change = max(abs(math.log(updated[s]) - math.log(strength[s])) for s in systems)
+        strength = updated
+        if change < BT_TOLERANCE:
+            break
+    return {system: math.log(value) for system, value in strength.items()}
+
+
+def win_probability(scores: Dict[str, float], x: str, y: str) -> float:
+    '''Bradley–Terry 점수로 본 x 가 y 를 이길 확률'''
+    return 1.0 / (1.0 + math.exp(scores[y] - scores[x]))
+
+
+def standings(
+        match_rows: Iterable[Dict[str, int]],
+        systems: Sequence[str]
+) -> List[Dict[str, float]]:
+    '''
+    쌍별 판정 집계 [{"system_a", "system_b", "a", "b", "tie", "error"}, ...] → 점수 순 순위표.
+    반환: [{"system", "score", "wins", "losses", "ties", "matches"}, ...]
+    '''
+    table = {system: {"system": system, "wins": 0, "losses": 0, "ties": 0, "matches": 0} for system in systems}
+    results = []
+    for row in match_rows:
+        x, y = row["system_a"], row["system_b"]
+        table[x]["wins"] += row["a"]
+        table[x]["losses"] += row["b"]
+        table[y]["wins"] += row["b"]
+        table[y]["losses"] += row["a"]
+        for system in (x, y):
+            table[system]["ties"] += row["tie"]
+            table[system]["matches"] += row["a"] + row["b"] + row["tie"]
+        results.append((x, y, row["a"] + row["tie"] / 2, row["b"] + row["tie"] / 2))
+
+    scores = bradley_terry(results, systems)
+    for system, entry in table.items():
+        entry["score"] = scores[system]
+    return sorted(table.values(), key=lambda entry: -entry["score"])
@@ -0,0 +1,382 @@
+'''
+분산 일괄 호출용 작업 큐 + 워커.
+
+실행(run) 의 키워드를 shard_size 개씩 샤드로 나눠 큐에 넣으면, 여러 머신의 워커 프로세스가
+샤드를 임대(lease)해 호출하고 결과를 ResultStore 에 기록합니다.
+
+- 전달 보장: at-least-once. 워커가 죽어 임대가 만료되면 다른 워커가 같은 샤드를 다시 받습니다.
+- 멱등 기록: 결과는 (run_id, system, idx) 키로 덮어쓰고, 워커는 이미 기록된 키워드를 건너뛰므로
+  같은 샤드가 두 번 처리돼도 결과가 중복되지 않습니다.
+- 큐 구현은 WorkQueue 를 상속해 QUEUE_BACKENDS 에 등록합니다. 기본은 SQLite 파일 큐이며,
+  여러 머신에서 쓰려면 큐 / 결과 저장소 / .cache/runs 가 공유 파일시스템에 같은 경로로 마운트돼 있어야 합니다.
+- 제약: 워커는 결과를 SQLite ResultStore 파일에 직접 기록합니다 (결과 기록 방식은 교체 불가).
+  네트워크 파일시스템에서는 WAL 대신 롤백 저널을 쓰고(큐는 항상, 저장소는 sqlite_journal_mode),
+  동시성은 파일시스템의 잠금(POSIX lock)에 의존하므로 잠금을 지원하지 않는 공유 스토리지에서는
+  단일 호스트(로컬 워커)로만 쓰세요. 기록은 저장소 단위로 직렬화되므로 워커 수가 많으면 기록이 병목이 됩니다.
+
+워커 실행:
+    python -m utils.work_queue --queue sqlite:.cache/queue.sqlite3 --store .cache/results.sqlite3
+'''
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.batch_runner import run_batch
+from utils.keyword_loader import iter_spooled_keywords, spool_offsets
+from utils.profiling import traced
+from utils.response_cache import get_response_cache
+from utils.result_store import DEFAULT_STORE_PATH, ResultStore, get_result_store
+
+DEFAULT_QUEUE_URL = "sqlite:.cache/queue.sqlite3"
+DEFAULT_SHARD_SIZE = 1000
+DEFAULT_LOCAL_WORKERS = 2
+DEFAULT_LEASE_SECONDS = 60.0
+MAX_ATTEMPTS = 5
+POLL_INTERVAL = 1.0
+LOCAL_WORKER_IDLE_EXIT = 10.0
+WORKER_LOG_DIR = ".cache/workers"
+
+TASK_PENDING = "pending"
+TASK_LEASED = "leased"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+TASK_CANCELLED = "cancelled"
+TASK_STATUSES = (TASK_PENDING, TASK_LEASED, TASK_DONE, TASK_FAILED, TASK_CANCELLED)
+
+
+# =====================================================
+# Queue Interface
+# =====================================================
+class WorkQueue:
+    '''
+    샤드 작업 큐 인터페이스. 샤드 1건 = {"task_id", "run_id", "start", "stop", "offset", "attempts"}
+    (start ~ stop: 키워드 순번 범위, offset: 스풀 파일에서 start 번째 줄의 바이트 위치).
+
+    구현은 임대가 만료된 샤드를 다시 내줘야 하며(at-least-once), enqueue 는 같은 샤드를
+    여러 번 넣어도 한 번만 등록해야 합니다 (재개 시 다시 호출됨).
+    '''
+
+    def enqueue(self, run_id: str, shards: List[Tuple[int, int, int]]) -> int:
+        '''(start, stop, offset) 샤드 등록. 반환: 새로 등록된 수'''
+        raise NotImplementedError
+
+    def lease(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        '''대기 중이거나 임대가 만료된 샤드 1건 임대 (없으면 None)'''
+        raise NotImplementedError
+
+    def renew(self, task_id: str, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        '''임대 연장. 임대를 잃었으면(만료 후 재임대 / 취소) False'''
+        raise NotImplementedError
+
+    def complete(self, task_id: str, worker_id: str) -> bool:
+        raise NotImplementedError
+
+    def release(self, task_id: str, worker_id: str, error: str) -> None:
+        '''처리 실패: MAX_ATTEMPTS 전까지는 다시 대기열로, 이후에는 failed'''
+        raise NotImplementedError
+
+    def cancel(self, run_id: str) -> None:
+        '''끝나지 않은 샤드 취소 (처리 중인 워커는 다음 renew 에서 멈춤)'''
+        raise NotImplementedError
+
+    def requeue(self, run_id: str) -> int:
+        '''취소/실패한 샤드를 다시 대기열로 (재개). 반환: 다시 넣은 수'''
+        raise NotImplementedError
+
+    def stats(self, run_id: str) -> Dict[str, Any]:
+        '''
+        상태별 샤드 수 + 처리 중인 워커 수 + 끝나지 않은 샤드의 가장 최근 오류
+        ("error", "error_shard": 그 샤드의 시작 순번, 재시도 대기 중인 샤드 포함)
+        '''
+        raise NotImplementedError
+
+
+class SqliteWorkQueue(WorkQueue):
+    '''
+    SQLite 파일 큐 (기본). 임대는 BEGIN IMMEDIATE 트랜잭션 안에서 골라 갱신하므로
+    여러 프로세스가 동시에 lease 해도 같은 샤드를 두 워커가 받지 않습니다.
+    여러 머신이 공유 파일시스템으로 함께 쓰므로 WAL(같은 호스트의 공유 메모리 필요) 대신 롤백 저널을 씁니다.
+    '''
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "task_id TEXT PRIMARY KEY, run_id TEXT NOT NULL, start INTEGER NOT NULL, stop INTEGER NOT NULL, "
+            "offset INTEGER NOT NULL, status TEXT NOT NULL, owner TEXT, lease_expires REAL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, error TEXT, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_expires)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_run ON tasks (run_id, status)")
+
+    def _execute(self, sql: str, params: Tuple = ()) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def enqueue(self, run_id: str, shards: List[Tuple[int, int, int]]) -> int:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (task_id, run_id, start, stop, offset, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(f"{run_id}:{start}", run_id, start, stop, offset, TASK_PENDING, now) for start, stop, offset in shards]
+            )
+            return cursor.rowcount
+
+    def lease(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 임대 만료 + 재시도 한도 도달 샤드는 실패 처리 (워커를 계속 죽이는 샤드)
+                self._conn.execute(
+                    "UPDATE tasks SET status = ?, error = 'lease expired', updated_at = ? "
+                    "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (TASK_FAILED, now, TASK_LEASED, now, MAX_ATTEMPTS)
+                )
+                row = self._conn.execute(
+                    "SELECT task_id, run_id, start, stop, offset, attempts FROM tasks "
+                    "WHERE status = ? OR (status = ? AND lease_expires < ?) ORDER BY updated_at LIMIT 1",
+                    (TASK_PENDING, TASK_LEASED, now)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = ?, owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                        "updated_at = ? WHERE task_id = ?",
+                        (TASK_LEASED, worker_id, now + lease_seconds, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if not row:
+            return None
+        task_id, run_id, start, stop, offset, attempts = row
+        return {
+            "task_id": task_id, "run_id": run_id, "start": start, "stop": stop,
+            "offset": offset, "attempts": attempts + 1,
+        }
+
+    def renew(self, task_id: str, worker_id: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        now = time.time()
+        return self._execute(
+            "UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE task_id = ? AND owner = ? AND status = ?",
+            (now + lease_seconds, now, task_id, worker_id, TASK_LEASED)
+        ) > 0
+
+    def complete(self, task_id: str, worker_id: str) -> bool:
+        return self._execute(
+            "UPDATE tasks SET status = ?, lease_expires = NULL, updated_at = ? "
+            "WHERE task_id = ? AND owner = ? AND status = ?",
+            (TASK_DONE, time.time(), task_id, worker_id, TASK_LEASED)
+        ) > 0
+
+    def release(self, task_id: str, worker_id: str, error: str) -> None:
+        self._execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "owner = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+            "WHERE task_id = ? AND owner = ? AND status = ?",
+            (MAX_ATTEMPTS, TASK_FAILED, TASK_PENDING, error, time.time(), task_id, worker_id, TASK_LEASED)
+        )
+
+    def cancel(self, run_id: str) -> None:
+        self._execute(
+            "UPDATE tasks SET status = ?, updated_at = ? WHERE run_id = ? AND status IN (?, ?)",
+            (TASK_CANCELLED, time.time(), run_id, TASK_PENDING, TASK_LEASED)
+        )
+
+    def requeue(self, run_id: str) -> int:
+        return self._execute(
+            "UPDATE tasks SET status = ?, owner = NULL, lease_expires = NULL, attempts = 0, updated_at = ? "
+            "WHERE run_id = ? AND status IN (?, ?)",
+            (TASK_PENDING, time.time(), run_id, TASK_CANCELLED, TASK_FAILED)
+        )
+
+    def stats(self, run_id: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*), COUNT(DISTINCT owner) FROM tasks WHERE run_id = ? GROUP BY status",
+                (run_id,)
+            ).fetchall()
+            errors = self._conn.execute(
+                "SELECT start, error FROM tasks WHERE run_id = ? AND status != ? AND error IS NOT NULL "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (run_id, TASK_DONE)
+            ).fetchall()
+        counts = {status: 0 for status in TASK_STATUSES}
+        workers = 0
+        for status, count, owners in rows:
+            counts[status] = count
+            if status == TASK_LEASED:
+                workers = owners
+        return {
+            **counts, "total": sum(counts.values()), "workers": workers,
+            "error": errors[0][1] if errors else None, "error_shard": errors[0][0] if errors else None,
+        }
+
+
+QUEUE_BACKENDS = {"sqlite": SqliteWorkQueue}
+
+
+@lru_cache(maxsize=None)
+def open_work_queue(url: str = DEFAULT_QUEUE_URL) -> WorkQueue:
+    '''"<backend>:<위치>" 형식 URL 로 큐 열기 (프로세스 공용). 예: sqlite:/shared/queue.sqlite3'''
+    backend, _, location = url.partition(":")
+    if backend not in QUEUE_BACKENDS:
+        raise ValueError(f"지원하지 않는 작업 큐: {backend}")
+    return QUEUE_BACKENDS[backend](location)
+
+
+def make_shards(keyword_path: str, total: int, shard_size: int = DEFAULT_SHARD_SIZE) -> List[Tuple[int, int, int]]:
+    '''키워드 스풀을 (start, stop, offset) 샤드로 분할'''
+    shard_size = max(1, int(shard_size))
+    offsets = spool_offsets(keyword_path, shard_size)
+    return [(i * shard_size, min(total, (i + 1) * shard_size), offset) for i, offset in enumerate(offsets)]
+
+
+# =====================================================
+# Worker
+# =====================================================
+def process_task(
+        queue: WorkQueue,
+        task: Dict[str, Any],
+        worker_id: str,
+        store: ResultStore,
+        lease_seconds: float
+) -> bool:
+    '''
+    샤드 1건 호출 + 결과 기록. 임대를 잃으면(취소 / 만료 후 재임대) 진행 중인 호출만 마치고 멈춥니다.
+    반환: 샤드를 끝까지 처리했는지 여부
+    '''
+    run_id, start, stop = task["run_id"], task["start"], task["stop"]
+    run = store.get_run(run_id)
+    if run is None:
+        raise ValueError(f"실행 {run_id} 를 결과 저장소에서 찾을 수 없습니다.")
+    configs = run["config"]["configs"]
+    cache = get_response_cache() if run["config"].get("use_cache") else None
+    skip = {system: store.done_indices(run_id, system, start, stop) for system in configs}
+
+    lost = threading.Event()
+    finished = threading.Event()
+
+    def heartbeat() -> None:
+        while not finished.wait(lease_seconds / 3):
+            if not queue.renew(task["task_id"], worker_id, lease_seconds):
+                lost.set()
+                return
+
+    thread = threading.Thread(target=heartbeat, name=f"lease-{task['task_id']}", daemon=True)
+    thread.start()
+    try:
+        # 샤드마다 trace 파일 1개 (실행 설정의 profile 이면 프로파일 포함, .cache/traces 공유 시 화면에서 조회)
+        with traced(f"{run_id}.shard-{start}", run["config"].get("profile")), store.writer(run_id) as writer:
+            run_batch(
+                islice(iter_spooled_keywords(run["keyword_path"], task["offset"]), stop - start),
+                configs, writer.add, run["config"].get("concurrency"), cache=cache,
+                skip=skip, cancel_event=lost, total=stop - start, start_idx=start
+            )
+    finally:
+        finished.set()
+        thread.join()
+    return not lost.is_set()
+
+
+def run_worker(
+        queue: WorkQueue,
+        store: ResultStore,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        idle_exit: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None
+) -> int:
+    '''
+    큐에서 샤드를 받아 처리하는 루프. idle_exit 초 동안 받을 샤드가 없으면 종료합니다 (None = 계속 대기).
+    반환: 완료한 샤드 수
+    '''
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    completed = 0
+    idle_since = time.monotonic()
+    while stop_event is None or not stop_event.is_set():
+        task = queue.lease(worker_id, lease_seconds)
+        if task is None:
+            if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                break
+            time.sleep(POLL_INTERVAL)
+            continue
+        try:
+            if process_task(queue, task, worker_id, store, lease_seconds) and queue.complete(task["task_id"], worker_id):
+                completed += 1
+        except Exception as e:
+            # 큐에는 요약만 남기고(진행 화면에 표시) 전체 traceback 은 stderr (로컬 워커는 WORKER_LOG_DIR 로그)
+            print(f"[{worker_id}] 샤드 {task['task_id']} 실패", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            queue.release(task["task_id"], worker_id, f"{type(e).__name__}: {e}")
+        idle_since = time.monotonic()
+    return completed
+
+
+def start_local_workers(
+        queue_url: str,
+        store_path: str,
+        count: int,
+        idle_exit: float = LOCAL_WORKER_IDLE_EXIT,
+        log_path: Optional[str] = None
+) -> List[subprocess.Popen]:
+    '''
+    이 머신에 워커 프로세스 count 개 시작 (`python -m utils.work_queue`, load_test 워커와 같은 이유로
+    multiprocessing 대신 하위 프로세스). 할 샤드가 idle_exit 초 동안 없으면 스스로 종료합니다.
+    워커의 stdout / stderr 는 log_path (기본: worker_log_path()) 에 이어 씁니다.
+    '''
+    root = Path(__file__).resolve().parent.parent
+    log_path = log_path or worker_log_path()
+    Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+    processes = []
+    for _ in range(max(0, int(count))):
+        with open(log_path, "ab") as log:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "utils.work_queue", "--queue", queue_url, "--store", store_path,
+                 "--idle-exit", str(idle_exit)],
+                cwd=root, stdout=log, stderr=subprocess.STDOUT
+            )
+        # 종료 시 좀비 프로세스가 남지 않도록 회수
+        threading.Thread(target=process.wait, daemon=True).start()
+        processes.append(process)
+    return processes
+
+
+def worker_log_path(run_id: Optional[str] = None) -> str:
+    '''로컬 워커 로그 경로 (실행별, run_id 가 없으면 공용)'''
+    return str(Path(WORKER_LOG_DIR).resolve() / f"{run_id or 'workers'}.log")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="분산 일괄 호출 워커")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_URL, help=f"작업 큐 URL (기본: {DEFAULT_QUEUE_URL})")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="결과 저장소 경로 (실행을 만든 서버와 공유)")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS, help="샤드 임대 시간 (초)")
+    parser.add_argument("--idle-exit", type=float, default=None, help="이 시간(초) 동안 샤드가 없으면 종료")
+    args = parser.parse_args(argv)
+
+    completed = run_worker(open_work_queue(args.queue), get_result_store(args.store), None, args.lease, args.idle_exit)
+    print(json.dumps({"completed": completed}), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())